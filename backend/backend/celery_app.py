@@ -46,9 +46,34 @@ app.conf.beat_schedule = {
         'args': (None,),
     },
     
+    # Update today's subscriber stats every hour
+    'update-subscriber-stats': {
+        'task': 'newsletter.update_subscriber_stats',
+        'schedule': 3600.0,
+    },
+    
+    # Recompute recent daily subscriber stats (1:30 AM)
+    'backfill-subscriber-stats': {
+        'task': 'newsletter.update_subscriber_stats',
+        'schedule': crontab(hour=1, minute=30),
+        'args': (True,),
+    },
+    
+    # Recompute the cached dashboard overview every minute
+    'refresh-dashboard-overview': {
+        'task': 'newsletter.refresh_dashboard_overview',
+        'schedule': 60.0,
+    },
+    
     # Health check every hour
     'health-check': {
         'task': 'core.health_check',
         'schedule': 3600.0,
     },
+    
+    # Apply buffered email opens and clicks every 30 seconds
+    'flush-tracking-events': {
+        'task': 'newsletter.flush_tracking_events',
+        'schedule': 30.0,
+    },
 }
\ No newline at end of file
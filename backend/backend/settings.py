@@ -156,9 +156,38 @@ CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'sports-data-cache',
-    }
+    },
+    # Upstream HTTP responses (core/http_cache.py), on disk so every
+    # process on the host shares them
+    'http': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('HTTP_CACHE_DIR', os.path.join(BASE_DIR, 'cache', 'http')),
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
 }
 
+# Shared state (rate limits, counters) needs one cache for all processes:
+# set REDIS_URL in production
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            },
+        },
+        'http': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'http',
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            },
+        },
+    }
+
 CELERY_BROKER_URL = 'redis://localhost:6379/0'
 CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
 CELERY_ACCEPT_CONTENT = ['json']
@@ -204,11 +233,36 @@ CELERY_BEAT_SCHEDULE = {
         'schedule': crontab(hour=1, minute=0),
     },
     
+    # Update today's subscriber stats every hour
+    'update-subscriber-stats': {
+        'task': 'newsletter.update_subscriber_stats',
+        'schedule': 3600.0,
+    },
+    
+    # Recompute recent daily subscriber stats (1:30 AM)
+    'backfill-subscriber-stats': {
+        'task': 'newsletter.update_subscriber_stats',
+        'schedule': crontab(hour=1, minute=30),
+        'args': (True,),
+    },
+    
+    # Recompute the cached dashboard overview every minute
+    'refresh-dashboard-overview': {
+        'task': 'newsletter.refresh_dashboard_overview',
+        'schedule': 60.0,
+    },
+    
     # Health check every hour
     'health-check': {
         'task': 'newsletter.health_check',
         'schedule': 3600.0,
     },
+    
+    # Apply buffered email opens and clicks
+    'flush-tracking-events': {
+        'task': 'newsletter.flush_tracking_events',
+        'schedule': 30.0,
+    },
 }
 
 # =============================================================================
@@ -220,14 +274,80 @@ CELERY_BEAT_SCHEDULE = {
 NEWSLETTER_FROM_NAME = 'Obsidian Sports Newsletter'
 NEWSLETTER_REPLY_TO = 'noreply@your-domain.com'
 
-# Rate limiting
+# Rate limiting (cluster-wide token bucket, see core/rate_limit.py)
+NEWSLETTER_RATE_LIMIT_ENABLED = True
 NEWSLETTER_MAX_EMAILS_PER_HOUR = 500
-NEWSLETTER_EMAIL_DELAY = 0.1  # Delay between emails in seconds
+NEWSLETTER_EMAIL_BURST = 20  # Emails that may go out back to back
+NEWSLETTER_EMAIL_DELAY = 0.1  # Minimum average spacing between emails in seconds
+NEWSLETTER_RELAY_LIMITS = {
+    # Per-relay overrides keyed by SMTP host, e.g.
+    # 'smtp.gmail.com': {'per_hour': 500, 'burst': 20},
+}
+TRANSACTIONAL_EMAIL_MAX_WAIT = 10  # Seconds a request will wait for a token
+
+# Bulk delivery: emails sent per SMTP connection
+NEWSLETTER_SEND_BATCH_SIZE = 50
+NEWSLETTER_DELIVERY_FLUSH_SIZE = 500  # Delivery rows per bulk insert/update
+
+# Distributed delivery: fan sends out across Celery workers
+NEWSLETTER_DISTRIBUTED_SEND = False
+NEWSLETTER_SEND_CHUNK_SIZE = 1000  # Subscribers per chunk task
+NEWSLETTER_SEND_MAX_PARALLEL = 4  # Chunk tasks in flight at once
+
+# Delivery engine: 'sync' (one message in flight per worker) or 'async'
+NEWSLETTER_DELIVERY_ENGINE = 'sync'
+NEWSLETTER_ASYNC_CONCURRENCY = 10  # SMTP sessions in flight per worker
+NEWSLETTER_ASYNC_QUEUE_SIZE = 100  # Messages buffered ahead of the sessions
+NEWSLETTER_ASYNC_RETRIES = 2  # Retries for transient (4xx/network) failures
+NEWSLETTER_SEND_TIMEOUT = 30  # Seconds per SMTP operation
+
+# Open/click tracking: hits are buffered and flushed in bulk
+NEWSLETTER_CLICK_TRACKING = True  # Route article links through the click redirect
+TRACKING_OPEN_DEDUPE_TTL = 86400  # Seconds a delivery's repeat hits are ignored
+TRACKING_BUFFER_TTL = 7 * 86400  # Seconds buffered hits survive without a flush
+TRACKING_FLUSH_BATCH_SIZE = 1000  # Opens per UPDATE
+TRACKING_FLUSH_MAX_BATCHES = 100  # UPDATEs per flush run
+
+# Daily subscriber stats (SubscriberAnalytics), precomputed by a task
+SUBSCRIBER_STATS_BACKFILL_DAYS = 90  # Days recomputed by the nightly backfill
+
+# Dashboard overview: cached document plus live counters (core/dashboard_stats.py)
+DASHBOARD_OVERVIEW_TTL = 300  # Seconds the cached overview lives without a refresh
+DASHBOARD_OVERVIEW_LOCAL_MAX_AGE = 30  # Recompute after this many seconds without a shared cache
 
 # Data fetching settings
 NEWSLETTER_FETCH_INTERVAL = 21600  # 6 hours
+DATA_FETCH_CONCURRENCY = 6  # Feeds fetched in parallel (1 = one after another)
+API_PROVIDER_RATE_LIMITS = {
+    # Shared request rate and daily quota per upstream provider
+    # (api-sports quotas are per sport API)
+    'newsdata': {'per_second': 3, 'burst': 1, 'per_day': 200},
+    'api-sports': {'per_second': 2, 'burst': 1, 'per_day': 100},
+}
 NEWSLETTER_CLEANUP_DAYS = 30  # Delete data older than 30 days
 
+# Web scraping (core/scrape_scheduler.py)
+SCRAPE_WORKERS = 4  # Pages scraped in parallel
+SCRAPE_TIMEOUT = (5, 15)  # Connect, read timeouts in seconds
+SCRAPE_RETRIES = 2  # Retries after a timeout, connection error, 429 or 5xx
+SCRAPE_RETRY_BACKOFF = 1.0  # Base seconds for jittered exponential backoff
+SCRAPE_HOST_LIMITS = {
+    # Per host: requests in flight, seconds between request starts
+    'default': {'concurrency': 2, 'delay': 1.0},
+}
+
+# Shared HTTP cache for API and scraper requests (core/http_cache.py)
+HTTP_CACHE_ENABLED = True
+HTTP_CACHE_ALIAS = 'http'
+HTTP_CACHE_DEFAULT_TTL = 0  # Freshness when a response gives none (0 = always revalidate)
+HTTP_CACHE_HEURISTIC_MAX = 3600  # Cap on freshness guessed from Last-Modified
+HTTP_CACHE_RETENTION = 7 * 86400  # Seconds stale entries are kept for revalidation
+HTTP_CACHE_MAX_ENTRY_BYTES = 5 * 1024 * 1024
+
+# Near-duplicate stories across sources (core/story_clusters.py)
+NEAR_DUPLICATE_THRESHOLD = 0.5  # Estimated title + summary similarity (0-1) for the same story
+NEAR_DUPLICATE_WINDOW_DAYS = 3  # Only articles published this close together are compared
+
 # =============================================================================
 # LOGGING CONFIGURATION
 # =============================================================================
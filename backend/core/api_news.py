@@ -5,11 +5,13 @@ Handles fetching sports news articles
 """
 import requests
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, List, Optional, Tuple
 from django.conf import settings
 from django.core.cache import cache
-import time
+
+from .http_cache import fresh_response, install_http_cache
+from .rate_limit import get_provider_quota, get_provider_rate_limiter, retry_after_seconds
 
 logger = logging.getLogger(__name__)
 
@@ -37,42 +39,28 @@ class NewsDataAPI:
     def __init__(self, api_key: str = None):
         self.api_key = api_key or getattr(settings, 'NEWSDATA_API_KEY', 'pub_7590c5ed9a334f5ea6a014ddef761eaf')
         self.base_url = "https://newsdata.io/api/1"
-        self.session = requests.Session()
-        self.rate_limit_calls = 200  # Free tier limit
-        self.rate_limit_window = 86400  # 24 hours
+        self.session = install_http_cache(requests.Session())
+        self.limiter = get_provider_rate_limiter('newsdata')
+        self.quota = get_provider_quota('newsdata')
         
-    def _get_rate_limit_key(self) -> str:
-        """Get cache key for rate limiting"""
-        return f"newsdata_rate_limit_{datetime.now().strftime('%Y%m%d')}"
-    
-    def _check_rate_limit(self) -> bool:
-        """Check if we've hit rate limit"""
-        key = self._get_rate_limit_key()
-        calls = safe_cache_get(key, 0)
-        return calls < self.rate_limit_calls
-    
-    def _increment_rate_limit(self):
-        """Increment rate limit counter"""
-        key = self._get_rate_limit_key()
-        calls = safe_cache_get(key, 0)
-        safe_cache_set(key, calls + 1, self.rate_limit_window)
-    
     def _make_request(self, endpoint: str, params: Dict) -> Optional[Dict]:
         """Make API request with error handling"""
         
-        if not self._check_rate_limit():
-            logger.warning("NewsData.io rate limit exceeded")
-            return None
-        
         url = f"{self.base_url}/{endpoint}"
         params['apikey'] = self.api_key
         
         try:
-            time.sleep(0.3)  # Rate limiting delay
-            
-            logger.info(f"NewsData.io request: {url} with params: {params}")
-            response = self.session.get(url, params=params, timeout=15)
-            self._increment_rate_limit()
+            # Fresh cached responses cost no quota
+            response = fresh_response(url, params)
+            if response is None:
+                if not self.quota.try_consume():
+                    logger.warning("NewsData.io daily quota exhausted")
+                    return None
+                
+                self.limiter.acquire()  # Shared per-provider request rate
+                
+                logger.info(f"NewsData.io request: {url} with params: {params}")
+                response = self.session.get(url, params=params, timeout=15)
             
             logger.info(f"NewsData.io response status: {response.status_code}")
             
@@ -84,6 +72,7 @@ class NewsDataAPI:
                 return None
             elif response.status_code == 429:
                 logger.warning("NewsData.io rate limit hit")
+                self.quota.block(retry_after_seconds(response))
                 return None
             else:
                 logger.error(f"NewsData.io request failed: {response.status_code} - {response.text}")
@@ -97,7 +86,7 @@ class NewsDataAPI:
             return None
     
     def get_latest_news(self, query: str = None, language: str = "en",
-                       category: str = "sports") -> Dict:
+                       category: str = "sports", page: str = None) -> Dict:
         """
         Get latest news articles - THIS IS THE CORRECT ENDPOINT
         Based on working API: /latest?apikey=XXX&q=f1&language=en&category=sports
@@ -106,6 +95,7 @@ class NewsDataAPI:
             query: Search query (e.g., "f1", "soccer")
             language: Language code (default: "en")
             category: News category (default: "sports")
+            page: nextPage token of the previous page, for the next (older) page
         """
         params = {
             'language': language,
@@ -115,6 +105,8 @@ class NewsDataAPI:
         # Only add query if provided
         if query:
             params['q'] = query
+        if page:
+            params['page'] = page
         
         return self._make_request('latest', params)
 
@@ -135,9 +127,16 @@ class SportsNewsManager:
         'cricket': ['cricket']
     }
     
+    MAX_QUERIES_PER_SPORT = 2  # NewsData.io calls per get_sport_news
+    MAX_PAGES_PER_QUERY = 3  # Pages get_new_sport_news reads per query and run
+    
     def __init__(self):
         self.api = NewsDataAPI()
     
+    def queries_for(self, sport: str) -> List[str]:
+        """Queries (one NewsData.io call each) get_sport_news makes for a sport"""
+        return self.SPORTS_QUERIES.get(sport.lower(), [sport])[:self.MAX_QUERIES_PER_SPORT]
+    
     def get_sport_news(self, sport: str, max_articles: int = 10) -> List[Dict]:
         """
         Get news articles for a specific sport
@@ -152,11 +151,11 @@ class SportsNewsManager:
             logger.info(f"Using cached news for {sport}")
             return cached
         
-        queries = self.SPORTS_QUERIES.get(sport.lower(), [sport])
+        queries = self.queries_for(sport)
         all_articles = []
         seen_titles = set()
         
-        for query in queries[:2]:  # Limit to 2 queries per sport
+        for query in queries:
             try:
                 logger.info(f"Fetching news for {sport} with query: {query}")
                 
@@ -186,9 +185,6 @@ class SportsNewsManager:
                 
                 if len(all_articles) >= max_articles:
                     break
-                    
-                # Small delay between queries
-                time.sleep(0.5)
                 
             except Exception as e:
                 logger.error(f"Error fetching {sport} news with query '{query}': {e}")
@@ -204,6 +200,137 @@ class SportsNewsManager:
         
         return all_articles[:max_articles]
     
+    def get_new_sport_news(self, sport: str, marks: Dict[str, Dict] = None) -> Tuple[List[Dict], Dict[str, Dict]]:
+        """
+        Articles published since each of the sport's queries last ran
+        
+        /latest returns newest first, so each query pages back from the
+        top only until it reaches an article at or below its watermark. A
+        query's first run reads one page and starts its watermark there.
+        When the page cap runs out before reaching seen articles, the
+        cursor is kept as a backlog that later runs finish with their
+        spare pages.
+        
+        Args:
+            sport: Sport to fetch
+            marks: {query: IngestionWatermark.mark()} from the last run
+        
+        Returns:
+            (formatted articles, {query: new mark}); the marks should be
+            stored only once the articles are saved
+        """
+        marks = marks or {}
+        raw_articles = []
+        new_marks = {}
+        
+        for query in self.queries_for(sport):
+            mark = marks.get(query) or {}
+            floor = mark.get('last_published_at')
+            seen_ids = set(mark.get('last_item_ids') or [])
+            
+            if floor is None:
+                head, _, _, ok = self._read_pages(query, None, set(), None, 1)
+                if not ok:
+                    continue
+                page_token, backlog_until = '', None
+            else:
+                head, resume_token, pages, ok = self._read_pages(query, floor, seen_ids, None, self.MAX_PAGES_PER_QUERY)
+                if not ok and not head:
+                    # Nothing read: the watermark stays where it was
+                    continue
+                page_token, backlog_until = mark.get('page_token') or '', mark.get('backlog_until')
+                
+                if resume_token:
+                    if page_token:
+                        logger.warning(f"NewsData.io '{query}': dropping older backlog, a newer one replaces it")
+                    if ok:
+                        logger.info(f"NewsData.io '{query}': page cap reached, the rest is left as backlog")
+                    else:
+                        logger.warning(f"NewsData.io '{query}': a page failed, the rest is left as backlog")
+                    page_token, backlog_until = resume_token, floor
+                elif page_token and pages > 0:
+                    backlog, resume_token, pages, ok = self._read_pages(query, backlog_until, None, page_token, pages)
+                    head += backlog
+                    if resume_token:
+                        page_token = resume_token
+                    else:
+                        page_token, backlog_until = '', None
+            
+            raw_articles += head
+            newest, newest_ids = floor, set(seen_ids)
+            for article in head:
+                published = self._published_at(article)
+                if published is None:
+                    continue
+                if newest is None or published > newest:
+                    newest, newest_ids = published, set()
+                if published == newest:
+                    newest_ids.add(article.get('article_id'))
+            
+            new_marks[query] = {
+                'last_published_at': newest,
+                'last_item_ids': sorted(i for i in newest_ids if i),
+                'page_token': page_token or '',
+                'backlog_until': backlog_until,
+            }
+        
+        articles = []
+        seen_titles = set()
+        for article in raw_articles:
+            title = article.get('title', '')
+            if title and title not in seen_titles:
+                seen_titles.add(title)
+                articles.append(self._format_article(article, sport))
+        
+        logger.info(f"New articles fetched for {sport}: {len(articles)}")
+        return articles, new_marks
+    
+    def _read_pages(self, query: str, floor: Optional[datetime], seen_ids: Optional[set],
+                    token: Optional[str], pages: int) -> Tuple[List[Dict], Optional[str], int, bool]:
+        """
+        Read pages from `token` (None = newest) until an article is seen
+        
+        An article is seen when published before `floor`, or at `floor`
+        with an id in seen_ids (seen_ids None: anything at `floor`). Seen
+        articles are left out.
+        
+        Returns:
+            (new articles, token to resume from if the page cap ran out or
+             a request failed first else None, pages left, whether every
+             request succeeded); after a failure the token is that of the
+             failed page, None if it was the newest
+        """
+        articles = []
+        while pages > 0:
+            response = self.api.get_latest_news(query=query, language='en', category='sports', page=token)
+            pages -= 1
+            if not response or response.get('status') != 'success':
+                logger.warning(f"No success response for query '{query}'")
+                return articles, token, pages, False
+            
+            reached_seen = False
+            for article in response.get('results', []):
+                published = self._published_at(article)
+                if floor is not None and published is not None and (
+                    published < floor or (published == floor and (seen_ids is None or article.get('article_id') in seen_ids))
+                ):
+                    reached_seen = True
+                    continue
+                articles.append(article)
+            
+            token = response.get('nextPage')
+            if reached_seen or not token:
+                return articles, None, pages, True
+        
+        return articles, token, 0, True
+    
+    def _published_at(self, article: Dict) -> Optional[datetime]:
+        """An article's pubDate (UTC) as an aware datetime"""
+        try:
+            return datetime.strptime(article.get('pubDate', ''), '%Y-%m-%d %H:%M:%S').replace(tzinfo=dt_timezone.utc)
+        except (TypeError, ValueError):
+            return None
+    
     def _format_article(self, article: Dict, sport: str) -> Dict:
         """Format article data for database storage"""
         
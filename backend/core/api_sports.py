@@ -5,11 +5,12 @@ Uses correct API versions: v3 for football, v1 for others
 """
 import requests
 import logging
-from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from django.conf import settings
 from django.core.cache import cache
-import time
+
+from .http_cache import evict, fresh_response, install_http_cache
+from .rate_limit import get_provider_quota, get_provider_rate_limiter, retry_after_seconds
 
 logger = logging.getLogger(__name__)
 
@@ -38,33 +39,13 @@ class SportsAPIClient:
         self.api_key = api_key or getattr(settings, 'SPORTS_API_KEY', 'a9a2a1a3f94e00dd911b53d745c89b37')
         self.api_version = api_version
         self.base_url = f"https://{api_version}.{{sport}}.api-sports.io"
-        self.session = requests.Session()
-        self.rate_limit_calls = 100
-        self.rate_limit_window = 86400
+        self.session = install_http_cache(requests.Session())
+        self.limiter = get_provider_rate_limiter('api-sports')
         
-    def _get_rate_limit_key(self, sport: str) -> str:
-        """Get cache key for rate limiting"""
-        return f"api_sports_rate_limit_{sport}_{datetime.now().strftime('%Y%m%d')}"
-    
-    def _check_rate_limit(self, sport: str) -> bool:
-        """Check if we've hit rate limit"""
-        key = self._get_rate_limit_key(sport)
-        calls = safe_cache_get(key, 0)
-        return calls < self.rate_limit_calls
-    
-    def _increment_rate_limit(self, sport: str):
-        """Increment rate limit counter"""
-        key = self._get_rate_limit_key(sport)
-        calls = safe_cache_get(key, 0)
-        safe_cache_set(key, calls + 1, self.rate_limit_window)
-    
     def _make_request(self, sport: str, endpoint: str, params: Dict = None) -> Optional[Dict]:
         """Make API request with rate limiting and error handling"""
         
-        if not self._check_rate_limit(sport):
-            logger.warning(f"Rate limit exceeded for {sport} API")
-            return None
-        
+        quota = get_provider_quota('api-sports', sport)  # Each sport's API has its own quota
         url = self.base_url.format(sport=sport) + endpoint
         headers = {
             'x-rapidapi-host': f'{self.api_version}.{sport}.api-sports.io',
@@ -72,22 +53,30 @@ class SportsAPIClient:
         }
         
         try:
-            time.sleep(0.5)
-            
-            logger.info(f"Requesting: {url} with params: {params}")
-            response = self.session.get(url, headers=headers, params=params, timeout=10)
-            self._increment_rate_limit(sport)
+            # Fresh cached responses cost no quota
+            response = fresh_response(url, params)
+            if response is None:
+                if not quota.try_consume():
+                    logger.warning(f"Daily quota exhausted for {sport} API")
+                    return None
+                
+                self.limiter.acquire()  # Shared per-provider request rate
+                
+                logger.info(f"Requesting: {url} with params: {params}")
+                response = self.session.get(url, headers=headers, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
                 
                 if data.get('errors') and len(data['errors']) > 0:
                     logger.error(f"API Error for {sport}: {data['errors']}")
+                    evict(url, params)  # Don't serve the error from cache
                     return None
                 
                 return data
             elif response.status_code == 429:
                 logger.warning(f"Rate limit hit for {sport} API")
+                quota.block(retry_after_seconds(response))
                 return None
             else:
                 logger.error(f"API request failed for {sport}: {response.status_code}")
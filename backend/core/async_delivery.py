@@ -0,0 +1,260 @@
+# core/async_delivery.py
+"""
+Asyncio delivery engine
+Keeps a bounded pool of SMTP sessions busy so many messages are in flight
+at once, instead of one message per worker.
+"""
+import asyncio
+import logging
+import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence
+from django.conf import settings
+from django.core.mail import get_connection
+
+logger = logging.getLogger(__name__)
+
+# Outcome statuses
+SENT = 'sent'
+TRANSIENT = 'transient'  # 4xx, refused or dropped connections: may succeed later
+PERMANENT = 'permanent'  # 5xx rejections: will not succeed on retry
+UNKNOWN = 'unknown'  # Timed out mid-send: the relay may have accepted it, so never retried
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    Decide whether a delivery error is transient, permanent or unknown
+
+    SMTP reply codes decide when there is one (4xx transient, 5xx permanent).
+    Refused or dropped connections and other network failures are
+    transient. A timeout is unknown: the relay may have queued the message
+    before its reply was lost, and retrying could deliver it twice.
+    Anything else (e.g. a malformed message) is treated as permanent so it
+    is not retried.
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        if codes and all(code >= 500 for code in codes):
+            return PERMANENT
+        return TRANSIENT
+
+    if isinstance(error, smtplib.SMTPResponseException):
+        return PERMANENT if error.smtp_code >= 500 else TRANSIENT
+
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return TRANSIENT
+
+    # Other SMTPExceptions (no reply code) are protocol/config problems;
+    # checked before OSError, which SMTPException subclasses
+    if isinstance(error, smtplib.SMTPException):
+        return PERMANENT
+
+    # Checked before OSError, which TimeoutError subclasses
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return UNKNOWN
+
+    if isinstance(error, (ConnectionError, OSError)):
+        return TRANSIENT
+
+    return PERMANENT
+
+
+class SMTPSession:
+    """One pooled backend connection, used by a single engine worker at a time"""
+
+    def __init__(self, connection_factory: Callable, run: Callable):
+        self.connection_factory = connection_factory
+        self.run = run  # Runs a blocking call on the engine's threads
+        self.connection = None
+        self.messages = 0
+
+    async def send(self, message, timeout: float) -> int:
+        if self.connection is None:
+            connection = self.connection_factory()
+            try:
+                await asyncio.wait_for(self.run(connection.open), timeout)
+            except (asyncio.TimeoutError, TimeoutError) as e:
+                # Nothing was sent yet, so this is safe to retry
+                raise ConnectionError(f"SMTP connect timed out after {timeout}s") from e
+            self.connection = connection
+
+        sent = await asyncio.wait_for(
+            self.run(self.connection.send_messages, [message]),
+            timeout
+        )
+        self.messages += 1
+        return sent
+
+    def abandon(self):
+        """
+        Forget the connection after an error or timeout
+
+        A timed-out send may still be running on its thread, so the
+        connection is not touched here; the backend's own socket timeout
+        ends that thread and the socket is garbage collected.
+        """
+        self.connection = None
+
+    async def close(self):
+        if self.connection is not None:
+            connection, self.connection = self.connection, None
+            try:
+                await self.run(connection.close)
+            except Exception as e:
+                logger.warning(f"Error closing pooled mail connection: {e}")
+
+
+class AsyncDeliveryEngine:
+    """
+    Deliver many messages concurrently over a bounded pool of SMTP sessions
+
+    Messages flow through a bounded queue (backpressure: the producer waits
+    while `queue_size` messages are already waiting) to `concurrency`
+    workers, each owning one SMTP session that is reused for every message
+    it sends. Blocking smtplib calls run on the engine's own thread pool,
+    sized to the sessions (plus room for timed-out calls still finishing),
+    so a call never waits for a thread inside its timeout. Rate limiting
+    waits with asyncio.sleep and holds no thread.
+
+    Every send is bounded by `timeout`. Transient failures reconnect and
+    are retried up to `retries` times. A send that times out is reported
+    as UNKNOWN and not retried, since the relay may already have it.
+
+    Args:
+        concurrency: SMTP sessions in flight (default: NEWSLETTER_ASYNC_CONCURRENCY)
+        queue_size: Messages buffered ahead of the workers (default: NEWSLETTER_ASYNC_QUEUE_SIZE)
+        timeout: Seconds per SMTP operation (default: NEWSLETTER_SEND_TIMEOUT)
+        retries: Retries for transient failures (default: NEWSLETTER_ASYNC_RETRIES)
+        connection_factory: Returns an unopened mail backend connection
+        limiter: Optional rate limiter with try_acquire() -> seconds to wait
+    """
+
+    def __init__(self, concurrency: int = None, queue_size: int = None,
+                 timeout: float = None, retries: int = None,
+                 connection_factory: Callable = None, limiter=None):
+        self.concurrency = max(1, concurrency or getattr(settings, 'NEWSLETTER_ASYNC_CONCURRENCY', 10))
+        self.queue_size = max(1, queue_size or getattr(settings, 'NEWSLETTER_ASYNC_QUEUE_SIZE', 100))
+        self.timeout = timeout or getattr(settings, 'NEWSLETTER_SEND_TIMEOUT', 30)
+        self.retries = getattr(settings, 'NEWSLETTER_ASYNC_RETRIES', 2) if retries is None else retries
+        self.connection_factory = connection_factory or (lambda: get_connection(timeout=self.timeout))
+        self.limiter = limiter
+
+    def deliver(self, messages: Sequence) -> List[Dict]:
+        """
+        Send messages and wait for all of them
+
+        Must be called from synchronous code (Celery tasks, management
+        commands); use deliver_async inside a running event loop.
+
+        Returns:
+            One outcome per message, in order: {'status': sent|transient|permanent|unknown,
+            'error': str, 'attempts': int, 'seconds': float}
+        """
+        return asyncio.run(self.deliver_async(messages))
+
+    async def deliver_async(self, messages: Sequence) -> List[Dict]:
+        outcomes: List[Optional[Dict]] = [None] * len(messages)
+        if not messages:
+            return []
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        size = min(self.concurrency, len(messages))
+        # A timed-out call keeps its thread until the socket timeout ends
+        # it, so allow one such straggler per session
+        executor = ThreadPoolExecutor(max_workers=size * 2, thread_name_prefix='smtp')
+        loop = asyncio.get_running_loop()
+
+        def run(func, *args):
+            return loop.run_in_executor(executor, partial(func, *args))
+
+        sessions = [SMTPSession(self.connection_factory, run) for _ in range(size)]
+        workers = [
+            asyncio.create_task(self._worker(queue, session, messages, outcomes))
+            for session in sessions
+        ]
+
+        try:
+            for index in range(len(messages)):
+                await queue.put(index)
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await asyncio.gather(*(session.close() for session in sessions))
+            executor.shutdown(wait=False)
+
+        logger.info(
+            f"Async delivery: {sum(1 for o in outcomes if o['status'] == SENT)}/{len(messages)} sent "
+            f"over {len(sessions)} sessions"
+        )
+        return outcomes
+
+    async def _worker(self, queue: asyncio.Queue, session: SMTPSession,
+                      messages: Sequence, outcomes: List):
+        while True:
+            index = await queue.get()
+            try:
+                outcomes[index] = await self._deliver_one(session, messages[index])
+            except Exception as e:
+                # Never let one message take the worker (and its session) down
+                outcomes[index] = {
+                    'status': classify_error(e),
+                    'error': str(e),
+                    'attempts': 1,
+                    'seconds': 0.0,
+                }
+            finally:
+                queue.task_done()
+
+    async def _deliver_one(self, session: SMTPSession, message) -> Dict:
+        started = time.perf_counter()
+        attempts = 0
+
+        while True:
+            attempts += 1
+            try:
+                if self.limiter:
+                    await self._throttle(session)
+
+                sent = await session.send(message, self.timeout)
+                if not sent:
+                    raise smtplib.SMTPException("Message was not accepted by the mail backend")
+
+                return {
+                    'status': SENT,
+                    'error': '',
+                    'attempts': attempts,
+                    'seconds': time.perf_counter() - started,
+                }
+
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    e = asyncio.TimeoutError(f"SMTP operation timed out after {self.timeout}s")
+                kind = classify_error(e)
+
+                # A refused recipient leaves the session usable; anything
+                # else may have left it mid-transaction
+                if not isinstance(e, smtplib.SMTPRecipientsRefused):
+                    session.abandon()
+
+                if kind == TRANSIENT and attempts <= self.retries:
+                    await asyncio.sleep(min(2 ** (attempts - 1) * 0.5, 5))
+                    continue
+
+                return {
+                    'status': kind,
+                    'error': str(e) or e.__class__.__name__,
+                    'attempts': attempts,
+                    'seconds': time.perf_counter() - started,
+                }
+
+    async def _throttle(self, session: SMTPSession):
+        """Wait for a rate limiter token without holding a thread"""
+        while True:
+            wait = await session.run(self.limiter.try_acquire)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
@@ -0,0 +1,198 @@
+# core/dashboard_stats.py
+"""
+Precomputed dashboard overview
+The overview document is computed from the database by a periodic task
+and kept in the shared cache. Between refreshes, signals and the send,
+tracking and ingestion paths add their changes to cache counters, which
+are applied on read, so serving the overview never touches the database.
+Without a shared cache the counters would only ever see the changes of
+one process, so they are skipped and the overview is recomputed once it
+is older than DASHBOARD_OVERVIEW_LOCAL_MAX_AGE instead.
+"""
+import logging
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, Tuple
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import (
+    NewsletterSubscriber, Newsletter, NewsletterDelivery,
+    NewsArticle, MatchFixture, SportCategory, SubscriptionEvent
+)
+from .rate_limit import cache_is_shared
+
+logger = logging.getLogger(__name__)
+
+OVERVIEW_KEY = 'dashboard:overview'
+DELTA_KEY = 'dashboard:overview:delta:{name}'
+
+# Raw counts stored in the document; each can be adjusted by a delta
+COUNTERS = (
+    'total_subscribers',
+    'active_subscribers',
+    'recent_subscriptions',
+    'previous_week_subscriptions',
+    'total_newsletters',
+    'sent_newsletters',
+    'recent_newsletters',
+    'recent_sent',
+    'recent_opened',
+    'total_articles',
+    'total_fixtures',
+    'active_sports',
+)
+
+
+# Whether get_overview has reported a per-process cache yet
+_local_cache_warned = False
+
+
+def _ttl() -> int:
+    return getattr(settings, 'DASHBOARD_OVERVIEW_TTL', 300)
+
+
+def compute_counts() -> Dict[str, int]:
+    """Read the raw overview counts from the database (six queries)"""
+    today = timezone.now().date()
+    week_ago = today - timedelta(days=7)
+
+    subscribers = NewsletterSubscriber.objects.aggregate(
+        total_subscribers=Count('id'),
+        active_subscribers=Count('id', filter=Q(status='active')),
+        recent_subscriptions=Count('id', filter=Q(subscription_date__gte=week_ago)),
+        previous_week_subscriptions=Count('id', filter=Q(
+            subscription_date__date__lt=week_ago,
+            subscription_date__date__gte=week_ago - timedelta(days=7)
+        )),
+    )
+    newsletters = Newsletter.objects.aggregate(
+        total_newsletters=Count('id'),
+        sent_newsletters=Count('id', filter=Q(status='sent')),
+        recent_newsletters=Count('id', filter=Q(created_at__gte=week_ago)),
+    )
+    deliveries = NewsletterDelivery.objects.filter(sent_at__gte=week_ago).aggregate(
+        recent_sent=Count('id', filter=Q(status='sent')),
+        recent_opened=Count('id', filter=Q(opened_at__isnull=False)),
+    )
+
+    return {
+        **subscribers,
+        **newsletters,
+        **deliveries,
+        'total_articles': NewsArticle.objects.count(),
+        'total_fixtures': MatchFixture.objects.count(),
+        'active_sports': SportCategory.objects.filter(is_active=True).count(),
+    }
+
+
+def refresh_overview() -> Dict:
+    """Recompute the overview, store it and clear the pending deltas"""
+    document = {'counts': compute_counts(), 'computed_at': time.time()}
+    cache.set(OVERVIEW_KEY, document, timeout=_ttl())
+    # Changes that land between the read above and this reset are only
+    # picked up by the next refresh
+    cache.delete_many([DELTA_KEY.format(name=name) for name in COUNTERS])
+    return document
+
+
+def invalidate_overview():
+    """Drop the overview so the next read recomputes it"""
+    cache.delete(OVERVIEW_KEY)
+
+
+def bump(name: str, amount: int = 1):
+    """Add to an overview counter until the next refresh (needs a shared cache)"""
+    if not amount or not cache_is_shared():
+        return
+
+    key = DELTA_KEY.format(name=name)
+    try:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key, amount)
+    except Exception as e:
+        logger.warning(f"Could not update dashboard counter {name}: {e}")
+
+
+def count_subscription_events(changes: Iterable[Tuple[str, str]]):
+    """Apply (from_status, to_status) changes to the subscriber counters"""
+    deltas = {'total_subscribers': 0, 'active_subscribers': 0, 'recent_subscriptions': 0}
+    for from_status, to_status in changes:
+        if from_status == SubscriptionEvent.SUBSCRIBED:
+            deltas['total_subscribers'] += 1
+            deltas['recent_subscriptions'] += 1
+        elif to_status == SubscriptionEvent.DELETED:
+            deltas['total_subscribers'] -= 1
+
+        if to_status == 'active':
+            deltas['active_subscribers'] += 1
+        if from_status == 'active':
+            deltas['active_subscribers'] -= 1
+
+    for name, amount in deltas.items():
+        bump(name, amount)
+
+
+def _rate(numerator: int, denominator: int) -> float:
+    return round(numerator / denominator * 100, 2) if denominator > 0 else 0
+
+
+def get_overview() -> Dict:
+    """
+    The dashboard overview, with its staleness
+
+    Two cache reads when the document is cached; computed inline only
+    when it has expired (e.g. the refresh task is not running) or, with a
+    per-process cache, once it is older than DASHBOARD_OVERVIEW_LOCAL_MAX_AGE.
+
+    Returns:
+        {'overview': {...}, 'quick_stats': {...}, 'computed_at': iso,
+         'age_seconds': float}
+    """
+    global _local_cache_warned
+    document = cache.get(OVERVIEW_KEY)
+
+    if document is not None and not cache_is_shared():
+        if not _local_cache_warned:
+            _local_cache_warned = True
+            logger.warning(
+                "Dashboard overview is cached per process, so live counters are off and it "
+                "is recomputed when stale; set REDIS_URL to share it"
+            )
+        if time.time() - document['computed_at'] > getattr(settings, 'DASHBOARD_OVERVIEW_LOCAL_MAX_AGE', 30):
+            document = None
+
+    if document is None:
+        logger.info("Dashboard overview not cached, computing it")
+        document = refresh_overview()
+
+    deltas = cache.get_many([DELTA_KEY.format(name=name) for name in COUNTERS])
+    counts = {
+        name: max(0, value + (deltas.get(DELTA_KEY.format(name=name)) or 0))
+        for name, value in document['counts'].items()
+    }
+
+    previous_week = counts['previous_week_subscriptions']
+    growth_rate = _rate(counts['recent_subscriptions'] - previous_week, previous_week)
+
+    return {
+        'overview': {
+            'total_subscribers': counts['total_subscribers'],
+            'active_subscribers': counts['active_subscribers'],
+            'total_newsletters': counts['total_newsletters'],
+            'sent_newsletters': counts['sent_newsletters'],
+            'recent_subscriptions': counts['recent_subscriptions'],
+            'recent_newsletters': counts['recent_newsletters'],
+            'open_rate': _rate(counts['recent_opened'], counts['recent_sent']),
+            'growth_rate': growth_rate,
+        },
+        'quick_stats': {
+            'total_articles': counts['total_articles'],
+            'total_fixtures': counts['total_fixtures'],
+            'active_sports': counts['active_sports'],
+        },
+        'computed_at': datetime.fromtimestamp(document['computed_at'], tz=dt_timezone.utc).isoformat(),
+        'age_seconds': round(time.time() - document['computed_at'], 1),
+    }
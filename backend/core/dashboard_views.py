@@ -19,12 +19,14 @@ from .models import (
 )
 from .models import (
     NewsletterAnalytics, SubscriberAnalytics, SportAnalytics, 
-    EmailClickTracking, AdminUser
+    EmailClickTracking, AdminUser, SubscriptionEvent
 )
 from .serializers import (
     NewsletterSerializer, NewsletterSubscriberSerializer,
     NewsArticleSerializer, MatchFixtureSerializer
 )
+from .dashboard_stats import get_overview
+from .utils import DEFAULT_KEYSET_PAGE_SIZE, chunked
 
 logger = logging.getLogger(__name__)
 
@@ -132,65 +134,9 @@ def admin_profile(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def dashboard_overview(request):
-    """Get dashboard overview statistics"""
+    """Get dashboard overview statistics (precomputed, see core/dashboard_stats.py)"""
     try:
-        # Date ranges
-        today = timezone.now().date()
-        week_ago = today - timedelta(days=7)
-        month_ago = today - timedelta(days=30)
-        
-        # Basic stats
-        total_subscribers = NewsletterSubscriber.objects.count()
-        active_subscribers = NewsletterSubscriber.objects.filter(status='active').count()
-        total_newsletters = Newsletter.objects.count()
-        sent_newsletters = Newsletter.objects.filter(status='sent').count()
-        
-        # Recent activity
-        recent_subscriptions = NewsletterSubscriber.objects.filter(
-            subscription_date__gte=week_ago
-        ).count()
-        
-        recent_newsletters = Newsletter.objects.filter(
-            created_at__gte=week_ago
-        ).count()
-        
-        # Calculate engagement rates
-        recent_deliveries = NewsletterDelivery.objects.filter(
-            sent_at__gte=week_ago
-        )
-        
-        total_sent = recent_deliveries.filter(status='sent').count()
-        total_opened = recent_deliveries.filter(opened_at__isnull=False).count()
-        
-        open_rate = (total_opened / total_sent * 100) if total_sent > 0 else 0
-        
-        # Growth rate
-        prev_week_subs = NewsletterSubscriber.objects.filter(
-            subscription_date__date__lt=week_ago,
-            subscription_date__date__gte=week_ago - timedelta(days=7)
-        ).count()
-        
-        growth_rate = 0
-        if prev_week_subs > 0:
-            growth_rate = ((recent_subscriptions - prev_week_subs) / prev_week_subs) * 100
-        
-        return Response({
-            'overview': {
-                'total_subscribers': total_subscribers,
-                'active_subscribers': active_subscribers,
-                'total_newsletters': total_newsletters,
-                'sent_newsletters': sent_newsletters,
-                'recent_subscriptions': recent_subscriptions,
-                'recent_newsletters': recent_newsletters,
-                'open_rate': round(open_rate, 2),
-                'growth_rate': round(growth_rate, 2)
-            },
-            'quick_stats': {
-                'total_articles': NewsArticle.objects.count(),
-                'total_fixtures': MatchFixture.objects.count(),
-                'active_sports': SportCategory.objects.filter(is_active=True).count()
-            }
-        })
+        return Response(get_overview())
         
     except Exception as e:
         logger.error(f"Error getting dashboard overview: {e}")
@@ -207,20 +153,34 @@ def subscriber_analytics(request):
         days = int(request.GET.get('days', 30))
         start_date = timezone.now().date() - timedelta(days=days)
         
-        # Daily subscriber growth
-        daily_stats = []
-        current_date = start_date
+        today = timezone.now().date()
         
-        while current_date <= timezone.now().date():
-            stats = SubscriberAnalytics.calculate_daily_stats(current_date)
+        # Daily subscriber growth, precomputed by update_subscriber_stats_task
+        rows = {
+            stats.date: stats
+            for stats in SubscriberAnalytics.objects.filter(date__gte=start_date, date__lte=today)
+        }
+        missing = [
+            start_date + timedelta(days=offset)
+            for offset in range((today - start_date).days + 1)
+            if start_date + timedelta(days=offset) not in rows
+        ]
+        if missing:
+            # Not backfilled yet: compute the gap once, in a single pass
+            for stats in SubscriberAnalytics.calculate_range(missing[0], today):
+                rows[stats.date] = stats
+        
+        daily_stats = []
+        for current_date in sorted(rows):
+            stats = rows[current_date]
             daily_stats.append({
                 'date': current_date.strftime('%Y-%m-%d'),
                 'total_subscribers': stats.total_subscribers,
                 'new_subscriptions': stats.new_subscriptions,
+                'unsubscriptions': stats.unsubscriptions,
                 'active_subscribers': stats.active_subscribers,
                 'growth_rate': stats.growth_rate
             })
-            current_date += timedelta(days=1)
         
         # Sport preferences analysis
         sport_preferences = {}
@@ -237,8 +197,15 @@ def subscriber_analytics(request):
             'API': 0,  # Implement if you have different sources
         }
         
+        # Growth and churn from the subscription event log
+        weekly_churn = [
+            {**week, 'period': week['period'].strftime('%Y-%m-%d')}
+            for week in SubscriptionEvent.summarize(start_date, today, period='week')
+        ]
+        
         return Response({
             'daily_growth': daily_stats,
+            'weekly_churn': weekly_churn,
             'sport_preferences': sport_preferences,
             'subscription_sources': subscription_sources,
             'total_active': NewsletterSubscriber.objects.filter(status='active').count(),
@@ -257,18 +224,27 @@ def subscriber_analytics(request):
 def newsletter_analytics(request):
     """Get newsletter performance analytics"""
     try:
-        # Get recent newsletters with analytics
-        newsletters = Newsletter.objects.filter(status='sent').order_by('-sent_at')[:10]
+        # Get recent newsletters with analytics (joined in the same query)
+        newsletters = list(
+            Newsletter.objects.filter(status='sent').select_related('analytics').order_by('-sent_at')[:10]
+        )
+        
+        stale_before = timezone.now() - timedelta(hours=1)
+        analytics_by_newsletter = {}
+        stale = []
+        for newsletter in newsletters:
+            analytics = getattr(newsletter, 'analytics', None)
+            if analytics is None or not analytics.updated_at or analytics.updated_at < stale_before:
+                stale.append(newsletter.id)
+            else:
+                analytics_by_newsletter[newsletter.id] = analytics
+        
+        # Refresh every stale newsletter in one GROUP BY
+        analytics_by_newsletter.update(NewsletterAnalytics.calculate_for_newsletters(stale))
         
         newsletter_stats = []
         for newsletter in newsletters:
-            # Get or create analytics
-            analytics, created = NewsletterAnalytics.objects.get_or_create(
-                newsletter=newsletter
-            )
-            
-            if created or not analytics.updated_at or analytics.updated_at < timezone.now() - timedelta(hours=1):
-                analytics.calculate_metrics()
+            analytics = analytics_by_newsletter[newsletter.id]
             
             newsletter_stats.append({
                 'id': str(newsletter.id),
@@ -389,8 +365,7 @@ class SubscriberManagementViewSet(viewsets.ModelViewSet):
         new_status = request.data.get('status')
         
         if new_status in ['active', 'inactive', 'unsubscribed']:
-            subscriber.status = new_status
-            subscriber.save()
+            subscriber.set_status(new_status, source='dashboard')
             
             return Response({
                 'message': f'Subscriber status changed to {new_status}',
@@ -414,27 +389,37 @@ class SubscriberManagementViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        subscribers = NewsletterSubscriber.objects.filter(id__in=subscriber_ids)
-        
-        if action_type == 'activate':
-            subscribers.update(status='active')
-            message = f'Activated {subscribers.count()} subscribers'
-        elif action_type == 'deactivate':
-            subscribers.update(status='inactive')
-            message = f'Deactivated {subscribers.count()} subscribers'
-        elif action_type == 'unsubscribe':
-            subscribers.update(status='unsubscribed')
-            message = f'Unsubscribed {subscribers.count()} subscribers'
-        elif action_type == 'delete':
-            count = subscribers.count()
-            subscribers.delete()
-            message = f'Deleted {count} subscribers'
-        else:
+        # Apply in bounded chunks so large selections never load the
+        # subscribers (or build one huge IN clause)
+        new_status = {
+            'activate': 'active',
+            'deactivate': 'inactive',
+            'unsubscribe': 'unsubscribed',
+        }.get(action_type)
+        
+        if new_status is None and action_type != 'delete':
             return Response(
                 {'error': 'Invalid action'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Every change is logged as a SubscriptionEvent
+        count = 0
+        for ids in chunked(subscriber_ids, DEFAULT_KEYSET_PAGE_SIZE):
+            count += SubscriptionEvent.change_status(
+                NewsletterSubscriber.objects.filter(id__in=ids),
+                new_status or SubscriptionEvent.DELETED,
+                source='bulk_action'
+            )
+        
+        verb = {
+            'activate': 'Activated',
+            'deactivate': 'Deactivated',
+            'unsubscribe': 'Unsubscribed',
+            'delete': 'Deleted',
+        }[action_type]
+        message = f'{verb} {count} subscribers'
+        
         return Response({'message': message})
 
 # Newsletter Management Views
@@ -458,10 +443,10 @@ class NewsletterManagementViewSet(viewsets.ModelViewSet):
             )
         
         # Import here to avoid circular imports
-        from .tasks import send_newsletter_to_subscribers
+        from .tasks import send_newsletter_task
         
         # Queue newsletter for sending
-        task = send_newsletter_to_subscribers.delay(str(newsletter.id))
+        task = send_newsletter_task.delay(str(newsletter.id))
         
         return Response({
             'message': 'Newsletter queued for sending',
@@ -475,13 +460,15 @@ class NewsletterManagementViewSet(viewsets.ModelViewSet):
         
         deliveries = NewsletterDelivery.objects.filter(newsletter=newsletter)
         
-        report = {
-            'total_sent': deliveries.filter(status='sent').count(),
-            'total_failed': deliveries.filter(status='failed').count(),
-            'total_bounced': deliveries.filter(status='bounced').count(),
-            'total_opened': deliveries.filter(opened_at__isnull=False).count(),
-            'total_clicked': deliveries.filter(clicked_links__len__gt=0).count(),
-        }
+        aggregates = NewsletterAnalytics.delivery_aggregates()
+        counts = deliveries.aggregate(
+            total_sent=aggregates['total_delivered'],
+            total_failed=aggregates['total_failed'],
+            total_bounced=aggregates['total_bounced'],
+            total_opened=aggregates['total_opened'],
+            total_clicked=aggregates['total_clicked'],
+        )
+        report = dict(counts)
         
         # Recent failures
         recent_failures = deliveries.filter(
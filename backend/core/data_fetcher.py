@@ -3,15 +3,25 @@
 Unified Data Fetcher
 Combines API-Sports and NewsData.io to fetch and store sports data
 """
+import hashlib
+import json
 import logging
+import math
+import time
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Dict, List, Optional
+from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
 
 from .api_sports import SportsAPIManager
 from .api_news import SportsNewsManager
-from core.models import NewsArticle, MatchFixture, SportCategory, Newsletter
+from .http_cache import cache_stats
+from .rate_limit import get_provider_quota
+from .scrape_scheduler import run_concurrently
+from .ingestion import DEFAULT_ARTICLE_IMAGE, bulk_ingest_articles, bulk_upsert_fixtures
+from core.models import NewsArticle, MatchFixture, SportCategory, Newsletter, IngestionWatermark
 
 logger = logging.getLogger(__name__)
 
@@ -25,19 +35,37 @@ class DataFetcher:
         self.sports_api = SportsAPIManager()
         self.news_api = SportsNewsManager()
 
-    def fetch_all_data(self, sports: List[str] = None) -> Dict:
+    def fetch_all_data(self, sports: List[str] = None, concurrency: int = None) -> Dict:
         """
         Fetch all data (news + fixtures) for specified sports
 
+        Every upstream request (news per sport, fixtures per sport) is an
+        independent job. Jobs run on a thread pool of `concurrency` workers,
+        paced only by each provider's shared rate limit; results are saved
+        on the calling thread as they arrive. concurrency=1 runs the jobs
+        one after another. Jobs that would overdraw their provider's daily
+        quota share for this run are deferred (see _plan_jobs).
+
+        Ingestion is incremental: news queries only page back to their
+        IngestionWatermark, and fixture feeds whose content hasn't changed
+        since the last run are not re-saved. Watermarks advance only after
+        a feed's items are saved.
+
         Args:
             sports: List of sports to fetch (None = all)
+            concurrency: Worker threads (default: DATA_FETCH_CONCURRENCY)
 
         Returns:
-            Dictionary with fetch results
+            Dictionary with fetch results, including per-provider and
+            per-job timings under "timings", deferred job names under
+            "deferred" and the quotas left under "quotas"
         """
         if sports is None:
             sports = ["soccer", "formula1", "rugby", "tennis", "golf", "boxing"]
 
+        if concurrency is None:
+            concurrency = getattr(settings, "DATA_FETCH_CONCURRENCY", 6)
+
         results = {
             "news": {},
             "fixtures": {},
@@ -45,348 +73,382 @@ class DataFetcher:
             "timestamp": datetime.now(),
         }
 
-        # Fetch news for all sports
-        logger.info("Fetching news articles...")
-        try:
-            all_news = self.news_api.get_all_sports_news(
-                max_per_sport=10, sports=sports
+        marks = {
+            provider: IngestionWatermark.load(provider, sports)
+            for provider in ("newsdata", "api-sports")
+        }
+        jobs, deferred = self._plan_jobs(self._fetch_jobs(sports, marks))
+        if deferred:
+            logger.warning(f"Deferring {len(deferred)} feeds to stay within API quotas: {', '.join(deferred)}")
+            results["deferred"] = deferred
+        logger.info(f"Fetching {len(jobs)} news and fixture feeds ({concurrency} workers)...")
+
+        started = time.perf_counter()
+        timings = {"providers": {}, "jobs": {}}
+
+        fetches = [(index, job["fetch"]) for index, job in enumerate(jobs)]
+        for index, outcome in run_concurrently(fetches, concurrency, thread_name_prefix="data-fetch"):
+            job = jobs[index]
+            provider = timings["providers"].setdefault(
+                job["provider"], {"requests": 0, "seconds": 0.0, "errors": 0}
             )
+            provider["requests"] += 1
+            provider["seconds"] = round(provider["seconds"] + outcome["seconds"], 3)
+            timings["jobs"][job["name"]] = round(outcome["seconds"], 3)
+
+            if outcome["error"]:
+                provider["errors"] += 1
+                logger.error(f"Error fetching {job['name']}: {outcome['error']}")
+                results["errors"].append(f"{job['name']} fetch error: {outcome['error']}")
+                results[job["kind"]][job["sport"]] = {"fetched": 0, "saved": 0}
+                continue
 
-            for sport, articles in all_news.items():
-                saved_count = self._save_news_articles(articles, sport)
-                results["news"][sport] = {
-                    "fetched": len(articles),
-                    "saved": saved_count,
-                }
+            data, new_marks = outcome["data"] if job.get("incremental") else (outcome["data"] or [], None)
+            try:
+                saved = self._save_feed(job, data, new_marks)
+            except Exception as e:
+                logger.error(f"Error saving {job['name']}: {e}")
+                results["errors"].append(f"{job['name']} save error: {str(e)}")
+                saved = 0
+
+            results[job["kind"]][job["sport"]] = {
+                "fetched": len(data),
+                "saved": saved,
+            }
+
+        timings["total_seconds"] = round(time.perf_counter() - started, 3)
+        results["timings"] = timings
+        results["quotas"] = self.quota_status(sports)
+        results["http_cache"] = cache_stats()
+
+        logger.info(
+            f"Fetched {len(jobs)} feeds in {timings['total_seconds']}s: "
+            + ", ".join(
+                f"{name} {stats['requests']} jobs / {stats['seconds']}s"
+                for name, stats in timings["providers"].items()
+            )
+        )
 
-        except Exception as e:
-            logger.error(f"Error fetching news: {e}")
-            results["errors"].append(f"News fetch error: {str(e)}")
+        return results
 
-        # Fetch fixtures
-        logger.info("Fetching fixtures...")
-        try:
-            # Formula 1
-            if "formula1" in sports:
-                f1_races = self.sports_api.f1.get_upcoming_races(limit=10)
-                saved = self._save_f1_fixtures(f1_races)
-                results["fixtures"]["formula1"] = {
-                    "fetched": len(f1_races),
-                    "saved": saved,
-                }
-
-            # Football
-            if "soccer" in sports:
-                pl_fixtures = self.sports_api.football.get_premier_league_fixtures(
-                    next_n=15
-                )
-                saved = self._save_football_fixtures(pl_fixtures, "Premier League")
-                results["fixtures"]["soccer"] = {
-                    "fetched": len(pl_fixtures),
-                    "saved": saved,
-                }
-
-            # Rugby
-            if "rugby" in sports:
-                rugby_fixtures = self.sports_api.rugby.get_fixtures()
-                saved = self._save_rugby_fixtures(rugby_fixtures)
-                results["fixtures"]["rugby"] = {
-                    "fetched": len(rugby_fixtures),
-                    "saved": saved,
-                }
+    def _fetch_jobs(self, sports: List[str], marks: Dict = None) -> List[Dict]:
+        """
+        One job per upstream feed
 
-        except Exception as e:
-            logger.error(f"Error fetching fixtures: {e}")
-            results["errors"].append(f"Fixtures fetch error: {str(e)}")
+        A job is {"name", "provider", "kind" (news|fixtures), "sport",
+        "quota": the provider quota it draws on, "calls": the requests it
+        is budgeted (incremental news may read a few more pages, within
+        the quota), "fetch": callable doing only network I/O, "save":
+        callable storing the fetched list and returning the saved count}.
+        News jobs are "incremental": fetch returns (articles, new marks).
+        Fixture jobs carry their feed's "mark".
 
-        return results
+        Args:
+            marks: {provider: IngestionWatermark.load(...)}, None for none
+        """
+        marks = marks or {}
+        news_marks = marks.get("newsdata", {})
+        fixture_marks = marks.get("api-sports", {})
+
+        jobs = [
+            {
+                "name": f"news:{sport}",
+                "provider": "newsdata",
+                "kind": "news",
+                "sport": sport,
+                "quota": get_provider_quota("newsdata"),
+                "calls": len(self.news_api.queries_for(sport)),
+                "incremental": True,
+                "fetch": partial(
+                    self.news_api.get_new_sport_news,
+                    sport,
+                    marks={query: mark for (mark_sport, query), mark in news_marks.items() if mark_sport == sport},
+                ),
+                "save": partial(self._save_news_articles, sport=sport),
+            }
+            for sport in sports
+        ]
+
+        # One request each (API-Sports sport APIs are counted separately)
+        fixture_feeds = {
+            "formula1": (
+                self.sports_api.f1.sport,
+                partial(self.sports_api.f1.get_upcoming_races, limit=10),
+                self._save_f1_fixtures,
+            ),
+            "soccer": (
+                self.sports_api.football.sport,
+                partial(self.sports_api.football.get_premier_league_fixtures, next_n=15),
+                partial(self._save_football_fixtures, league_name="Premier League"),
+            ),
+            "rugby": (
+                self.sports_api.rugby.sport,
+                self.sports_api.rugby.get_fixtures,
+                self._save_rugby_fixtures,
+            ),
+        }
+        for sport, (api_sport, fetch, save) in fixture_feeds.items():
+            if sport in sports:
+                jobs.append({
+                    "name": f"fixtures:{sport}",
+                    "provider": "api-sports",
+                    "kind": "fixtures",
+                    "sport": sport,
+                    "quota": get_provider_quota("api-sports", api_sport),
+                    "calls": 1,
+                    "mark": fixture_marks.get((sport, "")),
+                    "fetch": fetch,
+                    "save": save,
+                })
+
+        return jobs
+
+    def _save_feed(self, job: Dict, data: List[Dict], new_marks: Dict = None) -> int:
+        """
+        Save a job's items and advance its watermarks
 
-    def _save_news_articles(self, articles: List[Dict], sport: str) -> int:
-        """Save news articles to database"""
-        saved_count = 0
+        Fixture feeds identical to the last run's (same digest) are not
+        re-saved; API-Sports has no "changed since" filter, so this is
+        where an unchanged feed stops costing database work.
+        """
+        if job["kind"] == "fixtures":
+            digest = hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+            if digest == (job.get("mark") or {}).get("content_digest"):
+                logger.info(f"{job['name']} unchanged since the last run, not saving")
+                IngestionWatermark.advance(job["provider"], job["sport"])
+                return 0
+
+            saved = job["save"](data)
+            IngestionWatermark.advance(
+                job["provider"], job["sport"], content_digest=digest, last_fixture_update=timezone.now()
+            )
+            return saved
+
+        saved = job["save"](data)
+        for query, mark in (new_marks or {}).items():
+            IngestionWatermark.advance(job["provider"], job["sport"], query, **mark)
+        return saved
+
+    def _plan_jobs(self, jobs: List[Dict]):
+        """
+        Split jobs into those run now and those deferred to a later run
+
+        Each quota's remaining calls are shared evenly between the fetch
+        runs (every NEWSLETTER_FETCH_INTERVAL) left before it resets, so
+        early runs don't starve later ones and the last run of the window
+        may spend whatever is left. Jobs are admitted in order while their
+        calls fit this run's share.
+
+        Returns:
+            (jobs to run, names of deferred jobs)
+        """
+        interval = getattr(settings, "NEWSLETTER_FETCH_INTERVAL", 21600)
+        budgets = {}
+        scheduled, deferred = [], []
+
+        for job in jobs:
+            quota = job["quota"]
+            if quota.name not in budgets:
+                runs_left = max(1, math.ceil(quota.reset_in() / interval))
+                budgets[quota.name] = math.ceil(quota.remaining() / runs_left)
+
+            if job["calls"] <= budgets[quota.name]:
+                budgets[quota.name] -= job["calls"]
+                scheduled.append(job)
+            else:
+                deferred.append(job["name"])
+
+        return scheduled, deferred
+
+    def quota_status(self, sports: List[str] = None) -> Dict:
+        """Limit, used, remaining and reset_in of each quota the fetch jobs use"""
+        if sports is None:
+            sports = ["soccer", "formula1", "rugby", "tennis", "golf", "boxing"]
 
+        quotas = {job["quota"].name: job["quota"] for job in self._fetch_jobs(sports)}
+        return {name: quota.status() for name, quota in quotas.items()}
+
+    def _save_news_articles(self, articles: List[Dict], sport: str) -> int:
+        """Save news articles to database (one bulk upsert for the batch)"""
         try:
             sport_category = SportCategory.objects.get(name=sport)
         except SportCategory.DoesNotExist:
             logger.error(f"Sport category '{sport}' does not exist")
             return 0
 
-        for article_data in articles:
-            try:
-                # Check if article already exists
-                if NewsArticle.objects.filter(
-                    title=article_data["title"],
-                    source_url=article_data.get("source_url", ""),
-                ).exists():
-                    continue
-
-                # Create article
-                article = NewsArticle.objects.create(
-                    title=article_data["title"][:200],
-                    content=article_data.get("content", ""),
-                    summary=article_data.get("summary", ""),
-                    sport_category=sport_category,
-                    article_type=article_data.get("type", "news"),
-                    source_url=article_data.get("source_url", ""),
-                    link_url=article_data.get("link"),
-                    source_name=article_data.get("source_name", ""),
-                    image_url=article_data.get("image_url")
-                    or "https://bard-santner.sgp1.cdn.digitaloceanspaces.com/obsidian/bg1.jpg",
-                    publish_date=(
-                        timezone.make_aware(article_data.get("publish_date"))
-                        if article_data.get("publish_date")
-                        and not timezone.is_aware(article_data.get("publish_date"))
-                        else article_data.get("publish_date", timezone.now())
-                    ),
-                    is_featured=article_data.get("is_featured", True),
-                    is_premium=article_data.get("is_premium", False),
-                )
-                saved_count += 1
+        stats = bulk_ingest_articles(
+            [{**article_data, "title": article_data.get("title", "")[:200]} for article_data in articles],
+            sport_category,
+            image_url=DEFAULT_ARTICLE_IMAGE,
+            is_featured=True,
+        )
+
+        logger.info(
+            f"Saved {stats['inserted']} {sport} articles "
+            f"({stats['duplicates']} duplicates, {stats['near_duplicates']} near-duplicates, "
+            f"{stats['invalid']} invalid)"
+        )
+        return stats["inserted"]
+
+    def _parse_date(self, value: str, label: str) -> Optional[datetime]:
+        """Aware datetime from an API ISO date, None if it can't be parsed"""
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if not timezone.is_aware(parsed):
+                parsed = timezone.make_aware(parsed)
+            return parsed
+        except Exception as date_error:
+            logger.error(f"{label} date parsing error: {date_error}")
+            print(f"{label} date parsing error: {date_error}")
+            return None
+
+    def _upsert_fixtures(self, fixtures: List[Dict], sport: str, label: str) -> int:
+        """Bulk upsert parsed fixtures; returns the number of new fixtures"""
+        try:
+            sport_category = SportCategory.objects.get(name=sport)
+        except SportCategory.DoesNotExist:
+            logger.error(f"{label} sport category does not exist")
+            print(f"{label} sport category does not exist")
+            return 0
 
-            except Exception as e:
-                logger.error(
-                    f"Error saving article '{article_data.get('title', 'Unknown')}': {e}"
-                )
-                continue
+        stats = bulk_upsert_fixtures(fixtures, sport_category)
 
-        logger.info(f"Saved {saved_count} {sport} articles")
-        return saved_count
+        logger.info(
+            f"{label} Summary: {stats['created']} new, {stats['updated']} updated, "
+            f"{stats['unchanged']} unchanged fixtures"
+        )
+        print(f"{label} Summary: {stats['created']} new fixtures saved")
+        return stats['created']
 
     def _save_f1_fixtures(self, races: List[Dict]) -> int:
         """Save Formula 1 fixtures to database"""
-        saved_count = 0
-        
-        try:
-            sport_category = SportCategory.objects.get(name='formula1')
-        except SportCategory.DoesNotExist:
-            logger.error("Formula1 sport category does not exist")
-            print("Formula1 sport category does not exist")
-            return 0
-        
+        fixtures = []
+
         for race in races:
             try:
-                # Parse race date
-                try:
-                    race_date = datetime.fromisoformat(race['date'].replace('Z', '+00:00'))
-                    if not timezone.is_aware(race_date):
-                        race_date = timezone.make_aware(race_date)
-                except Exception as date_error:
-
-                    logger.error(f"F1 date parsing error: {date_error}")
-                    print(f"F1 date parsing error: {date_error}")
-                    race_date = timezone.now() + timedelta(days=30)
-                
+                race_date = self._parse_date(race['date'], "F1") or timezone.now() + timedelta(days=30)
+
                 race_name = race.get('competition', {}).get('name', 'F1 Race')
                 location = race.get('competition', {}).get('location', {})
                 city = location.get('city', '')
                 country = location.get('country', '')
                 venue = f"{city}, {country}" if city and country else city or country or 'TBD'
-                
-                logger.info(f"Attempting to save F1 race: {race_name} at {venue} on {race_date}")
-                print(f"Attempting to save F1 race: {race_name} at {venue} on {race_date}")
-                
-                # Create or update fixture - TRUNCATE TO MODEL LIMITS
-                fixture, created = MatchFixture.objects.update_or_create(
-                    home_team=race_name[:100],  # Model limit is 100
-                    away_team='Formula 1 Race'[:100],  # Model limit is 100
-                    match_date=race_date,
-                    sport_category=sport_category,
-                    defaults={
-                        'venue': venue[:200],  # Model limit is 200
-                        'league_competition': 'Formula 1 World Championship'[:100],  # Model limit is 100
-                        'status': str(race.get('status', 'scheduled'))[:50],  # Model limit is 50
-                        'source_url': ''
-                    }
-                )
-                
-                if created:
-                    saved_count += 1
-                    logger.info(f"✓ Saved F1 race: {race_name}")
-                    print(f"✓ Saved F1 race: {race_name}")
-                else:
-                    logger.info(f"- F1 race already exists: {race_name}")
-                    print(f"- F1 race already exists: {race_name}")
-                    
+
+                fixtures.append({
+                    'external_id': f"api-sports:formula1:{race['id']}" if race.get('id') else None,
+                    'home_team': race_name,
+                    'away_team': 'Formula 1 Race',
+                    'match_date': race_date,
+                    'venue': venue,
+                    'league_competition': 'Formula 1 World Championship',
+                    'status': race.get('status', 'scheduled'),
+                })
+
             except Exception as e:
-                logger.error(f"✗ Error saving F1 race '{race.get('competition', {}).get('name', 'Unknown')}': {e}")
-                print(f"✗ Error saving F1 race '{race.get('competition', {}).get('name', 'Unknown')}': {e}")
-                import traceback
-                logger.error(traceback.format_exc())
-                print(traceback.format_exc())
+                logger.error(f"✗ Error parsing F1 race '{race.get('competition', {}).get('name', 'Unknown')}': {e}")
+                print(f"✗ Error parsing F1 race '{race.get('competition', {}).get('name', 'Unknown')}': {e}")
                 continue
-        
-        logger.info(f"F1 Summary: {saved_count} new fixtures saved")
-        print(f"F1 Summary: {saved_count} new fixtures saved")
-        return saved_count
+
+        return self._upsert_fixtures(fixtures, 'formula1', 'F1')
 
     def _save_football_fixtures(self, fixtures: List[Dict], league_name: str) -> int:
         """Save football fixtures to database"""
-        saved_count = 0
-        
-        try:
-            sport_category = SportCategory.objects.get(name='soccer')
-        except SportCategory.DoesNotExist:
-            logger.error("Soccer sport category does not exist")
-            print("Soccer sport category does not exist")
-            return 0
-        
+        status_map = {
+            'NS': 'scheduled',
+            'LIVE': 'live',
+            'FT': 'completed',
+            'PST': 'postponed',
+            'CANC': 'cancelled'
+        }
+        parsed = []
+
         for fixture in fixtures:
             try:
                 # Extract teams
                 teams = fixture.get('teams', {})
                 home_team = teams.get('home', {}).get('name', 'TBD')
                 away_team = teams.get('away', {}).get('name', 'TBD')
-                
+
                 # Parse date
                 fixture_date_str = fixture.get('fixture', {}).get('date')
                 if not fixture_date_str:
                     logger.warning(f"No date for fixture: {home_team} vs {away_team}")
                     print(f"No date for fixture: {home_team} vs {away_team}")
                     continue
-                    
-                try:
-                    fixture_date = datetime.fromisoformat(fixture_date_str.replace('Z', '+00:00'))
-                    if not timezone.is_aware(fixture_date):
-                        fixture_date = timezone.make_aware(fixture_date)
-                except Exception as date_error:
-                    logger.error(f"Football date parsing error: {date_error}")
-                    print(f"Football date parsing error: {date_error}")
+
+                fixture_date = self._parse_date(fixture_date_str, "Football")
+                if fixture_date is None:
                     continue
-                
-                venue = fixture.get('fixture', {}).get('venue', {}).get('name', 'TBD')
-                
+
                 # Get scores
                 goals = fixture.get('goals', {})
-                home_score = goals.get('home')
-                away_score = goals.get('away')
-                
                 status = fixture.get('fixture', {}).get('status', {}).get('short', 'NS')
-                status_map = {
-                    'NS': 'scheduled',
-                    'LIVE': 'live',
-                    'FT': 'completed',
-                    'PST': 'postponed',
-                    'CANC': 'cancelled'
-                }
-                
-                logger.info(f"Attempting to save football: {home_team} vs {away_team}")
-                print(f"Attempting to save football: {home_team} vs {away_team}")
-                
-                # Create or update fixture - TRUNCATE TO MODEL LIMITS
-                match_fixture, created = MatchFixture.objects.update_or_create(
-                    home_team=home_team[:100],  # Model limit is 100
-                    away_team=away_team[:100],  # Model limit is 100
-                    match_date=fixture_date,
-                    sport_category=sport_category,
-                    defaults={
-                        'venue': venue[:200],  # Model limit is 200
-                        'league_competition': league_name[:100],  # Model limit is 100
-                        'status': status_map.get(status, 'scheduled')[:50],  # Model limit is 50
-                        'home_score': home_score,
-                        'away_score': away_score,
-                        'source_url': ''
-                    }
-                )
-                
-                if created:
-                    saved_count += 1
-                    logger.info(f"✓ Saved football: {home_team} vs {away_team}")
-                    print(f"✓ Saved football: {home_team} vs {away_team}")
-                else:
-                    logger.info(f"- Football fixture already exists: {home_team} vs {away_team}")
-                    print(f"- Football fixture already exists: {home_team} vs {away_team}")
-                    
+                fixture_id = fixture.get('fixture', {}).get('id')
+
+                parsed.append({
+                    'external_id': f"api-sports:soccer:{fixture_id}" if fixture_id else None,
+                    'home_team': home_team,
+                    'away_team': away_team,
+                    'match_date': fixture_date,
+                    'venue': fixture.get('fixture', {}).get('venue', {}).get('name', 'TBD'),
+                    'league_competition': league_name,
+                    'status': status_map.get(status, 'scheduled'),
+                    'home_score': goals.get('home'),
+                    'away_score': goals.get('away'),
+                })
+
             except Exception as e:
-                logger.error(f"✗ Error saving football fixture: {e}")
-                print(f"✗ Error saving football fixture: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
-                print(traceback.format_exc())
+                logger.error(f"✗ Error parsing football fixture: {e}")
+                print(f"✗ Error parsing football fixture: {e}")
                 continue
-        
-        logger.info(f"Football Summary: {saved_count} new {league_name} fixtures saved")
-        print(f"Football Summary: {saved_count} new {league_name} fixtures saved")
-        return saved_count
+
+        return self._upsert_fixtures(parsed, 'soccer', f"Football ({league_name})")
 
     def _save_rugby_fixtures(self, fixtures: List[Dict]) -> int:
         """Save rugby fixtures to database"""
-        saved_count = 0
-        
-        try:
-            sport_category = SportCategory.objects.get(name='rugby')
-        except SportCategory.DoesNotExist:
-            logger.error("Rugby sport category does not exist")
-            print("Rugby sport category does not exist")
-            return 0
-        
+        parsed = []
+
         for fixture in fixtures:
             try:
                 # Extract teams
                 teams = fixture.get('teams', {})
                 home_team = teams.get('home', {}).get('name', 'TBD')
                 away_team = teams.get('away', {}).get('name', 'TBD')
-                
+
                 # Parse date
                 fixture_date_str = fixture.get('date')
                 if not fixture_date_str:
                     logger.warning(f"No date for rugby fixture: {home_team} vs {away_team}")
                     print(f"No date for rugby fixture: {home_team} vs {away_team}")
                     continue
-                    
-                try:
-                    fixture_date = datetime.fromisoformat(fixture_date_str.replace('Z', '+00:00'))
-                    if not timezone.is_aware(fixture_date):
-                        fixture_date = timezone.make_aware(fixture_date)
-                except Exception as date_error:
-                    logger.error(f"Rugby date parsing error: {date_error}")
-                    print(f"Rugby date parsing error: {date_error}")
+
+                fixture_date = self._parse_date(fixture_date_str, "Rugby")
+                if fixture_date is None:
                     continue
-                
-                venue = fixture.get('venue', 'TBD') or 'TBD'
-                league = fixture.get('league', {}).get('name', 'Rugby Match') or 'Rugby Match'
-                
+
                 # Get status
                 status_obj = fixture.get('status', {})
                 if isinstance(status_obj, dict):
                     status = status_obj.get('short', 'scheduled')
                 else:
                     status = str(status_obj) if status_obj else 'scheduled'
-                
-                logger.info(f"Attempting to save rugby: {home_team} vs {away_team}")
-                print(f"Attempting to save rugby: {home_team} vs {away_team}")
-                
-                # Create or update fixture - TRUNCATE TO MODEL LIMITS
-                match_fixture, created = MatchFixture.objects.update_or_create(
-                    home_team=home_team[:100],  # Model limit is 100
-                    away_team=away_team[:100],  # Model limit is 100
-                    match_date=fixture_date,
-                    sport_category=sport_category,
-                    defaults={
-                        'venue': venue[:200],  # Model limit is 200
-                        'league_competition': league[:100],  # Model limit is 100
-                        'status': status[:50],  # Model limit is 50
-                        'source_url': ''
-                    }
-                )
-                
-                if created:
-                    saved_count += 1
-                    logger.info(f"✓ Saved rugby: {home_team} vs {away_team}")
-                    print(f"✓ Saved rugby: {home_team} vs {away_team}")
-                else:
-                    logger.info(f"- Rugby fixture already exists: {home_team} vs {away_team}")
-                    print(f"- Rugby fixture already exists: {home_team} vs {away_team}")
-                    
+
+                parsed.append({
+                    'external_id': f"api-sports:rugby:{fixture['id']}" if fixture.get('id') else None,
+                    'home_team': home_team,
+                    'away_team': away_team,
+                    'match_date': fixture_date,
+                    'venue': fixture.get('venue', 'TBD') or 'TBD',
+                    'league_competition': fixture.get('league', {}).get('name', 'Rugby Match') or 'Rugby Match',
+                    'status': status,
+                })
+
             except Exception as e:
-                logger.error(f"✗ Error saving rugby fixture: {e}")
-                print(f"✗ Error saving rugby fixture: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
+                logger.error(f"✗ Error parsing rugby fixture: {e}")
+                print(f"✗ Error parsing rugby fixture: {e}")
                 continue
-        
-        logger.info(f"Rugby Summary: {saved_count} new fixtures saved")
-        print(f"Rugby Summary: {saved_count} new fixtures saved")
-        return saved_count
+
+        return self._upsert_fixtures(parsed, 'rugby', 'Rugby')
 
     def fetch_trending_news(self, limit: int = 20) -> Dict:
         """Fetch and save trending sports news"""
@@ -471,6 +533,8 @@ class DataFetcher:
             "sports_api": self.sports_api.health_check(),
             "news_api": self.news_api.health_check(),
             "database": self._check_database_health(),
+            "quotas": self.quota_status(),
+            "http_cache": cache_stats(),
         }
 
     def _check_database_health(self) -> bool:
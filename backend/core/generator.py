@@ -4,22 +4,39 @@ Updated Newsletter Generator Module
 Handles newsletter creation using API-fetched data
 """
 import logging
+import smtplib
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from django.db import transaction
 from django.db.models import Q, Count
 from django.template.loader import render_to_string
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.conf import settings
 from django.utils import timezone
 
 from core.models import (
     Newsletter, NewsletterSubscriber, NewsArticle, 
-    MatchFixture, SportCategory, NewsletterDelivery
+    MatchFixture, SportCategory, NewsletterDelivery, NewsletterSendRun
 )
+from .dashboard_stats import bump
 from .data_fetcher import DataFetcher
+from .async_delivery import AsyncDeliveryEngine, PERMANENT, SENT
+from .rate_limit import get_email_rate_limiter
+from .snapshot import (
+    filter_by_sports, freeze_content_snapshot, get_content_snapshot, hydrate_snapshot
+)
+from .tracking import NO_DELIVERY_ID, link_placeholder, personalize_links
+from .utils import iter_keyset_pages, iter_pk_chunks
 
 logger = logging.getLogger(__name__)
 
+# Stands in for the unsubscribe token in segment renders
+SUBSCRIBER_TOKEN_PLACEHOLDER = '__SUBSCRIBER_TOKEN__'
+
+# Columns loaded when streaming subscribers for a send
+SUBSCRIBER_SEND_FIELDS = ('id', 'email', 'name', 'preferences', 'unsubscribe_token')
+
 
 class NewsletterGeneratorV2:
     """
@@ -44,7 +61,8 @@ class NewsletterGeneratorV2:
         
         articles = NewsArticle.objects.filter(
             publish_date__gte=cutoff_date,
-            article_type='news'
+            article_type='news',
+            duplicate_of__isnull=True  # One copy of each story
         ).select_related('sport_category').order_by(
             '-is_premium',  # Premium articles first
             '-is_featured',
@@ -63,7 +81,8 @@ class NewsletterGeneratorV2:
             articles = NewsArticle.objects.filter(
                 sport_category=category,
                 publish_date__gte=cutoff_date,
-                article_type='news'
+                article_type='news',
+                duplicate_of__isnull=True
             ).order_by('-is_premium', '-is_featured', '-publish_date')[:limit_per_sport]
             
             if articles:
@@ -108,12 +127,14 @@ class NewsletterGeneratorV2:
         
         featured_articles = NewsArticle.objects.filter(
             is_featured=True,
-            publish_date__gte=cutoff_date
+            publish_date__gte=cutoff_date,
+            duplicate_of__isnull=True
         ).select_related('sport_category').order_by('-publish_date')[:5]
         
         premium_articles = NewsArticle.objects.filter(
             is_premium=True,
-            publish_date__gte=cutoff_date
+            publish_date__gte=cutoff_date,
+            duplicate_of__isnull=True
         ).select_related('sport_category').order_by('-publish_date')[:10]
         
         return {
@@ -127,7 +148,8 @@ class NewsletterGeneratorV2:
         # Top 3 premium articles
         top_articles = NewsArticle.objects.filter(
             is_premium=True,
-            publish_date__gte=timezone.now() - timedelta(days=7)
+            publish_date__gte=timezone.now() - timedelta(days=7),
+            duplicate_of__isnull=True
         ).order_by('-publish_date')[:3]
         
         # Biggest upcoming matches (next 7 days)
@@ -232,6 +254,9 @@ class NewsletterGeneratorV2:
             if content['fixtures']:
                 newsletter.fixtures.set(content['fixtures'])
             
+            # Freeze the content so sends never go back to the content tables
+            freeze_content_snapshot(newsletter, save=False)
+            
             # Generate preview content
             preview_content = self.generate_preview_content(content)
             newsletter.content = preview_content
@@ -309,69 +334,120 @@ class NewsletterGeneratorV2:
     
     def send_newsletter_to_subscribers(self, newsletter: Newsletter,
                                       test_mode: bool = False,
-                                      test_email: str = None) -> Dict:
+                                      test_email: str = None,
+                                      batch_size: int = None,
+                                      pk_range: Tuple = None,
+                                      engine: str = None) -> Dict:
         """
         Send newsletter to subscribers
         
+        Subscribers are sent to in batches; each batch shares one mail
+        backend connection instead of opening a new SMTP session per email.
+        Content is rendered once per sport-preference segment and reused for
+        every subscriber in that segment.
+        
+        Progress is checkpointed in a NewsletterSendRun after every batch.
+        Calling this again for the same newsletter (and pk_range) resumes
+        from the last checkpoint, and subscribers whose delivery is no longer
+        pending are never sent to twice.
+        
         Args:
             newsletter: Newsletter to send
             test_mode: If True, only send to test_email
             test_email: Email for test mode
+            batch_size: Emails per connection (default: NEWSLETTER_SEND_BATCH_SIZE)
+            pk_range: Optional (first_pk, last_pk) to send one chunk of subscribers;
+                      the newsletter status is then left to the caller
+            engine: 'sync' (one message at a time per connection) or 'async'
+                    (a pool of concurrent SMTP sessions per page, see
+                    core.async_delivery); default: NEWSLETTER_DELIVERY_ENGINE
+        
+        Raises:
+            ValueError: test_mode without a test_email
         """
+        if test_mode and not test_email:
+            # Falling through would send to every active subscriber
+            raise ValueError("test_mode needs a test_email")
+        
+        batch_size = max(1, batch_size or getattr(settings, 'NEWSLETTER_SEND_BATCH_SIZE', 50))
+        engine = engine or getattr(settings, 'NEWSLETTER_DELIVERY_ENGINE', 'sync')
+        
         results = {
             'sent': 0,
             'failed': 0,
-            'errors': []
+            'skipped': 0,
+            'errors': [],
+            'batches': [],
+            'segments': 0,
+            'resumed_from': None
         }
         
+        page_size = max(batch_size, getattr(settings, 'NEWSLETTER_DELIVERY_FLUSH_SIZE', 500))
+        
+        run = None
         try:
             # Get subscribers
-            if test_mode and test_email:
+            if test_mode:
                 # Test mode: create temporary subscriber
-                subscribers = [type('obj', (object,), {
+                pages = [[type('obj', (object,), {
+                    'pk': None,
                     'email': test_email,
                     'name': 'Test User',
                     'preferences': {},
                     'unsubscribe_token': 'test-token'
-                })]
+                })]]
                 logger.info(f"Test mode: sending to {test_email}")
             else:
-                subscribers = NewsletterSubscriber.objects.filter(
-                    status='active'
-                )
-                logger.info(f"Sending to {subscribers.count()} subscribers")
+                run = self._start_send_run(newsletter, pk_range)
+                if run.status == 'completed':
+                    logger.info(f"Newsletter {newsletter.id} [{run.scope}] already sent, nothing to do")
+                    return results
+                
+                subscribers = NewsletterSubscriber.objects.filter(status='active')
+                if pk_range:
+                    subscribers = subscribers.filter(
+                        pk__gte=pk_range[0],
+                        pk__lte=pk_range[1]
+                    )
+                
+                # Resume with a keyset scan from the checkpoint
+                if run.last_subscriber_id:
+                    subscribers = subscribers.filter(pk__gt=run.last_subscriber_id)
+                    results['resumed_from'] = str(run.last_subscriber_id)
+                    logger.info(f"Resuming newsletter {newsletter.id} [{run.scope}] after {run.last_subscriber_id}")
+                
+                # Stream subscribers a page at a time by keyset pagination,
+                # loading only the columns needed to render and address the email
+                pages = iter_keyset_pages(subscribers, page_size, fields=SUBSCRIBER_SEND_FIELDS)
             
-            # Send to each subscriber
-            for subscriber in subscribers:
-                try:
-                    self.send_newsletter_email(newsletter, subscriber)
-                    results['sent'] += 1
-                    
-                    # Track delivery (skip for test mode)
-                    if not test_mode:
-                        NewsletterDelivery.objects.create(
-                            newsletter=newsletter,
-                            subscriber=subscriber,
-                            status='sent',
-                            sent_at=timezone.now()
-                        )
-                    
-                except Exception as e:
-                    results['failed'] += 1
-                    results['errors'].append({
-                        'email': subscriber.email,
-                        'error': str(e)
-                    })
-                    logger.error(f"Failed to send to {subscriber.email}: {e}")
+            # Deliveries are written per page; each page is sent in batches,
+            # one connection per batch, and renders are shared between
+            # subscribers with the same preferences
+            segment_cache = {}
+            for page in pages:
+                self._send_page(newsletter, page, results, batch_size, test_mode, segment_cache, run, engine)
+            
+            results['segments'] = len(segment_cache)
+            
+            if run:
+                bump('recent_sent', results['sent'])
+                run.status = 'completed'
+                run.finished_at = timezone.now()
+                run.save(update_fields=['status', 'finished_at', 'updated_at'])
             
-            # Update newsletter status (skip for test mode)
-            if not test_mode and results['sent'] > 0:
+            # Update newsletter status (skip for test mode and chunks)
+            if run and not pk_range and run.sent_count > 0:
+                if newsletter.status != 'sent':
+                    bump('sent_newsletters')
                 newsletter.status = 'sent'
                 newsletter.sent_at = timezone.now()
-                newsletter.sent_to_count = results['sent']
+                newsletter.sent_to_count = run.sent_count
                 newsletter.save()
             
-            logger.info(f"Newsletter delivery complete: {results['sent']} sent, {results['failed']} failed")
+            logger.info(
+                f"Newsletter delivery complete: {results['sent']} sent, "
+                f"{results['failed']} failed, {results['skipped']} skipped"
+            )
             
         except Exception as e:
             logger.error(f"Error sending newsletter: {e}")
@@ -379,73 +455,433 @@ class NewsletterGeneratorV2:
                 'email': 'general',
                 'error': str(e)
             })
+            
+            if run:
+                run.status = 'failed'
+                run.save(update_fields=['status', 'updated_at'])
         
         return results
     
+    def _start_send_run(self, newsletter: Newsletter, pk_range: Tuple = None) -> NewsletterSendRun:
+        """Get or create the checkpoint for this newsletter (or chunk) and mark it running"""
+        scope = f"{pk_range[0]}:{pk_range[1]}" if pk_range else 'all'
+        
+        run, created = NewsletterSendRun.objects.get_or_create(
+            newsletter=newsletter,
+            scope=scope
+        )
+        
+        if run.status != 'completed':
+            run.status = 'running'
+            run.attempts += 1
+            run.save(update_fields=['status', 'attempts', 'updated_at'])
+        
+        return run
+    
+    def get_subscriber_chunks(self, chunk_size: int) -> List[Tuple[str, str]]:
+        """
+        Split active subscribers into id ranges of at most chunk_size
+        
+        Returns a list of (first_pk, last_pk) tuples, inclusive, in pk order.
+        Only primary keys are read, one chunk at a time.
+        """
+        subscribers = NewsletterSubscriber.objects.filter(status='active')
+        
+        chunks = []
+        for pks in iter_pk_chunks(subscribers, chunk_size):
+            chunks.append((str(pks[0]), str(pks[-1])))
+        
+        return chunks
+    
+    def _send_page(self, newsletter: Newsletter, subscribers: List, results: Dict,
+                   batch_size: int, test_mode: bool = False,
+                   segment_cache: Dict = None, run: NewsletterSendRun = None,
+                   engine: str = 'sync'):
+        """
+        Send a page of subscribers, recording their deliveries in bulk
+        
+        The sync engine sends and checkpoints one batch at a time; the async
+        engine hands the whole page to its session pool as one batch.
+        """
+        deliveries = None if test_mode else self._prepare_deliveries(newsletter, subscribers)
+        
+        # Idempotency: only subscribers whose delivery is still pending
+        if deliveries is not None:
+            pending = [
+                subscriber for subscriber in subscribers
+                if deliveries[subscriber.pk].status == 'pending'
+            ]
+            results['skipped'] += len(subscribers) - len(pending)
+        else:
+            pending = subscribers
+        
+        if engine == 'async':
+            send_batch = self._send_batch_async
+            batch_size = max(1, len(pending))
+        else:
+            send_batch = self._send_batch
+        
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            
+            if deliveries is not None:
+                batch = self._claim_deliveries(batch, deliveries, results)
+                if not batch:
+                    continue
+            
+            try:
+                send_batch(newsletter, batch, results, test_mode, segment_cache, deliveries)
+            except Exception:
+                if deliveries is not None:
+                    self._flush_deliveries([deliveries[subscriber.pk] for subscriber in batch])
+                raise
+            
+            if deliveries is not None:
+                self._checkpoint(run, batch, deliveries, results['batches'][-1])
+        
+        # Move the cursor past any skipped subscribers at the end of the page
+        if run and subscribers and run.last_subscriber_id != subscribers[-1].pk:
+            run.last_subscriber_id = subscribers[-1].pk
+            run.save(update_fields=['last_subscriber_id', 'updated_at'])
+    
+    def _prepare_deliveries(self, newsletter: Newsletter, subscribers: List) -> Dict:
+        """Create pending deliveries for a page of subscribers in one insert"""
+        NewsletterDelivery.objects.bulk_create(
+            [
+                NewsletterDelivery(newsletter=newsletter, subscriber=subscriber, status='pending')
+                for subscriber in subscribers
+            ],
+            ignore_conflicts=True
+        )
+        
+        # Re-read so rows left by an earlier attempt are picked up too
+        deliveries = NewsletterDelivery.objects.filter(
+            newsletter=newsletter,
+            subscriber__in=[subscriber.pk for subscriber in subscribers]
+        ).only('id', 'subscriber_id', 'status', 'sent_at', 'error_message')
+        
+        return {delivery.subscriber_id: delivery for delivery in deliveries}
+    
+    def _claim_deliveries(self, subscribers: List, deliveries: Dict, results: Dict) -> List:
+        """
+        Mark a batch as 'sending' before any email goes out
+        
+        A worker that dies mid-batch leaves these rows as 'sending', so a
+        resumed run skips them instead of mailing them a second time. Rows
+        already claimed by a concurrent run are dropped from the batch.
+        """
+        ids = [deliveries[subscriber.pk].id for subscriber in subscribers]
+        
+        with transaction.atomic():
+            claimed = set(
+                NewsletterDelivery.objects.select_for_update(skip_locked=True).filter(
+                    id__in=ids,
+                    status='pending'
+                ).values_list('id', flat=True)
+            )
+            NewsletterDelivery.objects.filter(id__in=claimed).update(status='sending')
+        
+        batch = []
+        for subscriber in subscribers:
+            delivery = deliveries[subscriber.pk]
+            if delivery.id in claimed:
+                delivery.status = 'sending'
+                batch.append(subscriber)
+        
+        results['skipped'] += len(subscribers) - len(batch)
+        return batch
+    
+    def _flush_deliveries(self, deliveries: List):
+        """Write delivery status transitions in a batched update"""
+        for delivery in deliveries:
+            # Never attempted (the batch was aborted): release for a retry
+            if delivery.status == 'sending':
+                delivery.status = 'pending'
+        
+        NewsletterDelivery.objects.bulk_update(
+            deliveries,
+            ['status', 'sent_at', 'error_message'],
+            batch_size=getattr(settings, 'NEWSLETTER_DELIVERY_FLUSH_SIZE', 500)
+        )
+    
+    def _checkpoint(self, run: NewsletterSendRun, batch: List, deliveries: Dict, batch_stats: Dict):
+        """Record a finished batch: delivery statuses and the run cursor, atomically"""
+        with transaction.atomic():
+            self._flush_deliveries([deliveries[subscriber.pk] for subscriber in batch])
+            
+            if run:
+                run.last_subscriber_id = batch[-1].pk
+                run.sent_count += batch_stats['sent']
+                run.failed_count += batch_stats['failed']
+                run.save(update_fields=[
+                    'last_subscriber_id', 'sent_count', 'failed_count', 'updated_at'
+                ])
+    
+    def _send_batch(self, newsletter: Newsletter, subscribers: List,
+                    results: Dict, test_mode: bool = False,
+                    segment_cache: Dict = None, deliveries: Dict = None):
+        """Send one batch of emails over a single backend connection"""
+        started = time.perf_counter()
+        sent_before = results['sent']
+        failed_before = results['failed']
+        
+        connection = get_connection()
+        limiter = get_email_rate_limiter(getattr(connection, 'host', None))
+        try:
+            connection.open()
+            
+            for subscriber in subscribers:
+                try:
+                    email = self.build_newsletter_email(
+                        newsletter, subscriber,
+                        connection=connection,
+                        segment_cache=segment_cache,
+                        delivery=deliveries.get(subscriber.pk) if deliveries else None
+                    )
+                    
+                    # Shared across all workers sending through this relay
+                    if limiter:
+                        limiter.acquire()
+                    
+                    self._send_with_reconnect(connection, email)
+                    results['sent'] += 1
+                    
+                    # Track delivery (flushed with the page; skipped in test mode)
+                    if deliveries and subscriber.pk in deliveries:
+                        delivery = deliveries[subscriber.pk]
+                        delivery.status = 'sent'
+                        delivery.sent_at = timezone.now()
+                        delivery.error_message = ''
+                    
+                except Exception as e:
+                    self._record_failure(subscriber, e, 'failed', results, deliveries)
+        finally:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.warning(f"Error closing mail connection: {e}")
+        
+        self._record_batch(results, len(subscribers), sent_before, failed_before, started)
+    
+    def _send_batch_async(self, newsletter: Newsletter, subscribers: List,
+                          results: Dict, test_mode: bool = False,
+                          segment_cache: Dict = None, deliveries: Dict = None):
+        """
+        Send one batch through the asyncio engine's pool of SMTP sessions
+        
+        Permanent (5xx) rejections are recorded as 'bounced'; transient
+        failures that outlived their retries and timed-out sends (unknown,
+        never retried) as 'failed'.
+        """
+        started = time.perf_counter()
+        sent_before = results['sent']
+        failed_before = results['failed']
+        
+        # Build (and render) up front; the engine only moves bytes
+        messages = []
+        recipients = []
+        for subscriber in subscribers:
+            try:
+                messages.append(self.build_newsletter_email(
+                    newsletter, subscriber,
+                    segment_cache=segment_cache,
+                    delivery=deliveries.get(subscriber.pk) if deliveries else None
+                ))
+                recipients.append(subscriber)
+            except Exception as e:
+                self._record_failure(subscriber, e, 'failed', results, deliveries)
+        
+        engine = AsyncDeliveryEngine(limiter=get_email_rate_limiter())
+        outcomes = engine.deliver(messages)
+        
+        for subscriber, outcome in zip(recipients, outcomes):
+            if outcome['status'] == SENT:
+                results['sent'] += 1
+                if deliveries and subscriber.pk in deliveries:
+                    delivery = deliveries[subscriber.pk]
+                    delivery.status = 'sent'
+                    delivery.sent_at = timezone.now()
+                    delivery.error_message = ''
+            else:
+                status = 'bounced' if outcome['status'] == PERMANENT else 'failed'
+                self._record_failure(
+                    subscriber, f"{outcome['status']}: {outcome['error']}",
+                    status, results, deliveries
+                )
+        
+        self._record_batch(results, len(subscribers), sent_before, failed_before, started)
+    
+    def _record_failure(self, subscriber, error, status: str, results: Dict, deliveries: Dict = None):
+        """Mark a subscriber's delivery failed (in memory, flushed with the batch)"""
+        if deliveries and subscriber.pk in deliveries:
+            delivery = deliveries[subscriber.pk]
+            delivery.status = status
+            delivery.error_message = str(error)
+        
+        results['failed'] += 1
+        results['errors'].append({
+            'email': subscriber.email,
+            'error': str(error)
+        })
+        logger.error(f"Failed to send to {subscriber.email}: {error}")
+    
+    def _record_batch(self, results: Dict, size: int, sent_before: int,
+                      failed_before: int, started: float):
+        """Append timing stats for a finished batch"""
+        elapsed = time.perf_counter() - started
+        batch_stats = {
+            'size': size,
+            'sent': results['sent'] - sent_before,
+            'failed': results['failed'] - failed_before,
+            'seconds': round(elapsed, 3),
+        }
+        results['batches'].append(batch_stats)
+        logger.info(
+            f"Batch {len(results['batches'])}: {batch_stats['sent']}/{batch_stats['size']} sent "
+            f"in {elapsed:.2f}s ({elapsed / max(1, size):.3f}s per email)"
+        )
+    
+    def _send_with_reconnect(self, connection, email: EmailMultiAlternatives):
+        """Send on an open connection, reconnecting once if the server dropped it"""
+        try:
+            sent = connection.send_messages([email])
+        except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+            logger.warning(f"Mail connection dropped ({e}), reconnecting")
+            try:
+                connection.close()
+            except Exception:
+                pass
+            connection.open()
+            sent = connection.send_messages([email])
+        
+        if not sent:
+            raise smtplib.SMTPException("Message was not accepted by the mail backend")
+    
     def send_newsletter_email(self, newsletter: Newsletter, subscriber):
         """Send newsletter email to a single subscriber"""
+        email = self.build_newsletter_email(newsletter, subscriber)
+        email.send()
+    
+    def build_newsletter_email(self, newsletter: Newsletter, subscriber,
+                               connection=None,
+                               segment_cache: Dict = None,
+                               delivery: NewsletterDelivery = None) -> EmailMultiAlternatives:
+        """
+        Build the newsletter email for a single subscriber
+        
+        Args:
+            newsletter: Newsletter to send
+            subscriber: Recipient
+            connection: Mail backend connection to attach to the message
+            segment_cache: Renders keyed by preference segment, shared across
+                           a send so each segment is only rendered once
+            delivery: The subscriber's delivery, for click-tracking links
+                      (test sends have none; their clicks are not recorded)
+        """
+        segment = self.get_preference_segment(subscriber)
+        
+        if segment_cache is None:
+            rendered = self.render_segment(newsletter, segment)
+        else:
+            rendered = segment_cache.get(segment)
+            if rendered is None:
+                rendered = self.render_segment(newsletter, segment)
+                segment_cache[segment] = rendered
+        
+        # Swap the segment placeholders for this subscriber's token and
+        # for links signed for their delivery
+        token = str(getattr(subscriber, 'unsubscribe_token', 'token'))
+        delivery_id = str(delivery.id) if delivery else NO_DELIVERY_ID
+        html_content = personalize_links(rendered[0].replace(SUBSCRIBER_TOKEN_PLACEHOLDER, token), delivery_id)
+        text_content = personalize_links(rendered[1].replace(SUBSCRIBER_TOKEN_PLACEHOLDER, token), delivery_id)
+        
+        # Create email
+        subject = newsletter.title
+        from_email = settings.DEFAULT_FROM_EMAIL
+        to_email = subscriber.email
+        
+        email = EmailMultiAlternatives(
+            subject=subject,
+            body=text_content,
+            from_email=from_email,
+            to=[to_email],
+            connection=connection
+        )
+        email.attach_alternative(html_content, "text/html")
+        return email
+    
+    def get_preference_segment(self, subscriber) -> Tuple[str, ...]:
+        """
+        Normalized sport-preference key for a subscriber
         
-        # Get subscriber preferences
+        Subscribers with the same key receive identical content, so the key
+        is used to share one render between them. An empty key means no
+        preference (all sports).
+        """
         preferences = getattr(subscriber, 'preferences', {}) or {}
-        preferred_sports = preferences.get('sports', [])
+        sports = preferences.get('sports', []) or []
+        if isinstance(sports, str):
+            sports = [sports]
         
-        # Filter content based on preferences
-        articles = newsletter.articles.all()
-        if preferred_sports:
-            articles = articles.filter(
-                sport_category__name__in=preferred_sports
-            )
+        return tuple(sorted({str(sport).strip().lower() for sport in sports if sport}))
+    
+    def build_segment_context(self, newsletter: Newsletter, sports: Tuple[str, ...]) -> Dict:
+        """
+        Build the template context for one preference segment
         
-        fixtures = newsletter.fixtures.all()
-        if preferred_sports:
-            fixtures = fixtures.filter(
-                sport_category__name__in=preferred_sports
-            )
+        Reads only the newsletter's content snapshot, never the content tables.
+        """
+        content = hydrate_snapshot(get_content_snapshot(newsletter))
+        
+        # Route article links through the click redirect; they are signed
+        # per recipient, so the render holds placeholders
+        if getattr(settings, 'NEWSLETTER_CLICK_TRACKING', True):
+            for article in content['articles']:
+                article.source_url = link_placeholder(article.source_url)
+        
+        # Filter content based on preferences
+        articles = filter_by_sports(content['articles'], sports)
+        fixtures = filter_by_sports(content['fixtures'], sports)
         
         # Get featured and premium articles
-        featured_articles = articles.filter(is_featured=True)[:5]
-        premium_articles = articles.filter(is_premium=True)[:10]
+        featured_articles = [article for article in articles if article.is_featured][:5]
+        premium_articles = [article for article in articles if article.is_premium][:10]
         
-        # Get highlights
-        top_stories = articles.filter(is_premium=True)[:3]
-        big_matches = fixtures.filter(
-            match_date__gte=timezone.now(),
-            match_date__lte=timezone.now() + timedelta(days=7)
-        )[:5]
+        # Get highlights (big matches were flagged when the snapshot was taken)
+        top_stories = premium_articles[:3]
+        big_matches = [fixture for fixture in fixtures if fixture.is_big_match][:5]
         
         # Organize content by sport
         articles_by_sport = {}
         for article in articles[:15]:
-            sport = article.sport_category.name
-            if sport not in articles_by_sport:
-                articles_by_sport[sport] = []
-            articles_by_sport[sport].append(article)
+            articles_by_sport.setdefault(article.sport_category.name, []).append(article)
         
         fixtures_by_sport = {}
         for fixture in fixtures[:15]:
-            sport = fixture.sport_category.name
-            if sport not in fixtures_by_sport:
-                fixtures_by_sport[sport] = []
-            fixtures_by_sport[sport].append(fixture)
+            fixtures_by_sport.setdefault(fixture.sport_category.name, []).append(fixture)
         
-        # Prepare context for the new template
-        context = {
+        # Per-subscriber URLs carry a placeholder, filled in per recipient
+        return {
             'newsletter': newsletter,
-            'subscriber': subscriber,
-            'articles': list(articles[:10]),
-            'fixtures': list(fixtures[:10]),
+            'articles': articles[:10],
+            'fixtures': fixtures[:10],
             'articles_by_sport': articles_by_sport,
             'fixtures_by_sport': fixtures_by_sport,
-            'featured_articles': list(featured_articles),
-            'premium_articles': list(premium_articles),
-            'top_stories': list(top_stories),
-            'big_matches': list(big_matches),
-            'unsubscribe_url': f"{settings.SITE_URL}/newsletter/unsubscribe/{getattr(subscriber, 'unsubscribe_token', 'token')}/",
+            'featured_articles': featured_articles,
+            'premium_articles': premium_articles,
+            'top_stories': top_stories,
+            'big_matches': big_matches,
+            'sport_names': {name: sport['display_name'] for name, sport in content['sports'].items()},
+            'unsubscribe_url': f"{settings.SITE_URL}/newsletter/unsubscribe/{SUBSCRIBER_TOKEN_PLACEHOLDER}/",
             'view_online_url': f"{settings.SITE_URL}/newsletter/view/{newsletter.id}/",
-            'preferences_url': f"{settings.SITE_URL}/newsletter/preferences/{getattr(subscriber, 'unsubscribe_token', 'token')}/",
+            'preferences_url': f"{settings.SITE_URL}/newsletter/preferences/{SUBSCRIBER_TOKEN_PLACEHOLDER}/",
             'current_year': timezone.now().year,
             'site_name': 'Obsidian Sports Newsletter',
         }
+    
+    def render_segment(self, newsletter: Newsletter, sports: Tuple[str, ...]) -> Tuple[str, str]:
+        """Render the HTML and text bodies for one preference segment"""
+        context = self.build_segment_context(newsletter, sports)
         
         # Render email templates
         try:
@@ -457,19 +893,8 @@ class NewsletterGeneratorV2:
             html_content = self.create_fallback_html_email(context)
             text_content = self.create_simple_text_email(context)
         
-        # Create and send email
-        subject = newsletter.title
-        from_email = settings.DEFAULT_FROM_EMAIL
-        to_email = subscriber.email
-        
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=from_email,
-            to=[to_email]
-        )
-        email.attach_alternative(html_content, "text/html")
-        email.send()
+        logger.info(f"Rendered newsletter segment: {', '.join(sports) or 'all sports'}")
+        return html_content, text_content
     
     def create_fallback_html_email(self, context: Dict) -> str:
         """Create a simple fallback HTML email (in case template doesn't load)"""
@@ -559,8 +984,7 @@ class NewsletterGeneratorV2:
         if context.get('articles_by_sport'):
             text += "LATEST NEWS\n" + "-" * 60 + "\n\n"
             for sport, articles in list(context['articles_by_sport'].items())[:3]:
-                sport_cat = SportCategory.objects.get(name=sport)
-                text += f"\n{sport_cat.display_name.upper()}\n\n"
+                text += f"\n{context['sport_names'].get(sport, sport).upper()}\n\n"
                 for article in articles[:3]:
                     text += f"• {article.title}\n"
                     if article.summary:
@@ -571,8 +995,7 @@ class NewsletterGeneratorV2:
         if context.get('fixtures_by_sport'):
             text += "\nUPCOMING FIXTURES\n" + "-" * 60 + "\n\n"
             for sport, fixtures in list(context['fixtures_by_sport'].items())[:3]:
-                sport_cat = SportCategory.objects.get(name=sport)
-                text += f"\n{sport_cat.display_name.upper()}\n\n"
+                text += f"\n{context['sport_names'].get(sport, sport).upper()}\n\n"
                 for fixture in fixtures[:5]:
                     text += f"• {fixture.home_team} vs {fixture.away_team}\n"
                     text += f"  {fixture.match_date.strftime('%A, %B %d at %H:%M')}\n"
@@ -0,0 +1,247 @@
+# core/http_cache.py
+"""
+Shared HTTP cache for upstream APIs and scraped sites
+A requests transport adapter that keeps GET responses in a Django cache
+(on disk, or Redis in production), serves them while fresh per
+Cache-Control/Expires, and revalidates stale ones with If-None-Match /
+If-Modified-Since so unchanged data comes back as a 304.
+"""
+import hashlib
+import logging
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from django.conf import settings
+from django.core.cache import cache, caches
+
+logger = logging.getLogger(__name__)
+
+ENTRY_KEY = 'http_cache:entry:{digest}'
+STATS_KEY = 'http_cache:stats:{name}'
+
+# hits: served from cache; revalidated: 304 from upstream, body from cache;
+# misses: full response from upstream
+STATS = ('hits', 'revalidated', 'misses')
+
+# Headers kept with a cached body (stored decoded, so not Content-Encoding)
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Expires', 'Date')
+
+
+def _enabled() -> bool:
+    return getattr(settings, 'HTTP_CACHE_ENABLED', True)
+
+
+def _store():
+    return caches[getattr(settings, 'HTTP_CACHE_ALIAS', 'default')]
+
+
+def _entry_key(url: str) -> str:
+    return ENTRY_KEY.format(digest=hashlib.sha256(url.encode('utf-8')).hexdigest())
+
+
+def _count(name: str):
+    # Stats live in the default cache, shared with the other counters
+    key = STATS_KEY.format(name=name)
+    try:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+    except Exception as e:
+        logger.warning(f"Could not update HTTP cache stat {name}: {e}")
+
+
+def cache_stats() -> Dict[str, int]:
+    """Hit / revalidation / miss counts since the last reset_cache_stats()"""
+    values = cache.get_many([STATS_KEY.format(name=name) for name in STATS])
+    stats = {name: values.get(STATS_KEY.format(name=name), 0) for name in STATS}
+    total = sum(stats.values())
+    stats['hit_ratio'] = round((stats['hits'] + stats['revalidated']) / total, 3) if total else 0
+    return stats
+
+
+def reset_cache_stats():
+    cache.delete_many([STATS_KEY.format(name=name) for name in STATS])
+
+
+def _cache_control(headers) -> Dict[str, Optional[str]]:
+    directives = {}
+    for part in (headers.get('Cache-Control') or '').split(','):
+        name, _, value = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+def freshness_lifetime(headers) -> float:
+    """Seconds a response may be served without revalidation"""
+    directives = _cache_control(headers)
+    if 'no-cache' in directives or 'no-store' in directives:
+        return 0
+
+    if directives.get('max-age'):
+        try:
+            return max(0, int(directives['max-age']))
+        except ValueError:
+            return 0
+
+    if headers.get('Expires'):
+        try:
+            expires = parsedate_to_datetime(headers['Expires']).timestamp()
+            date = parsedate_to_datetime(headers['Date']).timestamp() if headers.get('Date') else time.time()
+            return max(0, expires - date)
+        except (TypeError, ValueError):
+            return 0
+
+    # Heuristic freshness (RFC 9111 4.2.2): a tenth of the time since the
+    # resource last changed, capped
+    if headers.get('Last-Modified'):
+        try:
+            modified = parsedate_to_datetime(headers['Last-Modified']).timestamp()
+            date = parsedate_to_datetime(headers['Date']).timestamp() if headers.get('Date') else time.time()
+            return min(max(0, (date - modified) / 10), getattr(settings, 'HTTP_CACHE_HEURISTIC_MAX', 3600))
+        except (TypeError, ValueError):
+            pass
+
+    return getattr(settings, 'HTTP_CACHE_DEFAULT_TTL', 0)
+
+
+def _is_storable(response: requests.Response) -> bool:
+    if response.status_code != 200 or 'no-store' in _cache_control(response.headers):
+        return False
+    if len(response.content) > getattr(settings, 'HTTP_CACHE_MAX_ENTRY_BYTES', 5 * 1024 * 1024):
+        return False
+    # Worth keeping only if it can be served fresh or revalidated later
+    return bool(
+        freshness_lifetime(response.headers)
+        or response.headers.get('ETag')
+        or response.headers.get('Last-Modified')
+    )
+
+
+def _save(url: str, response: requests.Response, headers=None):
+    headers = headers or response.headers
+    entry = {
+        'url': url,
+        'status': response.status_code,
+        'headers': {name: headers[name] for name in STORED_HEADERS if headers.get(name)},
+        'content': response.content,
+        'encoding': response.encoding,
+        'stored_at': time.time(),
+        'fresh_for': freshness_lifetime(headers),
+    }
+    # Kept past freshness so it can still be revalidated
+    retention = max(entry['fresh_for'], getattr(settings, 'HTTP_CACHE_RETENTION', 7 * 86400))
+    try:
+        _store().set(_entry_key(url), entry, timeout=int(retention))
+    except Exception as e:
+        logger.warning(f"Could not store HTTP cache entry for {url}: {e}")
+
+
+def _load(url: str) -> Optional[Dict]:
+    try:
+        return _store().get(_entry_key(url))
+    except Exception as e:
+        logger.warning(f"HTTP cache read error: {e}")
+        return None
+
+
+def _is_fresh(entry: Dict) -> bool:
+    return time.time() - entry['stored_at'] < entry['fresh_for']
+
+
+def _build_response(entry: Dict, request=None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry['status']
+    response.reason = 'OK'
+    response.headers = CaseInsensitiveDict(entry['headers'])
+    response._content = entry['content']
+    response.encoding = entry['encoding']
+    response.url = entry['url']
+    response.request = request
+    response.from_cache = True
+    return response
+
+
+def prepare_url(url: str, params: Dict = None) -> str:
+    """The full URL requests will fetch for url + params"""
+    return requests.Request('GET', url, params=params).prepare().url
+
+
+def fresh_response(url: str, params: Dict = None) -> Optional[requests.Response]:
+    """
+    A stored response still fresh for this GET, without any network call
+
+    Lets API clients skip their quota and rate limiter entirely when the
+    cache can answer.
+    """
+    if not _enabled():
+        return None
+
+    entry = _load(prepare_url(url, params))
+    if entry is None or not _is_fresh(entry):
+        return None
+
+    _count('hits')
+    return _build_response(entry)
+
+
+def evict(url: str, params: Dict = None):
+    """Drop the stored response for a GET (e.g. a 200 carrying an API error)"""
+    try:
+        _store().delete(_entry_key(prepare_url(url, params)))
+    except Exception as e:
+        logger.warning(f"Could not evict HTTP cache entry for {url}: {e}")
+
+
+class CachingAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that answers GETs from the shared HTTP cache
+
+    Fresh entries are returned without a request. Stale entries with an
+    ETag or Last-Modified are revalidated; a 304 refreshes the entry and
+    returns the stored body as a 200. Everything else goes to the network
+    and 200s are stored when the response allows it.
+    """
+
+    def send(self, request, **kwargs):
+        if request.method != 'GET' or not _enabled():
+            return super().send(request, **kwargs)
+
+        entry = _load(request.url)
+        if entry is not None and _is_fresh(entry):
+            _count('hits')
+            return _build_response(entry, request)
+
+        if entry is not None:
+            if entry['headers'].get('ETag'):
+                request.headers['If-None-Match'] = entry['headers']['ETag']
+            if entry['headers'].get('Last-Modified'):
+                request.headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            _count('revalidated')
+            # The 304 carries the current freshness and validators
+            cached = _build_response(entry, request)
+            merged = CaseInsensitiveDict(entry['headers'])
+            merged.update({name: response.headers[name] for name in STORED_HEADERS if response.headers.get(name)})
+            cached.headers = merged
+            _save(request.url, cached, merged)
+            response.close()
+            return cached
+
+        _count('misses')
+        if _is_storable(response):
+            _save(request.url, response)
+        return response
+
+
+def install_http_cache(session: requests.Session) -> requests.Session:
+    """Mount the caching adapter on a session for http and https"""
+    adapter = CachingAdapter()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
@@ -0,0 +1,294 @@
+# core/ingestion.py
+"""
+Bulk ingestion of fetched and scraped content
+Articles and fixtures are written a whole batch at a time, keyed on unique
+indexes (article content_hash, fixture external_id) rather than per-row
+lookups. New articles are then clustered with near-duplicates from other
+sources (see story_clusters).
+"""
+import hashlib
+import logging
+import re
+import uuid
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from django.db import transaction
+from django.utils import timezone
+
+from .dashboard_stats import bump
+from .models import MatchFixture, NewsArticle, SportCategory
+from .story_clusters import cluster_articles, minhash_signature
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARTICLE_IMAGE = "https://bard-santner.sgp1.cdn.digitaloceanspaces.com/obsidian/bg1.jpg"
+
+# Query parameters that only track the click, not the content
+TRACKING_PARAMS = re.compile(r'^(utm_.*|fbclid|gclid|mc_cid|mc_eid|ref|cmpid)$', re.IGNORECASE)
+
+INGEST_BATCH_SIZE = 500
+
+
+def normalize_title(title: str) -> str:
+    """Case-folded title with punctuation dropped and whitespace collapsed"""
+    title = re.sub(r'[^\w\s]', ' ', (title or '').casefold())
+    return re.sub(r'\s+', ' ', title).strip()
+
+
+def normalize_url(url: str) -> str:
+    """URL without scheme, fragment, tracking parameters or trailing slash"""
+    if not url:
+        return ''
+
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not TRACKING_PARAMS.match(key)
+    ))
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return urlunsplit(('', host, parts.path.rstrip('/'), query, ''))
+
+
+def content_fingerprint(title: str, source_url: str = '') -> str:
+    """Stable hash identifying an article across fetches and sources"""
+    key = f"{normalize_url(source_url)}\n{normalize_title(title)}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def _publish_date(value) -> datetime:
+    if not value:
+        return timezone.now()
+    if isinstance(value, datetime) and not timezone.is_aware(value):
+        return timezone.make_aware(value)
+    return value
+
+
+def _fits(model, field: str, value) -> bool:
+    return not value or len(value) <= model._meta.get_field(field).max_length
+
+
+def _url(model, field: str, value, fallback=''):
+    """The URL when it fits its column, else fallback (a cut URL is a broken link)"""
+    if _fits(model, field, value):
+        return value
+    logger.warning(f"Dropping {model.__name__}.{field} longer than its column: {value[:80]}...")
+    return fallback
+
+
+def build_article(article_data: Dict, sport_category: SportCategory, **defaults) -> NewsArticle:
+    """
+    Unsaved NewsArticle (with its fingerprints) from fetched article data
+
+    Overlong text is cut to its column and overlong link or image URLs are
+    dropped, so one bad row cannot fail a whole bulk insert.
+
+    Raises:
+        ValueError: source_url longer than its column (it identifies the article)
+    """
+    title = article_data['title'][:NewsArticle._meta.get_field('title').max_length]
+    source_url = article_data.get('source_url', '')
+    summary = article_data.get('summary', '')
+
+    if not _fits(NewsArticle, 'source_url', source_url):
+        raise ValueError(f"source_url longer than {NewsArticle._meta.get_field('source_url').max_length} characters")
+    default_image = _url(NewsArticle, 'image_url', defaults.get('image_url', ''))
+
+    return NewsArticle(
+        id=uuid.uuid4(),
+        title=title,
+        content=article_data.get('content', ''),
+        summary=summary,
+        sport_category=sport_category,
+        article_type=article_data.get('type', 'news'),
+        source_url=source_url,
+        link_url=_url(NewsArticle, 'link_url', article_data.get('link'), None),
+        source_name=article_data.get('source_name', '')[:100],
+        image_url=_url(NewsArticle, 'image_url', article_data.get('image_url')) or default_image,
+        publish_date=_publish_date(article_data.get('publish_date')),
+        is_featured=article_data.get('is_featured', defaults.get('is_featured', False)),
+        is_premium=article_data.get('is_premium', False),
+        content_hash=content_fingerprint(title, source_url),
+        minhash=minhash_signature(title, summary),
+    )
+
+
+def bulk_ingest_articles(articles: List[Dict], sport_category: SportCategory,
+                         batch_size: int = INGEST_BATCH_SIZE, **defaults) -> Dict:
+    """
+    Insert a batch of fetched articles, skipping ones already stored
+
+    Three queries per batch whatever its size: which fingerprints already
+    exist, one bulk INSERT ... ON CONFLICT DO NOTHING, and which of the
+    rows this call actually inserted (a concurrent run inserting the same
+    article first makes ours a duplicate, not an error). The inserted
+    articles are then clustered with near-duplicates already stored.
+
+    Args:
+        articles: Article dicts as produced by the API clients and scrapers
+        sport_category: Category every article is filed under
+        defaults: Fallbacks for missing fields (image_url, is_featured)
+
+    Returns:
+        {'received': n, 'inserted': n, 'duplicates': n, 'invalid': n,
+         'near_duplicates': n}
+    """
+    stats = {'received': len(articles), 'inserted': 0, 'duplicates': 0, 'invalid': 0, 'near_duplicates': 0}
+
+    candidates = {}
+    for article_data in articles:
+        if not article_data.get('title'):
+            stats['invalid'] += 1
+            continue
+
+        try:
+            article = build_article(article_data, sport_category, **defaults)
+        except Exception as e:
+            logger.error(f"Error preparing article '{article_data.get('title', 'Unknown')}': {e}")
+            stats['invalid'] += 1
+            continue
+
+        # Repeats inside the batch are duplicates too
+        if article.content_hash in candidates:
+            stats['duplicates'] += 1
+        else:
+            candidates[article.content_hash] = article
+
+    if not candidates:
+        return stats
+
+    existing = set(NewsArticle.objects.filter(
+        content_hash__in=list(candidates)
+    ).values_list('content_hash', flat=True))
+    new_articles = [article for fingerprint, article in candidates.items() if fingerprint not in existing]
+
+    if new_articles:
+        NewsArticle.objects.bulk_create(new_articles, batch_size=batch_size, ignore_conflicts=True)
+        inserted_ids = set(NewsArticle.objects.filter(
+            id__in=[article.id for article in new_articles]
+        ).values_list('id', flat=True))
+        inserted = [article for article in new_articles if article.id in inserted_ids]
+        stats['inserted'] = len(inserted)
+
+        try:
+            stats['near_duplicates'] = cluster_articles(inserted, batch_size=batch_size)['clustered']
+        except Exception as e:
+            # The articles are stored either way; they just stay unclustered
+            logger.error(f"Error clustering near-duplicate articles: {e}")
+
+    stats['duplicates'] += len(candidates) - stats['inserted']
+
+    if stats['inserted']:
+        # bulk_create sends no post_save signals
+        bump('total_articles', stats['inserted'])
+
+    return stats
+
+
+# Fixtures
+
+# Fields refreshed from the provider; a row is only written when one changes
+FIXTURE_FIELDS = [
+    'home_team', 'away_team', 'match_date', 'venue', 'league_competition',
+    'status', 'home_score', 'away_score', 'source_url',
+]
+
+
+def natural_fixture_key(sport: str, home_team: str, away_team: str, match_date: datetime) -> str:
+    """external_id for fixtures whose provider gives no id: sport, teams and kick-off"""
+    kickoff = match_date.astimezone(dt_timezone.utc).isoformat() if match_date else ''
+    key = f"{normalize_title(home_team)}|{normalize_title(away_team)}|{kickoff}"
+    return f"natural:{sport}:{hashlib.sha1(key.encode('utf-8')).hexdigest()}"
+
+
+def build_fixture(fixture_data: Dict, sport_category: SportCategory) -> MatchFixture:
+    """Unsaved MatchFixture (with its external_id) from fetched fixture data"""
+    values = {
+        'home_team': fixture_data['home_team'][:100],
+        'away_team': fixture_data['away_team'][:100],
+        'match_date': _publish_date(fixture_data['match_date']),
+        'venue': (fixture_data.get('venue') or '')[:200],
+        'league_competition': (fixture_data.get('league_competition') or fixture_data.get('league') or '')[:100],
+        'status': str(fixture_data.get('status') or 'scheduled')[:50],
+        'home_score': fixture_data.get('home_score'),
+        'away_score': fixture_data.get('away_score'),
+        'source_url': _url(MatchFixture, 'source_url', fixture_data.get('source_url') or ''),
+    }
+    external_id = fixture_data.get('external_id') or natural_fixture_key(
+        sport_category.name, values['home_team'], values['away_team'], values['match_date']
+    )
+    return MatchFixture(id=uuid.uuid4(), sport_category=sport_category, external_id=external_id[:100], **values)
+
+
+def bulk_upsert_fixtures(fixtures: List[Dict], sport_category: SportCategory,
+                         batch_size: int = INGEST_BATCH_SIZE) -> Dict:
+    """
+    Insert new fixtures and update changed ones, leaving the rest alone
+
+    Fixtures are keyed on external_id: the provider's fixture id when
+    there is one, else the natural key (sport, teams, kick-off). Two
+    queries per batch: load the stored rows for the batch's keys, then one
+    INSERT ... ON CONFLICT (external_id) DO UPDATE for just the new and
+    changed rows. Rows stored under their natural key before the provider
+    id was known are matched by it and re-keyed (one bulk UPDATE).
+
+    Returns:
+        {'received': n, 'created': n, 'updated': n, 'unchanged': n, 'invalid': n}
+    """
+    stats = {'received': len(fixtures), 'created': 0, 'updated': 0, 'unchanged': 0, 'invalid': 0}
+
+    candidates = {}
+    for fixture_data in fixtures:
+        try:
+            fixture = build_fixture(fixture_data, sport_category)
+        except Exception as e:
+            logger.error(f"Error preparing fixture {fixture_data!r}: {e}")
+            stats['invalid'] += 1
+            continue
+        natural = natural_fixture_key(sport_category.name, fixture.home_team, fixture.away_team, fixture.match_date)
+        # A fixture repeated within the batch: the last copy wins
+        candidates[fixture.external_id] = (fixture, natural)
+
+    if not candidates:
+        return stats
+
+    lookup = set(candidates) | {natural for _, natural in candidates.values()}
+    stored = {row.external_id: row for row in MatchFixture.objects.filter(external_id__in=lookup)}
+
+    upserts = []
+    rekeyed = []
+    for key, (fixture, natural) in candidates.items():
+        row = stored.get(key) or stored.get(natural)
+        if row is None:
+            upserts.append(fixture)
+            stats['created'] += 1
+        elif row.external_id != key:
+            for field in FIXTURE_FIELDS:
+                setattr(row, field, getattr(fixture, field))
+            row.external_id = key
+            rekeyed.append(row)
+            stats['updated'] += 1
+        elif any(getattr(row, field) != getattr(fixture, field) for field in FIXTURE_FIELDS):
+            upserts.append(fixture)
+            stats['updated'] += 1
+        else:
+            stats['unchanged'] += 1
+
+    with transaction.atomic():
+        if rekeyed:
+            MatchFixture.objects.bulk_update(rekeyed, FIXTURE_FIELDS + ['external_id'], batch_size=batch_size)
+        if upserts:
+            MatchFixture.objects.bulk_create(
+                upserts,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=['external_id'],
+                update_fields=FIXTURE_FIELDS,
+            )
+
+    if stats['created']:
+        bump('total_fixtures', stats['created'])
+
+    return stats
@@ -0,0 +1,239 @@
+# core/management/commands/benchmark_newsletter.py
+"""
+Django management command to benchmark newsletter generation and delivery
+Usage: python manage.py benchmark_newsletter [--subscribers 5000] [--engine async] [--latency 0.02]
+
+Seeds synthetic subscribers, generates the weekly newsletter and sends it
+to an in-process SMTP sink (no real mail leaves the machine). Reports
+per-stage wall time, DB queries and peak Python memory (tracemalloc, so
+C-level buffers are not counted), plus per-message latency and
+throughput for the send.
+"""
+import json
+import random
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Dict, List
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from core.generator import NewsletterGeneratorV2
+from core.models import NewsletterSubscriber, NewsArticle, MatchFixture, SportCategory
+from core.smtp_sink import SMTPSink, TimedSMTPBackend
+
+BENCHMARK_DOMAIN = 'benchmark.invalid'
+BENCHMARK_SOURCE = 'benchmark'
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark newsletter generation and delivery against a local SMTP sink'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subscribers', type=int, default=1000, help='Synthetic subscribers to seed')
+        parser.add_argument('--articles', type=int, default=40, help='Synthetic articles (and fixtures) to seed')
+        parser.add_argument('--engine', choices=['sync', 'async'], default=None,
+                            help='Delivery engine (default: NEWSLETTER_DELIVERY_ENGINE)')
+        parser.add_argument('--batch-size', type=int, default=None, help='Emails per connection (sync engine)')
+        parser.add_argument('--concurrency', type=int, default=None, help='SMTP sessions (async engine)')
+        parser.add_argument('--latency', type=float, default=0.01, help='Simulated relay latency per message (s)')
+        parser.add_argument('--jitter', type=float, default=0.0, help='Random +/- latency (s)')
+        parser.add_argument('--reject-rate', type=float, default=0.0,
+                            help='Fraction of subscribers the sink rejects with a 550')
+        parser.add_argument('--rate-limit', action='store_true',
+                            help='Keep the outbound email rate limiter on (off by default)')
+        parser.add_argument('--include-existing', action='store_true',
+                            help='Run even if real active subscribers exist (they are sent to the sink too)')
+        parser.add_argument('--keep', action='store_true', help='Keep the synthetic data afterwards')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for synthetic data')
+
+    def handle(self, *args, **options):
+        existing = NewsletterSubscriber.objects.filter(status='active').exclude(
+            email__endswith=f'@{BENCHMARK_DOMAIN}'
+        ).count()
+        if existing and not options['include_existing']:
+            raise CommandError(
+                f"{existing} real active subscribers exist and would be part of the send; "
+                f"run against a scratch database or pass --include-existing"
+            )
+
+        self.rng = random.Random(options['seed'])
+        stages: Dict[str, Dict] = {}
+        newsletter = None
+
+        with SMTPSink(latency=options['latency'], jitter=options['jitter']) as sink:
+            mail_settings = {
+                'EMAIL_BACKEND': 'core.smtp_sink.TimedSMTPBackend',
+                'EMAIL_HOST': sink.host,
+                'EMAIL_PORT': sink.port,
+                'EMAIL_USE_TLS': False,
+                'EMAIL_USE_SSL': False,
+                'EMAIL_HOST_USER': '',
+                'EMAIL_HOST_PASSWORD': '',
+                'NEWSLETTER_RATE_LIMIT_ENABLED': options['rate_limit'],
+            }
+            if options['concurrency']:
+                mail_settings['NEWSLETTER_ASYNC_CONCURRENCY'] = options['concurrency']
+
+            try:
+                with override_settings(**mail_settings):
+                    with self.stage(stages, 'seed'):
+                        self.seed(options['subscribers'], options['articles'], options['reject_rate'])
+
+                    generator = NewsletterGeneratorV2()
+                    with self.stage(stages, 'generate'):
+                        newsletter = generator.generate_weekly_newsletter(refresh_data=False)
+
+                    TimedSMTPBackend.reset()
+                    with self.stage(stages, 'send') as send_stage:
+                        results = generator.send_newsletter_to_subscribers(
+                            newsletter,
+                            batch_size=options['batch_size'],
+                            engine=options['engine']
+                        )
+
+                    samples = list(TimedSMTPBackend.samples)
+                    send_stage.update({
+                        'sent': results['sent'],
+                        'failed': results['failed'],
+                        'segments': results['segments'],
+                        'messages_per_second': round(results['sent'] / send_stage['seconds'], 1)
+                        if send_stage['seconds'] else 0.0,
+                        'latency_p50_ms': round(percentile(samples, 50) * 1000, 2),
+                        'latency_p95_ms': round(percentile(samples, 95) * 1000, 2),
+                        'queries_per_message': round(send_stage['queries'] / max(1, results['sent']), 3),
+                    })
+            finally:
+                if not options['keep']:
+                    self.cleanup(newsletter)
+
+            sink_stats = dict(sink.stats)
+
+        report = {
+            'subscribers': options['subscribers'],
+            'engine': options['engine'] or getattr(settings, 'NEWSLETTER_DELIVERY_ENGINE', 'sync'),
+            'relay_latency_ms': options['latency'] * 1000,
+            'stages': stages,
+            'sink': sink_stats,
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_report(report)
+
+    @contextmanager
+    def stage(self, stages: Dict, name: str):
+        """Time a stage, count its queries and trace its peak memory; yields the stage's stats dict"""
+        stats = stages.setdefault(name, {})
+        # Progress on stderr so --json output stays parseable
+        self.stderr.write(f"{name}...")
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                yield stats
+            seconds = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        stats.update({
+            'seconds': round(seconds, 3),
+            'queries': len(queries.captured_queries),
+            'peak_mb': round(peak / (1024 * 1024), 1),
+        })
+
+    def seed(self, subscriber_count: int, article_count: int, reject_rate: float):
+        """Create synthetic subscribers (varied preferences) and content"""
+        sports = [code for code, _ in SportCategory.SPORT_CHOICES]
+        categories = {}
+        for code, label in SportCategory.SPORT_CHOICES:
+            categories[code], _ = SportCategory.objects.get_or_create(
+                name=code, defaults={'display_name': label}
+            )
+
+        subscribers = []
+        for i in range(subscriber_count):
+            # Mix of no preference, one sport and several sports
+            picks = self.rng.sample(sports, self.rng.choice([0, 1, 1, 2, 3]))
+            tag = '+reject' if self.rng.random() < reject_rate else ''
+            subscribers.append(NewsletterSubscriber(
+                email=f"bench-{i}{tag}@{BENCHMARK_DOMAIN}",
+                name=f"Benchmark {i}",
+                preferences={'sports': picks} if picks else {}
+            ))
+        NewsletterSubscriber.objects.bulk_create(subscribers, batch_size=1000, ignore_conflicts=True)
+
+        now = timezone.now()
+        articles = []
+        fixtures = []
+        for i in range(article_count):
+            sport = self.rng.choice(sports)
+            articles.append(NewsArticle(
+                title=f"Benchmark story {i}",
+                content='Lorem ipsum dolor sit amet. ' * 40,
+                summary='Lorem ipsum dolor sit amet, consectetur adipiscing elit.',
+                sport_category=categories[sport],
+                source_url=f"https://{BENCHMARK_DOMAIN}/story/{i}",
+                source_name=BENCHMARK_SOURCE,
+                publish_date=now - timedelta(hours=self.rng.randint(1, 120)),
+                is_featured=i % 7 == 0,
+                is_premium=i % 5 == 0
+            ))
+            fixtures.append(MatchFixture(
+                sport_category=categories[sport],
+                home_team=f"Home {i}",
+                away_team=f"Away {i}",
+                match_date=now + timedelta(hours=self.rng.randint(1, 240)),
+                league_competition=BENCHMARK_SOURCE,
+                source_url=f"https://{BENCHMARK_DOMAIN}/fixture/{i}"
+            ))
+        NewsArticle.objects.bulk_create(articles, ignore_conflicts=True)
+        MatchFixture.objects.bulk_create(fixtures)
+
+    def cleanup(self, newsletter):
+        """Remove everything the benchmark created"""
+        if newsletter is not None:
+            newsletter.delete()
+        NewsletterSubscriber.objects.filter(email__endswith=f'@{BENCHMARK_DOMAIN}').delete()
+        NewsArticle.objects.filter(source_name=BENCHMARK_SOURCE).delete()
+        MatchFixture.objects.filter(league_competition=BENCHMARK_SOURCE).delete()
+
+    def print_report(self, report: Dict):
+        self.stdout.write(self.style.SUCCESS(
+            f"\nNewsletter benchmark: {report['subscribers']} subscribers, "
+            f"engine={report['engine']}, relay latency {report['relay_latency_ms']:.0f}ms"
+        ))
+        self.stdout.write(f"{'stage':<10}{'seconds':>10}{'queries':>10}{'peak MB':>10}")
+        for name, stats in report['stages'].items():
+            self.stdout.write(
+                f"{name:<10}{stats['seconds']:>10.2f}{stats['queries']:>10}{stats['peak_mb']:>10.1f}"
+            )
+
+        send = report['stages'].get('send')
+        if send and 'sent' in send:
+            self.stdout.write(
+                f"\nsend: {send['sent']} sent, {send['failed']} failed, {send['segments']} segments"
+            )
+            self.stdout.write(
+                f"throughput: {send['messages_per_second']} msg/s, "
+                f"latency p50 {send['latency_p50_ms']}ms / p95 {send['latency_p95_ms']}ms, "
+                f"{send['queries_per_message']} queries/message"
+            )
+        self.stdout.write(f"sink: {report['sink']}")
@@ -0,0 +1,189 @@
+# core/management/commands/benchmark_scrapers.py
+"""
+Django management command to benchmark the scrapers' HTML parsing
+Usage: python manage.py benchmark_scrapers [--html-dir pages/] [--save] [--repeat 20]
+
+Parses saved copies of every scraped page (or synthetic pages of the
+same shape when no directory is given) with each parsing mode:
+html.parser on the full page (the old path), lxml on the full page, and
+lxml with soup built only for the container subtrees (the current
+path). Reports median parse time, peak Python memory (tracemalloc, so
+libxml2's own buffers are not counted) and whether every mode extracts
+the same items. No network access unless --save is passed.
+"""
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from typing import Dict, List
+from django.core.management.base import BaseCommand, CommandError
+
+from core.scrappers import SoccerScraper, Formula1Scraper, RugbyScraper, TennisScraper
+
+# page name -> (scraper, URL attribute, parse method)
+PAGES = {
+    'soccer_news': (SoccerScraper, 'NEWS_URL', 'parse_premier_league_news'),
+    'soccer_fixtures': (SoccerScraper, 'FIXTURES_URL', 'parse_premier_league_fixtures'),
+    'f1_news': (Formula1Scraper, 'NEWS_URL', 'parse_f1_news'),
+    'f1_calendar': (Formula1Scraper, 'CALENDAR_URL', 'parse_f1_calendar'),
+    'rugby_news': (RugbyScraper, 'NEWS_URL', 'parse_rugby_news'),
+    'tennis_news': (TennisScraper, 'NEWS_URL', 'parse_tennis_news'),
+}
+
+# mode -> (HTML_PARSER, PARTIAL_PARSE)
+MODES = {
+    'html.parser': ('html.parser', False),
+    'lxml': ('lxml', False),
+    'lxml subtrees': ('lxml', True),
+}
+
+# One container per page, shaped like the markup each parser looks for
+CONTAINERS = {
+    'soccer_news': (
+        '<div class="gs-c-promo gs-t-News"><a href="/sport/football/{i}"><h3>Premier League story {i}</h3></a>'
+        '<p>Summary of story {i}.</p><img src="https://ichef.bbci.co.uk/{i}.jpg"></div>'
+    ),
+    'soccer_fixtures': (
+        '<li class="gs-u-pb-"><span class="sp-c-fixture__team sp-c-fixture__team--home">Home {i}</span>'
+        '<span class="sp-c-fixture__team sp-c-fixture__team--away">Away {i}</span>'
+        '<time datetime="2026-01-{day:02d}T15:00:00Z"></time></li>'
+    ),
+    'f1_news': (
+        '<div class="f1-latest-listing--grid-item"><h2><a href="/en/latest/article/{i}">F1 story {i}</a></h2>'
+        '<p>Summary of story {i}.</p><img src="https://media.formula1.com/{i}.jpg"></div>'
+    ),
+    'f1_calendar': (
+        '<div class="race-listing--item"><h3>Grand Prix {i}</h3>'
+        '<time datetime="2026-03-{day:02d}T14:00:00Z"></time><span class="venue">Circuit {i}</span></div>'
+    ),
+    'rugby_news': (
+        '<article class="post post-{i}"><h2><a href="https://www.planetrugby.com/news/{i}">Rugby story {i}</a></h2>'
+        '<div class="excerpt">Summary of story {i}.</div><img src="https://www.planetrugby.com/{i}.jpg"></article>'
+    ),
+    'tennis_news': (
+        '<div class="article-card"><h3><a href="/news/articles/{i}">Tennis story {i}</a></h3>'
+        '<p>Summary of story {i}.</p><img src="https://www.tennis.com/{i}.jpg"></div>'
+    ),
+}
+
+
+def synthetic_page(name: str, containers: int = 40, filler_blocks: int = 400) -> bytes:
+    """A page of navigation, copy and scripts with the containers spread through it"""
+    template = CONTAINERS[name]
+    nav = ''.join(f'<li><a href="/section/{i}" class="nav-link">Section {i}</a></li>' for i in range(200))
+    blocks = []
+    for i in range(filler_blocks):
+        blocks.append(
+            f'<div class="layout-block block-{i}"><span class="label">Block {i}</span>'
+            f'<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod {i}.</p></div>'
+        )
+        if i % (filler_blocks // containers) == 0 and i // (filler_blocks // containers) < containers:
+            n = i // (filler_blocks // containers)
+            blocks.append(template.format(i=n, day=n % 28 + 1))
+    script = '<script>window.__DATA__ = ' + json.dumps({'items': list(range(5000))}) + ';</script>'
+    html = (
+        f'<!DOCTYPE html><html><head><title>{name}</title>{script}</head>'
+        f'<body><nav><ul>{nav}</ul></nav><main>{"".join(blocks)}</main></body></html>'
+    )
+    return html.encode('utf-8')
+
+
+def item_keys(items: List[Dict]) -> List[str]:
+    return [item.get('title') or f"{item.get('home_team')} v {item.get('away_team')}" for item in items]
+
+
+class Command(BaseCommand):
+    help = "Benchmark the scrapers' HTML parsing against saved or synthetic pages"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--html-dir', default=None,
+                            help='Directory of saved pages (<page>.html); synthetic pages when omitted')
+        parser.add_argument('--save', action='store_true',
+                            help='Fetch the live pages into --html-dir first')
+        parser.add_argument('--pages', nargs='+', choices=list(PAGES), default=list(PAGES))
+        parser.add_argument('--repeat', type=int, default=20, help='Parses per page and mode')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    def handle(self, *args, **options):
+        html_dir = options['html_dir']
+        if options['save']:
+            if not html_dir:
+                raise CommandError('--save needs --html-dir')
+            self.save_pages(html_dir, options['pages'])
+
+        report = {}
+        for name in options['pages']:
+            content = self.load_page(name, html_dir)
+            report[name] = self.benchmark_page(name, content, options['repeat'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_report(report, source=html_dir or 'synthetic pages')
+
+    def save_pages(self, html_dir: str, names: List[str]):
+        os.makedirs(html_dir, exist_ok=True)
+        for name in names:
+            scraper_class, url_attr, _ = PAGES[name]
+            scraper = scraper_class()
+            response = scraper.session.get(getattr(scraper_class, url_attr), timeout=30)
+            with open(os.path.join(html_dir, f'{name}.html'), 'wb') as f:
+                f.write(response.content)
+            self.stderr.write(f"saved {name} ({len(response.content) // 1024} KB, HTTP {response.status_code})")
+
+    def load_page(self, name: str, html_dir: str = None) -> bytes:
+        if not html_dir:
+            return synthetic_page(name)
+
+        path = os.path.join(html_dir, f'{name}.html')
+        if not os.path.exists(path):
+            raise CommandError(f"No saved page {path} (run with --save to fetch it)")
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def benchmark_page(self, name: str, content: bytes, repeat: int) -> Dict:
+        """Time and measure every mode on one page"""
+        scraper_class, _, parse_method = PAGES[name]
+        results = {'page_kb': round(len(content) / 1024, 1), 'modes': {}}
+        baseline_items = None
+
+        for mode, (html_parser, partial) in MODES.items():
+            scraper = scraper_class()
+            scraper.HTML_PARSER = html_parser
+            scraper.PARTIAL_PARSE = partial
+            parse = getattr(scraper, parse_method)
+
+            tracemalloc.start()
+            items = parse(content)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                parse(content)
+                samples.append(time.perf_counter() - started)
+
+            keys = item_keys(items)
+            if baseline_items is None:
+                baseline_items = keys
+
+            results['modes'][mode] = {
+                'median_ms': round(statistics.median(samples) * 1000, 2),
+                'peak_mb': round(peak / (1024 * 1024), 2),
+                'items': len(items),
+                'same_items': keys == baseline_items,
+            }
+
+        return results
+
+    def print_report(self, report: Dict, source: str):
+        self.stdout.write(self.style.SUCCESS(f"\nScraper parse benchmark ({source})"))
+        self.stdout.write(f"{'page':<17}{'KB':>8}  {'mode':<15}{'median ms':>11}{'peak MB':>10}{'items':>7}  same")
+        for name, page in report.items():
+            for mode, stats in page['modes'].items():
+                self.stdout.write(
+                    f"{name:<17}{page['page_kb']:>8}  {mode:<15}{stats['median_ms']:>11.2f}"
+                    f"{stats['peak_mb']:>10.2f}{stats['items']:>7}  {'yes' if stats['same_items'] else 'NO'}"
+                )
@@ -0,0 +1,38 @@
+# core/management/commands/run_smtp_sink.py
+"""
+Django management command to run a local stand-in SMTP server
+Usage: python manage.py run_smtp_sink [--port 2525] [--latency 0.05]
+
+Point EMAIL_HOST/EMAIL_PORT at it (with EMAIL_USE_TLS off and no
+credentials) to exercise newsletter sends without a real relay.
+"""
+from django.core.management.base import BaseCommand
+from core.smtp_sink import SMTPSink
+
+
+class Command(BaseCommand):
+    help = 'Run a local SMTP server that accepts and discards mail'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--host', type=str, default='127.0.0.1', help='Interface to bind')
+        parser.add_argument('--port', type=int, default=2525, help='Port to listen on')
+        parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every DATA reply')
+        parser.add_argument('--jitter', type=float, default=0.0, help='Random +/- seconds on the latency')
+    
+    def handle(self, *args, **options):
+        sink = SMTPSink(
+            host=options['host'],
+            port=options['port'],
+            latency=options['latency'],
+            jitter=options['jitter']
+        )
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"SMTP sink on {options['host']}:{options['port']} "
+            f"(recipients containing '{sink.reject_marker}' get 550, '{sink.defer_marker}' get 451)"
+        ))
+        
+        try:
+            sink.serve_forever()
+        except KeyboardInterrupt:
+            self.stdout.write(f"\nStopped. {sink.stats}")
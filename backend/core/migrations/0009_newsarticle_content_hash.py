@@ -0,0 +1,76 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:16
+
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.db import migrations, models
+
+# Frozen copies of the core.ingestion fingerprint as of this migration
+
+TRACKING_PARAMS = re.compile(r'^(utm_.*|fbclid|gclid|mc_cid|mc_eid|ref|cmpid)$', re.IGNORECASE)
+
+
+def normalize_title(title):
+    title = re.sub(r'[^\w\s]', ' ', (title or '').casefold())
+    return re.sub(r'\s+', ' ', title).strip()
+
+
+def normalize_url(url):
+    if not url:
+        return ''
+
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not TRACKING_PARAMS.match(key)
+    ))
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return urlunsplit(('', host, parts.path.rstrip('/'), query, ''))
+
+
+def content_fingerprint(title, source_url=''):
+    key = f"{normalize_url(source_url)}\n{normalize_title(title)}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def backfill_content_hash(apps, schema_editor):
+    """Fingerprint existing articles; later copies of the same article keep no hash"""
+    NewsArticle = apps.get_model('core', 'NewsArticle')
+    seen = set()
+    batch = []
+    for article in NewsArticle.objects.only('id', 'title', 'source_url').order_by('scraped_date', 'id').iterator(chunk_size=1000):
+        fingerprint = content_fingerprint(article.title, article.source_url)
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        article.content_hash = fingerprint
+        batch.append(article)
+        if len(batch) >= 1000:
+            NewsArticle.objects.bulk_update(batch, ['content_hash'])
+            batch = []
+    if batch:
+        NewsArticle.objects.bulk_update(batch, ['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_subscriptionevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsarticle',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_content_hash, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='newsarticle',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:24
+
+import hashlib
+import re
+from datetime import timezone
+
+from django.db import migrations, models
+
+# Frozen copies of the core.ingestion natural key as of this migration
+
+
+def normalize_title(title):
+    title = re.sub(r'[^\w\s]', ' ', (title or '').casefold())
+    return re.sub(r'\s+', ' ', title).strip()
+
+
+def natural_fixture_key(sport, home_team, away_team, match_date):
+    kickoff = match_date.astimezone(timezone.utc).isoformat() if match_date else ''
+    key = f"{normalize_title(home_team)}|{normalize_title(away_team)}|{kickoff}"
+    return f"natural:{sport}:{hashlib.sha1(key.encode('utf-8')).hexdigest()}"
+
+
+def backfill_external_id(apps, schema_editor):
+    """Key existing fixtures on their natural key; later copies keep no key"""
+    MatchFixture = apps.get_model('core', 'MatchFixture')
+    seen = set()
+    batch = []
+    fixtures = MatchFixture.objects.select_related('sport_category').order_by('match_date', 'id')
+    for fixture in fixtures.iterator(chunk_size=1000):
+        key = natural_fixture_key(
+            fixture.sport_category.name, fixture.home_team, fixture.away_team, fixture.match_date
+        )
+        if key in seen:
+            continue
+        seen.add(key)
+        fixture.external_id = key
+        batch.append(fixture)
+        if len(batch) >= 1000:
+            MatchFixture.objects.bulk_update(batch, ['external_id'])
+            batch = []
+    if batch:
+        MatchFixture.objects.bulk_update(batch, ['external_id'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_newsarticle_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchfixture',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.RunPython(backfill_external_id, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='matchfixture',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+    ]
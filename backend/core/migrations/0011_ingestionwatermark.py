@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_matchfixture_external_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestionWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(max_length=50)),
+                ('sport', models.CharField(max_length=50)),
+                ('query', models.CharField(blank=True, max_length=100)),
+                ('last_published_at', models.DateTimeField(blank=True, null=True)),
+                ('last_item_ids', models.JSONField(blank=True, default=list)),
+                ('page_token', models.CharField(blank=True, max_length=255)),
+                ('backlog_until', models.DateTimeField(blank=True, null=True)),
+                ('content_digest', models.CharField(blank=True, max_length=64)),
+                ('last_fixture_update', models.DateTimeField(blank=True, null=True)),
+                ('last_run_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('provider', 'sport', 'query')},
+            },
+        ),
+    ]
@@ -0,0 +1,116 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:31
+
+import hashlib
+import re
+import struct
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copies of the core.story_clusters signature as of this migration
+
+NUM_PERM = 32
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+MERSENNE_PRIME = (1 << 61) - 1
+MASK_32 = (1 << 32) - 1
+PERMUTATIONS = [
+    (
+        int.from_bytes(hashlib.blake2b(f'a{i}'.encode(), digest_size=8).digest(), 'big') % (MERSENNE_PRIME - 1) + 1,
+        int.from_bytes(hashlib.blake2b(f'b{i}'.encode(), digest_size=8).digest(), 'big') % MERSENNE_PRIME,
+    )
+    for i in range(NUM_PERM)
+]
+
+STOPWORDS = frozenset(
+    'a an and are as at be been by for from has have he her his in into is it its of on or '
+    'over said says she that the their they this to up v vs was were will with after'.split()
+)
+
+SUMMARY_TOKENS = 60
+
+
+def normalize_title(title):
+    title = re.sub(r'[^\w\s]', ' ', (title or '').casefold())
+    return re.sub(r'\s+', ' ', title).strip()
+
+
+def story_tokens(title, summary=''):
+    title_words = [w for w in normalize_title(title).split() if w not in STOPWORDS]
+    summary_words = [w for w in normalize_title(summary).split() if w not in STOPWORDS][:SUMMARY_TOKENS]
+    tokens = set(title_words) | set(summary_words)
+    tokens.update(f'{a} {b}' for a, b in zip(title_words, title_words[1:]))
+    return tokens
+
+
+def minhash_signature(title, summary=''):
+    hashes = [
+        int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+        for token in story_tokens(title, summary)
+    ]
+    if not hashes:
+        return None
+    return struct.pack(
+        f'>{NUM_PERM}I',
+        *(min(((a * h + b) % MERSENNE_PRIME) & MASK_32 for h in hashes) for a, b in PERMUTATIONS)
+    )
+
+
+def signature_buckets(signature):
+    values = struct.unpack(f'>{NUM_PERM}I', bytes(signature))
+    buckets = []
+    for band in range(BANDS):
+        key = struct.pack(f'>B{ROWS}I', band, *values[band * ROWS:(band + 1) * ROWS])
+        buckets.append(int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big', signed=True))
+    return buckets
+
+
+def backfill_minhash(apps, schema_editor):
+    """Sign and index existing articles so new ones can match them"""
+    NewsArticle = apps.get_model('core', 'NewsArticle')
+    NewsArticleBucket = apps.get_model('core', 'NewsArticleBucket')
+    articles, buckets = [], []
+    for article in NewsArticle.objects.only('id', 'title', 'summary').iterator(chunk_size=1000):
+        article.minhash = minhash_signature(article.title, article.summary)
+        if not article.minhash:
+            continue
+        articles.append(article)
+        buckets.extend(NewsArticleBucket(article_id=article.id, bucket=bucket)
+                       for bucket in signature_buckets(article.minhash))
+        if len(articles) >= 1000:
+            NewsArticle.objects.bulk_update(articles, ['minhash'])
+            NewsArticleBucket.objects.bulk_create(buckets, batch_size=2000)
+            articles, buckets = [], []
+    if articles:
+        NewsArticle.objects.bulk_update(articles, ['minhash'])
+        NewsArticleBucket.objects.bulk_create(buckets, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_ingestionwatermark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsarticle',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='core.newsarticle'),
+        ),
+        migrations.AddField(
+            model_name='newsarticle',
+            name='minhash',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='NewsArticleBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField(db_index=True)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='buckets', to='core.newsarticle')),
+            ],
+        ),
+        migrations.RunPython(backfill_minhash, migrations.RunPython.noop),
+    ]
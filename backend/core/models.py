@@ -7,9 +7,10 @@ from django.contrib.auth.models import User
 from django.utils import timezone
 from datetime import datetime, timedelta
 from django.db.models import Q, Count, Avg
+from django.db.models.functions import TruncDate, TruncWeek
 from datetime import timezone
 from datetime import datetime
-from django.db import models
+from django.db import models, transaction
 import uuid
 
 class ContactMessage(models.Model):
@@ -191,6 +192,117 @@ class NewsletterSubscriber(models.Model):
     
     def __str__(self):
         return f"{self.email} - {self.status}"
+    
+    def set_status(self, new_status, source=''):
+        """Change status and log a SubscriptionEvent; False if unchanged"""
+        if new_status == self.status:
+            return False
+        
+        previous = self.status
+        self.status = new_status
+        with transaction.atomic():
+            self.save(update_fields=['status'])
+            SubscriptionEvent.objects.create(
+                subscriber=self,
+                from_status=previous,
+                to_status=new_status,
+                source=source
+            )
+        return True
+
+class SubscriptionEvent(models.Model):
+    """Append-only log of subscriber status changes"""
+    SUBSCRIBED = ''  # from_status of a brand new subscription
+    DELETED = 'deleted'  # to_status when the subscriber is deleted
+    
+    subscriber = models.ForeignKey(NewsletterSubscriber, on_delete=models.SET_NULL,
+                                   null=True, blank=True, related_name='status_events')
+    from_status = models.CharField(max_length=20, blank=True)
+    to_status = models.CharField(max_length=20)
+    source = models.CharField(max_length=50, blank=True)  # subscribe, unsubscribe, dashboard, bulk_action
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.from_status or 'new'} -> {self.to_status} ({self.created_at:%Y-%m-%d %H:%M})"
+    
+    @classmethod
+    def change_status(cls, queryset, new_status, source=''):
+        """
+        Set status on every subscriber in a queryset, logging one event each
+        
+        Subscribers already in `new_status` are left alone. Pass
+        DELETED to delete them instead. Returns the subscribers changed.
+        """
+        with transaction.atomic():
+            if new_status != cls.DELETED:
+                queryset = queryset.exclude(status=new_status)
+            changes = list(queryset.values_list('id', 'status'))
+            if not changes:
+                return 0
+            
+            subscribers = NewsletterSubscriber.objects.filter(id__in=[pk for pk, _ in changes])
+            if new_status == cls.DELETED:
+                subscribers.delete()
+            else:
+                subscribers.update(status=new_status)
+            
+            cls.objects.bulk_create([
+                cls(
+                    subscriber_id=None if new_status == cls.DELETED else pk,
+                    from_status=previous,
+                    to_status=new_status,
+                    source=source
+                )
+                for pk, previous in changes
+            ])
+        
+        # bulk_create sends no post_save; import here to avoid circular imports
+        from .dashboard_stats import count_subscription_events
+        count_subscription_events((previous, new_status) for _, previous in changes)
+        return len(changes)
+    
+    @classmethod
+    def summarize(cls, start_date, end_date, period='day'):
+        """
+        Growth and churn per day or week, from the events in a window
+        
+        One GROUP BY over the window's events. `gained` counts moves into
+        active (new subscriptions and reactivations), `lost` moves out of it
+        (unsubscribes, deactivations and deletions).
+        
+        Returns:
+            [{'period': date, 'subscribed', 'unsubscribed', 'gained', 'lost',
+              'net_growth'}], oldest first; periods without events are omitted
+        """
+        trunc = TruncWeek if period == 'week' else TruncDate
+        rows = cls.objects.filter(
+            created_at__date__gte=start_date,
+            created_at__date__lte=end_date
+        ).annotate(
+            period=trunc('created_at')
+        ).values('period').annotate(
+            subscribed=Count('id', filter=Q(from_status=cls.SUBSCRIBED)),
+            unsubscribed=Count('id', filter=Q(to_status='unsubscribed')),
+            gained=Count('id', filter=Q(to_status='active')),
+            lost=Count('id', filter=Q(from_status='active')),
+        ).order_by('period')
+        
+        summary = []
+        for row in rows:
+            # TruncWeek returns a datetime, TruncDate a date
+            period_start = row['period'].date() if isinstance(row['period'], datetime) else row['period']
+            summary.append({
+                'period': period_start,
+                'subscribed': row['subscribed'],
+                'unsubscribed': row['unsubscribed'],
+                'gained': row['gained'],
+                'lost': row['lost'],
+                'net_growth': row['gained'] - row['lost'],
+            })
+        return summary
 
 class SportCategory(models.Model):
     SPORT_CHOICES = [
@@ -234,6 +346,11 @@ class NewsArticle(models.Model):
     scraped_date = models.DateTimeField(auto_now_add=True)
     is_featured = models.BooleanField(default=False)
     is_premium = models.BooleanField(default=False)
+    content_hash = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)  # Normalized title + URL fingerprint
+    minhash = models.BinaryField(null=True, blank=True, editable=False)  # Title + summary similarity signature
+    # Head of this article's story cluster when it is a near-duplicate
+    duplicate_of = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='duplicates')
     
     class Meta:
         ordering = ['-publish_date']
@@ -241,6 +358,25 @@ class NewsArticle(models.Model):
     
     def __str__(self):
         return f"{self.title} - {self.sport_category.display_name}"
+    
+    def save(self, *args, **kwargs):
+        # Only on insert: legacy duplicates are kept with no hash
+        if self._state.adding and not self.content_hash:
+            # Import here to avoid circular imports
+            from .ingestion import content_fingerprint
+            self.content_hash = content_fingerprint(self.title, self.source_url)
+        if not self.minhash:
+            from .story_clusters import minhash_signature
+            self.minhash = minhash_signature(self.title, self.summary)
+        super().save(*args, **kwargs)
+
+class NewsArticleBucket(models.Model):
+    """LSH band bucket of an article's signature, for near-duplicate lookup"""
+    article = models.ForeignKey(NewsArticle, on_delete=models.CASCADE, related_name='buckets')
+    bucket = models.BigIntegerField(db_index=True)
+
+    def __str__(self):
+        return f"{self.bucket} - {self.article_id}"
 
 class MatchFixture(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -254,12 +390,68 @@ class MatchFixture(models.Model):
     home_score = models.IntegerField(null=True, blank=True)
     away_score = models.IntegerField(null=True, blank=True)
     source_url = models.URLField(blank=True)
+    external_id = models.CharField(max_length=100, unique=True, null=True, blank=True)  # Provider fixture id, or natural key
     
     class Meta:
         ordering = ['match_date']
     
     def __str__(self):
         return f"{self.home_team} vs {self.away_team} - {self.match_date.strftime('%Y-%m-%d')}"
+    
+    def save(self, *args, **kwargs):
+        # Only on insert: legacy duplicates are kept with no key
+        if self._state.adding and not self.external_id:
+            # Import here to avoid circular imports
+            from .ingestion import natural_fixture_key
+            self.external_id = natural_fixture_key(
+                self.sport_category.name, self.home_team, self.away_team, self.match_date
+            )
+        super().save(*args, **kwargs)
+
+class IngestionWatermark(models.Model):
+    """How far ingestion has got for one (provider, sport, query) feed"""
+    MARK_FIELDS = ['last_published_at', 'last_item_ids', 'page_token', 'backlog_until',
+                   'content_digest', 'last_fixture_update']
+
+    provider = models.CharField(max_length=50)  # newsdata, api-sports
+    sport = models.CharField(max_length=50)
+    query = models.CharField(max_length=100, blank=True)  # News query; blank for fixture feeds
+    # News: newest publish date ingested, and the ids published at that instant
+    last_published_at = models.DateTimeField(null=True, blank=True)
+    last_item_ids = models.JSONField(default=list, blank=True)
+    # News: where to resume paging when a run stopped before reaching
+    # items it had seen, and the publish date that backlog runs down to
+    page_token = models.CharField(max_length=255, blank=True)
+    backlog_until = models.DateTimeField(null=True, blank=True)
+    # Fixtures: digest of the last feed and when its content last changed
+    content_digest = models.CharField(max_length=64, blank=True)
+    last_fixture_update = models.DateTimeField(null=True, blank=True)
+    last_run_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['provider', 'sport', 'query']
+
+    def __str__(self):
+        return f"{self.provider}:{self.sport}:{self.query or '-'}"
+
+    def mark(self) -> dict:
+        """Plain copy of the watermark fields, safe to hand to fetch threads"""
+        return {field: getattr(self, field) for field in self.MARK_FIELDS}
+
+    @classmethod
+    def load(cls, provider, sports):
+        """{(sport, query): mark} for a provider's feeds (one query)"""
+        return {
+            (watermark.sport, watermark.query): watermark.mark()
+            for watermark in cls.objects.filter(provider=provider, sport__in=list(sports))
+        }
+
+    @classmethod
+    def advance(cls, provider, sport, query='', **mark):
+        """Store a feed's new watermark once its items are saved"""
+        values = {field: value for field, value in mark.items() if field in cls.MARK_FIELDS}
+        values['last_run_at'] = datetime.now(timezone.utc)
+        cls.objects.update_or_create(provider=provider, sport=sport, query=query, defaults=values)
 
 class Newsletter(models.Model):
     STATUS_CHOICES = [
@@ -293,6 +485,7 @@ class Newsletter(models.Model):
 class NewsletterDelivery(models.Model):
     DELIVERY_STATUS = [
         ('pending', 'Pending'),
+        ('sending', 'Sending'),
         ('sent', 'Sent'),
         ('failed', 'Failed'),
         ('bounced', 'Bounced'),
@@ -310,22 +503,25 @@ class NewsletterDelivery(models.Model):
     last_clicked_at = models.DateTimeField(null=True, blank=True)
 
     def track_click(self, url, ip_address=None, user_agent=None):
-        """Track a click on a link"""
-       
+        """
+        Track a click on a link
+        
+        Counters are incremented atomically in the database; bulk clicks
+        go through core.tracking (buffered and flushed in batches) instead.
+        """
         click = EmailClickTracking.objects.create(
             delivery=self,
             url=url,
+            clicked_at=datetime.now(timezone.utc),
             ip_address=ip_address,
-            user_agent=user_agent
+            user_agent=user_agent or ''
         )
         
-        self.click_count += 1
-        self.last_clicked_at = timezone.now()
-        
-        # Update clicked_links JSON field
-        if url not in self.clicked_links:
-            self.clicked_links.append(url)     
-            self.save()
+        NewsletterDelivery.objects.filter(pk=self.pk).update(
+            click_count=models.F('click_count') + 1,
+            last_clicked_at=click.clicked_at
+        )
+        self.refresh_from_db(fields=['click_count', 'last_clicked_at'])
         return click
     
     class Meta:
@@ -334,6 +530,32 @@ class NewsletterDelivery(models.Model):
     def __str__(self):
         return f"{self.newsletter.title} -> {self.subscriber.email} ({self.status})"
 
+class NewsletterSendRun(models.Model):
+    """Durable progress checkpoint for sending a newsletter (or one chunk of it)"""
+    RUN_STATUS = [
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    newsletter = models.ForeignKey(Newsletter, on_delete=models.CASCADE, related_name='send_runs')
+    scope = models.CharField(max_length=100, default='all')  # 'all' or 'first_pk:last_pk' for a chunk
+    status = models.CharField(max_length=20, choices=RUN_STATUS, default='running')
+    last_subscriber_id = models.UUIDField(null=True, blank=True)  # Keyset cursor: last pk processed
+    sent_count = models.IntegerField(default=0)
+    failed_count = models.IntegerField(default=0)
+    attempts = models.IntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        unique_together = ['newsletter', 'scope']
+        ordering = ['-started_at']
+    
+    def __str__(self):
+        return f"{self.newsletter.title} [{self.scope}] ({self.status})"
+
 class NewsletterTemplate(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True)
@@ -366,29 +588,100 @@ class NewsletterAnalytics(models.Model):
     class Meta:
         ordering = ['-newsletter__edition_date']
     
-    def calculate_metrics(self):
-        """Calculate all metrics for this newsletter"""
-        deliveries = NewsletterDelivery.objects.filter(newsletter=self.newsletter)
-        
-        self.total_sent = deliveries.count()
-        self.total_delivered = deliveries.filter(status='sent').count()
-        self.total_opened = deliveries.filter(opened_at__isnull=False).count()
-        self.total_failed = deliveries.filter(status='failed').count()
-        self.total_bounced = deliveries.filter(status='bounced').count()
+    @staticmethod
+    def delivery_aggregates():
+        """Conditional counts over NewsletterDelivery, keyed by metric field"""
+        return {
+            # Attempted deliveries only, not rows still pending or sending
+            'total_sent': Count('id', filter=Q(status__in=['sent', 'failed', 'bounced'])),
+            'total_delivered': Count('id', filter=Q(status='sent')),
+            'total_opened': Count('id', filter=Q(opened_at__isnull=False)),
+            'total_failed': Count('id', filter=Q(status='failed')),
+            'total_bounced': Count('id', filter=Q(status='bounced')),
+            'total_clicked': Count('id', filter=Q(click_count__gt=0)),
+        }
+    
+    def apply_counts(self, counts):
+        """Set the totals and rates from a delivery_aggregates() result"""
+        for field in self.delivery_aggregates():
+            setattr(self, field, counts.get(field) or 0)
         
-        # Calculate click tracking (you'll need to implement link tracking)
-        self.total_clicked = deliveries.filter(clicked_links__len__gt=0).count()
+        # One delivery per subscriber, so opened/clicked deliveries are unique
+        self.unique_opens = self.total_opened
+        self.unique_clicks = self.total_clicked
         
         # Calculate rates
         if self.total_sent > 0:
             self.delivery_rate = (self.total_delivered / self.total_sent) * 100
             self.bounce_rate = (self.total_bounced / self.total_sent) * 100
+        else:
+            self.delivery_rate = self.bounce_rate = 0.0
             
         if self.total_delivered > 0:
             self.open_rate = (self.total_opened / self.total_delivered) * 100
             self.click_rate = (self.total_clicked / self.total_delivered) * 100
+        else:
+            self.open_rate = self.click_rate = 0.0
+    
+    def calculate_metrics(self):
+        """Calculate all metrics for this newsletter (one aggregate query)"""
+        counts = NewsletterDelivery.objects.filter(
+            newsletter_id=self.newsletter_id
+        ).aggregate(**self.delivery_aggregates())
         
+        self.apply_counts(counts)
         self.save()
+    
+    @classmethod
+    def calculate_for_newsletters(cls, newsletter_ids):
+        """
+        Calculate metrics for many newsletters at once
+        
+        One GROUP BY over the deliveries, one read of the existing analytics
+        rows, then a bulk insert/update, whatever the number of newsletters.
+        
+        Returns:
+            {newsletter_id: NewsletterAnalytics}
+        """
+        newsletter_ids = [uuid.UUID(str(pk)) for pk in newsletter_ids]
+        if not newsletter_ids:
+            return {}
+        
+        counts = {
+            row['newsletter_id']: row
+            for row in NewsletterDelivery.objects.filter(
+                newsletter_id__in=newsletter_ids
+            ).values('newsletter_id').annotate(**cls.delivery_aggregates()).order_by()
+        }
+        existing = {
+            analytics.newsletter_id: analytics
+            for analytics in cls.objects.filter(newsletter_id__in=newsletter_ids)
+        }
+        
+        # bulk_update skips auto_now, so the timestamp is set by hand
+        now = datetime.now(timezone.utc)
+        results = {}
+        created = []
+        for newsletter_id in newsletter_ids:
+            analytics = existing.get(newsletter_id)
+            if analytics is None:
+                analytics = cls(newsletter_id=newsletter_id)
+                created.append(analytics)
+            analytics.apply_counts(counts.get(newsletter_id, {}))
+            analytics.updated_at = now
+            results[newsletter_id] = analytics
+        
+        fields = list(cls.delivery_aggregates()) + [
+            'unique_opens', 'unique_clicks', 'open_rate', 'click_rate',
+            'delivery_rate', 'bounce_rate', 'updated_at'
+        ]
+        with transaction.atomic():
+            if created:
+                cls.objects.bulk_create(created, ignore_conflicts=True)
+            if existing:
+                cls.objects.bulk_update(list(existing.values()), fields)
+        
+        return results
 
 class SubscriberAnalytics(models.Model):
     """Daily subscriber analytics"""
@@ -402,64 +695,99 @@ class SubscriberAnalytics(models.Model):
     class Meta:
         ordering = ['-date']
     
+    STAT_FIELDS = ['total_subscribers', 'new_subscriptions', 'unsubscriptions',
+                   'active_subscribers', 'growth_rate']
+    
     @classmethod
-    def calculate_daily_stats(cls, date=None):
-        """Calculate subscriber stats for a given date"""
-        if date is None:
-            date = timezone.now().date()
+    def calculate_range(cls, start_date, end_date):
+        """
+        Calculate and store subscriber stats for every day in a range
         
-        # Get stats for the date
-        total_subs = NewsletterSubscriber.objects.filter(
-            subscription_date__date__lte=date
-        ).count()
+        One aggregate for everything before the range, one GROUP BY over
+        subscription dates inside it, then running totals per day and a
+        bulk upsert of the rows, whatever the length of the range.
+        Unsubscriptions are that day's unsubscribe events; active counts
+        reflect subscribers' current status.
         
-        active_subs = NewsletterSubscriber.objects.filter(
-            subscription_date__date__lte=date,
-            status='active'
-        ).count()
+        Returns:
+            SubscriberAnalytics rows for the range, oldest first
+        """
+        if end_date < start_date:
+            return []
         
-        new_subs = NewsletterSubscriber.objects.filter(
-            subscription_date__date=date
-        ).count()
+        counters = {
+            'subscribed': Count('id'),
+            'active': Count('id', filter=Q(status='active')),
+        }
         
-        # Count unsubscriptions (you may want to track this separately)
-        unsubs = NewsletterSubscriber.objects.filter(
-            subscription_date__date__lte=date,
-            status='unsubscribed'
-        ).count()
+        baseline = NewsletterSubscriber.objects.filter(
+            subscription_date__date__lt=start_date
+        ).aggregate(**counters)
         
-        # Calculate growth rate
-        previous_day = date - timedelta(days=1)
-        try:
-            previous_stats = cls.objects.get(date=previous_day)
-            if previous_stats.total_subscribers > 0:
-                growth_rate = ((total_subs - previous_stats.total_subscribers) / previous_stats.total_subscribers) * 100
-            else:
-                growth_rate = 0.0
-        except cls.DoesNotExist:
-            growth_rate = 0.0
+        per_day = {
+            row['day']: row
+            for row in NewsletterSubscriber.objects.filter(
+                subscription_date__date__gte=start_date,
+                subscription_date__date__lte=end_date
+            ).annotate(
+                day=TruncDate('subscription_date')
+            ).values('day').annotate(**counters).order_by()
+        }
         
-        # Create or update record
-        stats, created = cls.objects.get_or_create(
-            date=date,
-            defaults={
-                'total_subscribers': total_subs,
-                'new_subscriptions': new_subs,
-                'unsubscriptions': unsubs,
-                'active_subscribers': active_subs,
-                'growth_rate': growth_rate
-            }
+        unsubscribed_per_day = dict(
+            SubscriptionEvent.objects.filter(
+                to_status='unsubscribed',
+                created_at__date__gte=start_date,
+                created_at__date__lte=end_date
+            ).annotate(
+                day=TruncDate('created_at')
+            ).values('day').annotate(count=Count('id')).order_by().values_list('day', 'count')
         )
         
-        if not created:
-            stats.total_subscribers = total_subs
-            stats.new_subscriptions = new_subs
-            stats.unsubscriptions = unsubs
-            stats.active_subscribers = active_subs
-            stats.growth_rate = growth_rate
-            stats.save()
+        existing = {
+            stats.date: stats
+            for stats in cls.objects.filter(date__gte=start_date, date__lte=end_date)
+        }
+        
+        total = baseline['subscribed'] or 0
+        active = baseline['active'] or 0
+        
+        results = []
+        created = []
+        day = start_date
+        while day <= end_date:
+            counts = per_day.get(day, {})
+            previous_total = total
+            total += counts.get('subscribed', 0)
+            active += counts.get('active', 0)
+            
+            stats = existing.get(day)
+            if stats is None:
+                stats = cls(date=day)
+                created.append(stats)
+            stats.total_subscribers = total
+            stats.new_subscriptions = counts.get('subscribed', 0)
+            stats.unsubscriptions = unsubscribed_per_day.get(day, 0)
+            stats.active_subscribers = active
+            stats.growth_rate = ((total - previous_total) / previous_total) * 100 if previous_total > 0 else 0.0
+            results.append(stats)
+            day += timedelta(days=1)
+        
+        with transaction.atomic():
+            if created:
+                cls.objects.bulk_create(created, ignore_conflicts=True)
+            if existing:
+                cls.objects.bulk_update(list(existing.values()), cls.STAT_FIELDS)
+        
+        return results
+    
+    @classmethod
+    def calculate_daily_stats(cls, date=None):
+        """Calculate subscriber stats for a given date"""
+        if date is None:
+            date = datetime.now(timezone.utc).date()
         
-        return stats
+        return cls.calculate_range(date, date)[0]
 
 class SportAnalytics(models.Model):
     """Analytics by sport category"""
@@ -0,0 +1,342 @@
+# core/rate_limit.py
+"""
+Shared rate limiting
+Token buckets and quota counters kept in the Django cache so every web
+process and Celery worker draws from the same budget
+"""
+import logging
+import math
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+logger = logging.getLogger(__name__)
+
+
+# Refill and take tokens in one atomic step. Uses the Redis clock so
+# workers with skewed clocks still agree. Returns the seconds to wait
+# (as a string, Lua numbers are truncated in replies); "0" means acquired.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+
+def get_redis_client():
+    """Raw Redis client behind the default cache, or None for other backends"""
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+    except Exception:
+        return None
+
+
+def cache_is_shared(alias: str = 'default') -> bool:
+    """Whether every process sees the same cache (not LocMem or dummy)"""
+    return not isinstance(caches[alias], (LocMemCache, DummyCache))
+
+
+class TokenBucket:
+    """
+    Cluster-wide token bucket
+
+    Tokens refill continuously at `rate` per second up to `capacity`
+    (the burst size). With a Redis cache the bucket is exact and atomic;
+    with any other cache it falls back to fixed windows of
+    capacity / rate seconds counted with atomic cache.incr.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+
+        self.name = name
+        self.rate = rate
+        self.capacity = max(1, int(capacity))
+        self.key = f"token_bucket:{name}"
+        self._script = None
+
+    def try_acquire(self, tokens: int = 1) -> float:
+        """
+        Take tokens if available
+
+        Returns 0 when acquired, otherwise the seconds to wait before
+        retrying (nothing is taken in that case).
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot take {tokens} tokens from a bucket of {self.capacity}")
+
+        client = get_redis_client()
+
+        if client is not None:
+            try:
+                if self._script is None:
+                    self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+                wait = self._script(
+                    keys=[cache.make_key(self.key)],
+                    args=[self.rate, self.capacity, tokens]
+                )
+                return float(wait)
+            except Exception as e:
+                logger.warning(f"Token bucket '{self.name}' Redis error, using cache counters: {e}")
+
+        return self._try_acquire_window(tokens)
+
+    def _try_acquire_window(self, tokens: int) -> float:
+        """Fixed-window fallback built on atomic cache.add / cache.incr"""
+        window = self.capacity / self.rate
+        now = time.time()
+        slot = int(now // window)
+        key = f"{self.key}:{slot}"
+
+        try:
+            cache.add(key, 0, timeout=math.ceil(window) + 1)
+            used = cache.incr(key, tokens)
+        except Exception as e:
+            # Never block sending because the cache is unavailable
+            logger.warning(f"Token bucket '{self.name}' cache error: {e}")
+            return 0.0
+
+        if used <= self.capacity:
+            return 0.0
+
+        return (slot + 1) * window - now
+
+    def acquire(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Block until tokens are acquired
+
+        Args:
+            tokens: Tokens to take
+            timeout: Give up after this many seconds (None = wait forever)
+
+        Returns:
+            True if acquired, False if the timeout ran out first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return True
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+
+            time.sleep(wait)
+
+
+def get_email_rate_limiter(relay: str = None) -> Optional[TokenBucket]:
+    """
+    Token bucket for outbound email through a relay
+
+    Limits come from NEWSLETTER_RELAY_LIMITS[relay] when configured, else
+    NEWSLETTER_MAX_EMAILS_PER_HOUR / NEWSLETTER_EMAIL_BURST. The steady rate
+    is never faster than one email per NEWSLETTER_EMAIL_DELAY seconds.
+    Returns None when NEWSLETTER_RATE_LIMIT_ENABLED is off.
+    """
+    if not getattr(settings, 'NEWSLETTER_RATE_LIMIT_ENABLED', True):
+        return None
+
+    relay = relay or getattr(settings, 'EMAIL_HOST', 'default')
+    relay_limits: Dict = getattr(settings, 'NEWSLETTER_RELAY_LIMITS', {}).get(relay, {})
+
+    per_hour = relay_limits.get('per_hour', getattr(settings, 'NEWSLETTER_MAX_EMAILS_PER_HOUR', 500))
+    burst = relay_limits.get('burst', getattr(settings, 'NEWSLETTER_EMAIL_BURST', 20))
+    delay = relay_limits.get('delay', getattr(settings, 'NEWSLETTER_EMAIL_DELAY', 0))
+
+    rate = per_hour / 3600
+    if delay:
+        rate = min(rate, 1 / delay)
+
+    return TokenBucket(f"email:{relay}", rate=rate, capacity=burst)
+
+
+def throttle_email(relay: str = None, timeout: Optional[float] = None) -> bool:
+    """
+    Wait for a token from the relay's email bucket
+
+    Returns False if the timeout ran out first; callers decide whether to
+    send anyway. Always True when rate limiting is disabled.
+    """
+    limiter = get_email_rate_limiter(relay)
+    if limiter is None:
+        return True
+
+    acquired = limiter.acquire(timeout=timeout)
+    if not acquired:
+        logger.warning(f"Email rate limit for relay '{limiter.name}' still exhausted after {timeout}s")
+    return acquired
+
+
+# Request rates used when API_PROVIDER_RATE_LIMITS has no entry; they match
+# the fixed delays the API clients used to sleep between calls
+# (per_day is the provider's daily request quota, counted per API for
+# api-sports where each sport is a separate API)
+DEFAULT_PROVIDER_RATE_LIMITS = {
+    'newsdata': {'per_second': 3, 'burst': 1, 'per_day': 200},
+    'api-sports': {'per_second': 2, 'burst': 1, 'per_day': 100},
+}
+
+
+def get_provider_rate_limiter(provider: str) -> TokenBucket:
+    """
+    Token bucket for requests to an upstream data provider
+
+    Shared by every thread and worker calling the provider, so concurrent
+    fetches are paced by the provider's limit rather than by sleeps.
+    Limits come from API_PROVIDER_RATE_LIMITS[provider]
+    ({'per_second': float, 'burst': int}).
+    """
+    limits = _provider_limits(provider)
+    return TokenBucket(f"provider:{provider}", rate=limits['per_second'], capacity=limits['burst'])
+
+
+def _provider_limits(provider: str) -> Dict:
+    return {
+        **DEFAULT_PROVIDER_RATE_LIMITS.get(provider, {'per_second': 1, 'burst': 1, 'per_day': 100}),
+        **getattr(settings, 'API_PROVIDER_RATE_LIMITS', {}).get(provider, {}),
+    }
+
+
+class QuotaCounter:
+    """
+    Cluster-wide request quota over fixed windows (UTC days by default)
+
+    Requests are counted with atomic cache.add / cache.incr on one key per
+    window, created with an expiry at the window's end. A request is
+    reserved before it is sent, so concurrent callers can never go over
+    the limit between them.
+    """
+
+    def __init__(self, name: str, limit: int, window: int = 86400):
+        self.name = name
+        self.limit = int(limit)
+        self.window = window
+        self.key = f"quota:{name}"
+        self.blocked_key = f"quota:{name}:blocked"
+
+    def _slot(self) -> Tuple[str, float]:
+        """Key of the current window and the seconds until it resets"""
+        now = time.time()
+        slot = int(now // self.window)
+        return f"{self.key}:{slot}", (slot + 1) * self.window - now
+
+    def try_consume(self, calls: int = 1) -> bool:
+        """Reserve calls from the quota; False (nothing taken) if it would go over"""
+        key, reset_in = self._slot()
+
+        try:
+            if cache.get(self.blocked_key):
+                return False
+
+            cache.add(key, 0, timeout=math.ceil(reset_in) + 1)
+            used = cache.incr(key, calls)
+            if used > self.limit:
+                cache.decr(key, calls)
+                return False
+            return True
+        except Exception as e:
+            # Never stop fetching because the cache is unavailable
+            logger.warning(f"Quota '{self.name}' cache error: {e}")
+            return True
+
+    def used(self) -> int:
+        key, _ = self._slot()
+        return cache.get(key, 0)
+
+    def remaining(self) -> int:
+        """Calls left in the current window (0 while blocked)"""
+        if cache.get(self.blocked_key):
+            return 0
+        return max(0, self.limit - self.used())
+
+    def reset_in(self) -> float:
+        """Seconds until the current window resets"""
+        return self._slot()[1]
+
+    def block(self, seconds: Optional[float] = None):
+        """
+        Stop spending the quota after the provider refused a request (429)
+
+        For `seconds` (the response's Retry-After) when given, otherwise
+        until the window resets: the provider's count evidently differs
+        from ours.
+        """
+        seconds = seconds or self.reset_in()
+        cache.set(self.blocked_key, 1, timeout=math.ceil(seconds))
+        logger.warning(f"Quota '{self.name}' blocked for {math.ceil(seconds)}s after a 429")
+
+    def status(self) -> Dict:
+        return {
+            'limit': self.limit,
+            'used': self.used(),
+            'remaining': self.remaining(),
+            'reset_in': round(self.reset_in()),
+        }
+
+
+def retry_after_seconds(response) -> Optional[float]:
+    """Seconds from a response's Retry-After header (delta or HTTP date), if any"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# Whether get_provider_quota has reported a per-process cache yet
+_quota_cache_warned = False
+
+
+def get_provider_quota(provider: str, scope: str = None) -> QuotaCounter:
+    """
+    Daily request quota for an upstream data provider
+
+    `scope` separates quotas a provider counts independently (the API per
+    sport for api-sports). The limit is API_PROVIDER_RATE_LIMITS[provider]
+    ['per_day']. Only enforced across processes with a shared cache.
+    """
+    global _quota_cache_warned
+    if not _quota_cache_warned and not cache_is_shared():
+        _quota_cache_warned = True
+        logger.warning(
+            "Provider quotas are counted in a per-process cache, so each worker "
+            "spends its own daily budget; set REDIS_URL to share them"
+        )
+
+    name = f"{provider}:{scope}" if scope else provider
+    return QuotaCounter(name, limit=_provider_limits(provider)['per_day'])
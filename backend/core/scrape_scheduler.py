@@ -0,0 +1,174 @@
+# core/scrape_scheduler.py
+"""
+Polite concurrent scraping
+Scrape jobs run on a bounded thread pool while every request goes
+through a per-host scheduler: at most N requests in flight per host,
+a minimum gap between request starts, connect/read timeouts and
+retries with jittered exponential backoff. Per-host latency is recorded
+for the run report.
+"""
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, Iterator, List, Tuple
+from urllib.parse import urlsplit
+import requests
+from django.conf import settings
+
+from .http_cache import fresh_response
+from .rate_limit import retry_after_seconds
+
+logger = logging.getLogger(__name__)
+
+# Responses worth another attempt
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+DEFAULT_HOST_LIMITS = {'concurrency': 2, 'delay': 1.0}
+
+
+class _Host:
+    def __init__(self, concurrency: int, delay: float):
+        self.semaphore = threading.BoundedSemaphore(max(1, concurrency))
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.retries = 0
+
+
+class HostScheduler:
+    """
+    Per-host politeness shared by every scraper in a run
+
+    Limits come from SCRAPE_HOST_LIMITS[host] ({'concurrency': int,
+    'delay': seconds between request starts}), falling back to its
+    'default' entry.
+    """
+
+    def __init__(self, limits: Dict = None):
+        self.limits = limits if limits is not None else getattr(settings, 'SCRAPE_HOST_LIMITS', {})
+        self._hosts: Dict[str, _Host] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host: str) -> _Host:
+        with self._lock:
+            if host not in self._hosts:
+                limits = {**DEFAULT_HOST_LIMITS, **self.limits.get('default', {}), **self.limits.get(host, {})}
+                self._hosts[host] = _Host(limits['concurrency'], limits['delay'])
+            return self._hosts[host]
+
+    @contextmanager
+    def slot(self, host: str):
+        """Hold one of the host's request slots, spaced by its delay"""
+        state = self._host(host)
+        with state.semaphore:
+            with state.lock:
+                now = time.monotonic()
+                start = max(now, state.next_start)
+                state.next_start = start + state.delay
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+    def record(self, host: str, seconds: float, error: bool = False, retry: bool = False):
+        state = self._host(host)
+        with state.lock:
+            state.latencies.append(seconds)
+            state.errors += int(error)
+            state.retries += int(retry)
+
+    def report(self) -> Dict[str, Dict]:
+        """Requests, errors, retries and latency (avg / max ms) per host"""
+        report = {}
+        for host, state in self._hosts.items():
+            latencies = state.latencies
+            report[host] = {
+                'requests': len(latencies),
+                'errors': state.errors,
+                'retries': state.retries,
+                'avg_ms': round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0,
+                'max_ms': round(max(latencies) * 1000, 1) if latencies else 0,
+            }
+        return report
+
+
+def _backoff(attempt: int) -> float:
+    """Full jitter: uniform over [0, base * 2^attempt]"""
+    base = getattr(settings, 'SCRAPE_RETRY_BACKOFF', 1.0)
+    return random.uniform(0, base * 2 ** attempt)
+
+
+def polite_get(session: requests.Session, url: str, hosts: HostScheduler) -> requests.Response:
+    """
+    GET a page within its host's limits, retrying transient failures
+
+    Fresh responses from the HTTP cache skip the host queue. Timeouts,
+    connection errors and RETRY_STATUSES are retried SCRAPE_RETRIES
+    times; the last response (or error) is returned (or raised).
+    """
+    cached = fresh_response(url)
+    if cached is not None:
+        return cached
+
+    host = urlsplit(url).netloc
+    timeout = tuple(getattr(settings, 'SCRAPE_TIMEOUT', (5, 15)))
+    retries = getattr(settings, 'SCRAPE_RETRIES', 2)
+
+    for attempt in range(retries + 1):
+        last_attempt = attempt == retries
+        started = time.monotonic()
+        try:
+            with hosts.slot(host):
+                started = time.monotonic()  # Latency excludes the wait for a slot
+                response = session.get(url, timeout=timeout)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            hosts.record(host, time.monotonic() - started, error=True, retry=not last_attempt)
+            if last_attempt:
+                raise
+            wait = _backoff(attempt)
+            logger.warning(f"{host}: {e.__class__.__name__}, retrying in {wait:.1f}s")
+            time.sleep(wait)
+            continue
+
+        failed = response.status_code in RETRY_STATUSES
+        hosts.record(host, time.monotonic() - started, error=failed, retry=failed and not last_attempt)
+        if not failed or last_attempt:
+            return response
+
+        wait = _backoff(attempt)
+        if response.status_code == 429:
+            wait = max(wait, min(retry_after_seconds(response) or 0, 60))
+        logger.warning(f"{host}: HTTP {response.status_code}, retrying in {wait:.1f}s")
+        time.sleep(wait)
+
+
+def run_concurrently(jobs: List[Tuple[Hashable, Callable]], workers: int,
+                     thread_name_prefix: str = 'scrape') -> Iterator[Tuple[Hashable, Dict]]:
+    """
+    Yield (key, {"data", "error", "seconds"}) as each job finishes
+
+    Jobs run on a pool of `workers` threads (in order on this thread when
+    workers <= 1). A job that raises gets data None and the error message.
+    """
+
+    def run(job: Callable):
+        started = time.perf_counter()
+        try:
+            data, error = job(), None
+        except Exception as e:
+            data, error = None, str(e)
+        return {'data': data, 'error': error, 'seconds': time.perf_counter() - started}
+
+    if workers <= 1:
+        for name, job in jobs:
+            yield name, run(job)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=thread_name_prefix) as pool:
+        futures = {pool.submit(run, job): name for name, job in jobs}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
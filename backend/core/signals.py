@@ -1,5 +1,5 @@
 # newsletter/signals.py
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
@@ -7,14 +7,25 @@ from django.conf import settings
 from django.utils import timezone
 import logging
 
-from .models import NewsletterSubscriber, ContactMessage, EventBooking
+from .dashboard_stats import bump, count_subscription_events, invalidate_overview
+from .models import (
+    NewsletterSubscriber, ContactMessage, EventBooking, SubscriptionEvent,
+    Newsletter, NewsArticle, MatchFixture, SportCategory
+)
+from .rate_limit import throttle_email
 
 logger = logging.getLogger(__name__)
 
 def send_dual_email(subject_visitor, subject_admin, template_base, context, visitor_email):
     """
     Send email to both visitor and admin
+    
+    Both sends draw from the shared email rate limit. The wait is capped at
+    TRANSACTIONAL_EMAIL_MAX_WAIT seconds since this runs inside a request;
+    past that the email is sent anyway.
     """
+    max_wait = getattr(settings, 'TRANSACTIONAL_EMAIL_MAX_WAIT', 10)
+    
     try:
         # Email to Visitor
         html_visitor = render_to_string(f'newsletter/emails/{template_base}_visitor.html', context)
@@ -27,6 +38,7 @@ def send_dual_email(subject_visitor, subject_admin, template_base, context, visi
             to=[visitor_email]
         )
         visitor_msg.attach_alternative(html_visitor, "text/html")
+        throttle_email(timeout=max_wait)
         visitor_msg.send()
         
         # Email to Admin
@@ -40,6 +52,7 @@ def send_dual_email(subject_visitor, subject_admin, template_base, context, visi
             to=[settings.ADMIN_EMAIL]
         )
         admin_msg.attach_alternative(html_admin, "text/html")
+        throttle_email(timeout=max_wait)
         admin_msg.send()
         
         logger.info(f"Dual emails sent successfully to {visitor_email} and admin")
@@ -127,4 +140,38 @@ def event_booking_notification(sender, instance, created, **kwargs):
             logger.info(f"Event booking emails sent for {instance.email}")
             
         except Exception as e:
-            logger.error(f"Error in event booking notification: {e}")
\ No newline at end of file
+            logger.error(f"Error in event booking notification: {e}")
+
+# Dashboard overview counters (see core/dashboard_stats.py)
+
+@receiver(post_save, sender=SubscriptionEvent)
+def count_subscription_event(sender, instance, created, **kwargs):
+    if created:
+        count_subscription_events([(instance.from_status, instance.to_status)])
+
+@receiver(post_save, sender=Newsletter)
+def count_newsletter_created(sender, instance, created, **kwargs):
+    if created:
+        bump('total_newsletters')
+        bump('recent_newsletters')
+
+@receiver(post_delete, sender=Newsletter)
+def count_newsletter_deleted(sender, instance, **kwargs):
+    bump('total_newsletters', -1)
+    if instance.status == 'sent':
+        bump('sent_newsletters', -1)
+
+@receiver(post_save, sender=NewsArticle)
+def count_article_created(sender, instance, created, **kwargs):
+    if created:
+        bump('total_articles')
+
+@receiver(post_save, sender=MatchFixture)
+def count_fixture_created(sender, instance, created, **kwargs):
+    if created:
+        bump('total_fixtures')
+
+@receiver(post_save, sender=SportCategory)
+@receiver(post_delete, sender=SportCategory)
+def sport_categories_changed(sender, instance, **kwargs):
+    invalidate_overview()
@@ -0,0 +1,209 @@
+# core/smtp_sink.py
+"""
+Local stand-in SMTP server
+Accepts (and discards) mail so delivery engines can be exercised and
+benchmarked without a real relay. Latency and failures can be injected.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+from django.core.mail.backends.smtp import EmailBackend
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPSink:
+    """
+    Minimal asyncio SMTP server running on a background thread
+
+    Speaks enough SMTP for smtplib / Django's SMTP backend (no TLS or AUTH).
+    Recipients whose address contains `reject_marker` are refused with a
+    permanent 550; those containing `defer_marker` get a transient 451.
+    `latency` (seconds, optionally +/- `jitter`) is added to every DATA reply
+    to mimic a remote relay.
+
+    Usage:
+        with SMTPSink(latency=0.02) as sink:
+            get_connection(host=sink.host, port=sink.port, use_tls=False, ...)
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 jitter: float = 0.0, reject_marker: str = '+reject',
+                 defer_marker: str = '+defer'):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.reject_marker = reject_marker
+        self.defer_marker = defer_marker
+
+        self.stats: Dict[str, int] = {
+            'connections': 0,
+            'messages': 0,
+            'recipients': 0,
+            'rejected': 0,
+            'deferred': 0,
+        }
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self) -> int:
+        """Start serving in the background and return the bound port"""
+        self._thread = threading.Thread(target=self._serve, name='smtp-sink', daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=10)
+        if self._server is None:
+            raise RuntimeError("SMTP sink failed to start")
+        return self.port
+
+    def stop(self):
+        """Stop serving and wait for the background thread"""
+        if self._loop and self._server:
+            self._loop.call_soon_threadsafe(self._server.close)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join(timeout=10)
+
+    def serve_forever(self):
+        """Serve on the current thread until interrupted"""
+        self._serve()
+
+    def _serve(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            logger.info(f"SMTP sink listening on {self.host}:{self.port}")
+        except Exception as e:
+            logger.error(f"SMTP sink could not bind {self.host}:{self.port}: {e}")
+            self._ready.set()
+            return
+
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            # End sessions still open (e.g. a client that gave up mid-DATA)
+            pending = asyncio.all_tasks(self._loop)
+            for task in pending:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._count('connections')
+
+        async def reply(line: str):
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        recipients = []
+        try:
+            await reply("220 smtp-sink ready")
+
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+
+                line = raw.decode('utf-8', 'replace').rstrip('\r\n')
+                verb = line[:4].upper()
+
+                if verb == 'EHLO':
+                    writer.write(b"250-smtp-sink\r\n250-PIPELINING\r\n250-8BITMIME\r\n250 SIZE 52428800\r\n")
+                    await writer.drain()
+                elif verb == 'HELO':
+                    await reply("250 smtp-sink")
+                elif verb == 'MAIL':
+                    recipients = []
+                    await reply("250 OK")
+                elif verb == 'RCPT':
+                    address = line[line.find(':') + 1:].strip().strip('<>')
+                    if self.reject_marker and self.reject_marker in address:
+                        self._count('rejected')
+                        await reply("550 5.1.1 Mailbox unavailable")
+                    elif self.defer_marker and self.defer_marker in address:
+                        self._count('deferred')
+                        await reply("451 4.3.0 Try again later")
+                    else:
+                        recipients.append(address)
+                        await reply("250 OK")
+                elif verb == 'DATA':
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    while True:
+                        chunk = await reader.readline()
+                        if not chunk or chunk in (b".\r\n", b".\n"):
+                            break
+
+                    if self.latency or self.jitter:
+                        await asyncio.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+
+                    self._count('messages')
+                    self._count('recipients', len(recipients))
+                    recipients = []
+                    await reply("250 OK queued")
+                elif verb == 'RSET':
+                    recipients = []
+                    await reply("250 OK")
+                elif verb == 'NOOP':
+                    await reply("250 OK")
+                elif verb == 'QUIT':
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+class TimedSMTPBackend(EmailBackend):
+    """
+    SMTP backend that records how long each accepted message took
+
+    Samples (seconds per message, from send call to the relay's reply) are
+    collected on the class so every connection, on any thread, reports
+    into one list. Call reset() before a measurement.
+    """
+
+    samples: List[float] = []
+    _samples_lock = threading.Lock()
+
+    @classmethod
+    def reset(cls):
+        with cls._samples_lock:
+            cls.samples = []
+
+    def send_messages(self, email_messages):
+        started = time.perf_counter()
+        sent = super().send_messages(email_messages)
+
+        if sent:
+            per_message = (time.perf_counter() - started) / sent
+            with self._samples_lock:
+                self.samples.extend([per_message] * sent)
+
+        return sent
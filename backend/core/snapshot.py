@@ -0,0 +1,177 @@
+# core/snapshot.py
+"""
+Newsletter content snapshots
+Articles and fixtures are frozen into Newsletter.template_data when the
+newsletter is generated, so sends and the web view render from that copy
+without touching the content tables (and keep working after cleanup).
+"""
+import logging
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Dict, List
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Newsletter, NewsArticle, MatchFixture
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = 'snapshot'
+SNAPSHOT_VERSION = 1
+
+# Fixtures this close to generation are flagged as big matches
+BIG_MATCH_WINDOW = timedelta(days=7)
+
+
+def _sport(category) -> Dict:
+    return {'name': category.name, 'display_name': category.display_name}
+
+
+def serialize_article(article: NewsArticle) -> Dict:
+    """Compact, JSON-safe copy of the article fields the templates use"""
+    return {
+        'id': str(article.id),
+        'title': article.title,
+        'summary': article.summary,
+        'source_url': article.source_url,
+        'source_name': article.source_name,
+        'image_url': article.image_url,
+        'publish_date': article.publish_date.isoformat() if article.publish_date else None,
+        'article_type': article.article_type,
+        'is_featured': article.is_featured,
+        'is_premium': article.is_premium,
+        'sport': article.sport_category.name,
+    }
+
+
+def serialize_fixture(fixture: MatchFixture, generated_at) -> Dict:
+    """Compact, JSON-safe copy of the fixture fields the templates use"""
+    return {
+        'id': str(fixture.id),
+        'home_team': fixture.home_team,
+        'away_team': fixture.away_team,
+        'match_date': fixture.match_date.isoformat() if fixture.match_date else None,
+        'venue': fixture.venue,
+        'league_competition': fixture.league_competition,
+        'status': fixture.status,
+        'source_url': fixture.source_url,
+        'is_big_match': bool(
+            fixture.match_date
+            and generated_at <= fixture.match_date <= generated_at + BIG_MATCH_WINDOW
+        ),
+        'sport': fixture.sport_category.name,
+    }
+
+
+def build_content_snapshot(newsletter: Newsletter) -> Dict:
+    """
+    Serialize a newsletter's articles and fixtures
+
+    Two queries, three with a featured article (sport categories joined
+    in). Items keep the relations'
+    default ordering; the by-sport groups hold indexes into those lists.
+    """
+    generated_at = timezone.now()
+
+    articles = list(newsletter.articles.select_related('sport_category'))
+    fixtures = list(newsletter.fixtures.select_related('sport_category'))
+
+    sports = {}
+    articles_by_sport = {}
+    for index, article in enumerate(articles):
+        sports[article.sport_category.name] = _sport(article.sport_category)
+        articles_by_sport.setdefault(article.sport_category.name, []).append(index)
+
+    fixtures_by_sport = {}
+    for index, fixture in enumerate(fixtures):
+        sports[fixture.sport_category.name] = _sport(fixture.sport_category)
+        fixtures_by_sport.setdefault(fixture.sport_category.name, []).append(index)
+
+    featured = None
+    if newsletter.featured_article_id:
+        article = NewsArticle.objects.select_related('sport_category').filter(
+            id=newsletter.featured_article_id
+        ).first()
+        if article:
+            sports[article.sport_category.name] = _sport(article.sport_category)
+            featured = serialize_article(article)
+
+    return {
+        'version': SNAPSHOT_VERSION,
+        'generated_at': generated_at.isoformat(),
+        'sports': sports,
+        'articles': [serialize_article(article) for article in articles],
+        'fixtures': [serialize_fixture(fixture, generated_at) for fixture in fixtures],
+        'articles_by_sport': articles_by_sport,
+        'fixtures_by_sport': fixtures_by_sport,
+        'featured_article': featured,
+    }
+
+
+def freeze_content_snapshot(newsletter: Newsletter, save: bool = True) -> Dict:
+    """Build the snapshot and store it in newsletter.template_data"""
+    snapshot = build_content_snapshot(newsletter)
+    newsletter.template_data = {**(newsletter.template_data or {}), SNAPSHOT_KEY: snapshot}
+    if save:
+        newsletter.save(update_fields=['template_data'])
+    return snapshot
+
+
+def get_content_snapshot(newsletter: Newsletter) -> Dict:
+    """
+    The newsletter's snapshot, frozen now if it predates snapshots
+
+    Newsletters generated before snapshots existed are frozen from their
+    current relations once; every later read is query-free.
+    """
+    snapshot = (newsletter.template_data or {}).get(SNAPSHOT_KEY)
+    if snapshot and snapshot.get('version') == SNAPSHOT_VERSION:
+        return snapshot
+
+    logger.info(f"Freezing content snapshot for newsletter {newsletter.id}")
+    return freeze_content_snapshot(newsletter)
+
+
+def _hydrate(item: Dict, sports: Dict, date_field: str) -> SimpleNamespace:
+    sport = sports.get(item['sport']) or {'name': item['sport'], 'display_name': item['sport'].title()}
+    values = dict(item)
+    values[date_field] = parse_datetime(item[date_field]) if item.get(date_field) else None
+    values['sport_category'] = SimpleNamespace(**sport)
+    return SimpleNamespace(**values)
+
+
+def hydrate_snapshot(snapshot: Dict) -> Dict:
+    """
+    Turn a stored snapshot back into template-ready objects
+
+    Articles and fixtures become attribute objects with real datetimes and
+    a `sport_category` (name, display_name), so templates written against
+    the models render unchanged.
+    """
+    sports = snapshot.get('sports', {})
+    articles = [_hydrate(item, sports, 'publish_date') for item in snapshot.get('articles', [])]
+    fixtures = [_hydrate(item, sports, 'match_date') for item in snapshot.get('fixtures', [])]
+
+    featured = snapshot.get('featured_article')
+
+    return {
+        'sports': sports,
+        'articles': articles,
+        'fixtures': fixtures,
+        'articles_by_sport': {
+            sport: [articles[i] for i in indexes]
+            for sport, indexes in snapshot.get('articles_by_sport', {}).items()
+        },
+        'fixtures_by_sport': {
+            sport: [fixtures[i] for i in indexes]
+            for sport, indexes in snapshot.get('fixtures_by_sport', {}).items()
+        },
+        'featured_article': _hydrate(featured, sports, 'publish_date') if featured else None,
+    }
+
+
+def filter_by_sports(items: List, sports) -> List:
+    """Items whose sport is in `sports` (all items when sports is empty)"""
+    if not sports:
+        return list(items)
+    return [item for item in items if item.sport_category.name in sports]
@@ -0,0 +1,199 @@
+# core/story_clusters.py
+"""
+Near-duplicate detection across news sources
+Each article gets a MinHash signature of its title and summary tokens,
+split into LSH bands whose hashes are stored as indexed buckets. Articles
+sharing a bucket are candidates; those whose signatures agree closely
+enough are the same story and are collapsed into one cluster, headed by
+the premium (else earliest) copy.
+"""
+import hashlib
+import logging
+import struct
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Set
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .models import NewsArticle, NewsArticleBucket
+
+logger = logging.getLogger(__name__)
+
+# Changing these invalidates every stored signature and bucket
+NUM_PERM = 32
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MASK_32 = (1 << 32) - 1
+# Fixed (a, b) pairs for the permutations h -> (a*h + b) mod p
+_PERMUTATIONS = [
+    (
+        int.from_bytes(hashlib.blake2b(f'a{i}'.encode(), digest_size=8).digest(), 'big') % (_MERSENNE_PRIME - 1) + 1,
+        int.from_bytes(hashlib.blake2b(f'b{i}'.encode(), digest_size=8).digest(), 'big') % _MERSENNE_PRIME,
+    )
+    for i in range(NUM_PERM)
+]
+
+STOPWORDS = frozenset(
+    'a an and are as at be been by for from has have he her his in into is it its of on or '
+    'over said says she that the their they this to up v vs was were will with after'.split()
+)
+
+SUMMARY_TOKENS = 60
+
+
+def story_tokens(title: str, summary: str = '') -> Set[str]:
+    """Title words and word pairs plus the opening words of the summary"""
+    from .ingestion import normalize_title  # ingestion imports this module
+
+    title_words = [w for w in normalize_title(title).split() if w not in STOPWORDS]
+    summary_words = [w for w in normalize_title(summary).split() if w not in STOPWORDS][:SUMMARY_TOKENS]
+    tokens = set(title_words) | set(summary_words)
+    tokens.update(f'{a} {b}' for a, b in zip(title_words, title_words[1:]))
+    return tokens
+
+
+def minhash_signature(title: str, summary: str = '') -> Optional[bytes]:
+    """Packed NUM_PERM x 32-bit MinHash of the story tokens (None when there are none)"""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+        for token in story_tokens(title, summary)
+    ]
+    if not hashes:
+        return None
+    return struct.pack(
+        f'>{NUM_PERM}I',
+        *(min(((a * h + b) % _MERSENNE_PRIME) & _MASK_32 for h in hashes) for a, b in _PERMUTATIONS)
+    )
+
+
+def _values(signature: bytes) -> tuple:
+    return struct.unpack(f'>{NUM_PERM}I', bytes(signature))
+
+
+def similarity(first: bytes, second: bytes) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    if not first or not second:
+        return 0.0
+    return sum(x == y for x, y in zip(_values(first), _values(second))) / NUM_PERM
+
+
+def signature_buckets(signature: bytes) -> List[int]:
+    """One signed 64-bit bucket per band; similar stories share at least one"""
+    values = _values(signature)
+    buckets = []
+    for band in range(BANDS):
+        key = struct.pack(f'>B{ROWS}I', band, *values[band * ROWS:(band + 1) * ROWS])
+        buckets.append(int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big', signed=True))
+    return buckets
+
+
+def _precedes(article, other) -> bool:
+    """Whether article should head a cluster over other: premium first, then earliest"""
+    return (not article.is_premium, article.publish_date) < (not other.is_premium, other.publish_date)
+
+
+def cluster_articles(articles: Iterable[NewsArticle], batch_size: int = 500) -> Dict:
+    """
+    Index newly stored articles and attach the near-duplicates to their story
+
+    Two reads per batch whatever the table size: the stored articles
+    sharing a bucket with the batch (within NEAR_DUPLICATE_WINDOW_DAYS of
+    it), and the heads of those articles' clusters. Candidates are kept
+    when their estimated similarity reaches NEAR_DUPLICATE_THRESHOLD. A
+    new article that should head its cluster (a premium source arriving
+    after a syndicated copy) takes it over in one UPDATE.
+
+    Returns:
+        {'indexed': n, 'clustered': n}
+    """
+    articles = sorted((a for a in articles if a.minhash), key=lambda a: a.publish_date)
+    stats = {'indexed': len(articles), 'clustered': 0}
+    if not articles:
+        return stats
+
+    threshold = getattr(settings, 'NEAR_DUPLICATE_THRESHOLD', 0.5)
+    window = timedelta(days=getattr(settings, 'NEAR_DUPLICATE_WINDOW_DAYS', 3))
+    buckets = {article.id: signature_buckets(article.minhash) for article in articles}
+    batch_ids = set(buckets)
+
+    matches = NewsArticleBucket.objects.filter(
+        bucket__in={bucket for values in buckets.values() for bucket in values},
+        article__publish_date__gte=articles[0].publish_date - window,
+        article__publish_date__lte=articles[-1].publish_date + window,
+    ).exclude(article_id__in=batch_ids).values_list('bucket', 'article_id')
+
+    index: Dict[int, Set] = {}
+    for bucket, article_id in matches:
+        index.setdefault(bucket, set()).add(article_id)
+
+    fields = ('id', 'minhash', 'is_premium', 'publish_date', 'duplicate_of_id')
+    known = {
+        row.id: row for row in NewsArticle.objects.filter(
+            id__in={article_id for ids in index.values() for article_id in ids}
+        ).only(*fields)
+    }
+    heads = {row.duplicate_of_id for row in known.values() if row.duplicate_of_id} - set(known)
+    known.update((row.id, row) for row in NewsArticle.objects.filter(id__in=heads).only(*fields))
+
+    # article id -> the article it points at; followed to find a cluster's head
+    parent = {row.id: row.duplicate_of_id or row.id for row in known.values()}
+    taken_over = []
+
+    def head_of(article_id):
+        while parent[article_id] != article_id:
+            article_id = parent[article_id]
+        return article_id
+
+    for article in articles:
+        candidates = set()
+        for bucket in buckets[article.id]:
+            candidates |= index.get(bucket, set())
+        candidates = {
+            article_id for article_id in candidates
+            if abs(known[article_id].publish_date - article.publish_date) <= window
+        }
+
+        best, best_score = None, threshold
+        for article_id in candidates:
+            score = similarity(article.minhash, known[article_id].minhash)
+            if score >= best_score:
+                best, best_score = article_id, score
+
+        parent[article.id] = article.id
+        if best is not None:
+            head = head_of(best)
+            if _precedes(article, known[head]):
+                parent[head] = article.id
+                taken_over.append(head)
+            else:
+                parent[article.id] = head
+            stats['clustered'] += 1
+
+        known[article.id] = article
+        for bucket in buckets[article.id]:
+            index.setdefault(bucket, set()).add(article.id)
+
+    attached = []
+    for article in articles:
+        head = head_of(article.id)
+        article.duplicate_of_id = None if head == article.id else head
+        if article.duplicate_of_id:
+            attached.append(article)
+
+    with transaction.atomic():
+        NewsArticleBucket.objects.bulk_create(
+            [NewsArticleBucket(article=article, bucket=bucket) for article in articles for bucket in buckets[article.id]],
+            batch_size=batch_size,
+        )
+        if attached:
+            NewsArticle.objects.bulk_update(attached, ['duplicate_of'], batch_size=batch_size)
+        for old_head in taken_over:
+            if old_head not in batch_ids:
+                NewsArticle.objects.filter(
+                    Q(id=old_head) | Q(duplicate_of_id=old_head)
+                ).update(duplicate_of_id=head_of(old_head))
+
+    return stats
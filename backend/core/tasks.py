@@ -2,16 +2,21 @@
 """
 Celery tasks for automated newsletter generation and data fetching
 """
-from celery import shared_task
+from celery import shared_task, chain, chord, group
+from celery.exceptions import Retry
 from celery.schedules import crontab
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
 
+from .dashboard_stats import bump, refresh_overview
 from .data_fetcher import DataFetcher
 from .generator import NewsletterGeneratorV2
-from core.models import Newsletter, NewsletterAnalytics
+from .rate_limit import throttle_email
+from .tracking import flush_click_buffer, flush_open_buffer, record_click, record_open
+from .utils import iter_keyset_pages
+from core.models import Newsletter, NewsletterAnalytics, SubscriberAnalytics
 
 logger = get_task_logger(__name__)
 
@@ -44,7 +49,7 @@ def fetch_sports_data_task(sports=None, fetch_trending=False):
             
             logger.info(
                 f"Data fetch completed: {total_news} articles, "
-                f"{total_fixtures} fixtures saved"
+                f"{total_fixtures} fixtures saved in {results['timings']['total_seconds']}s"
             )
         
         return {
@@ -89,7 +94,16 @@ def generate_weekly_newsletter_task(refresh_data=True, send_immediately=False):
             )
             
             # Send if requested
-            if send_immediately:
+            if send_immediately and getattr(settings, 'NEWSLETTER_DISTRIBUTED_SEND', False):
+                dispatch = dispatch_distributed_send(newsletter)
+                
+                return {
+                    'status': 'dispatched',
+                    'newsletter_id': str(newsletter.id),
+                    **dispatch,
+                    'timestamp': timezone.now().isoformat()
+                }
+            elif send_immediately:
                 send_results = generator.send_newsletter_to_subscribers(newsletter)
                 logger.info(
                     f"Newsletter sent: {send_results['sent']} successful, "
@@ -128,17 +142,32 @@ def generate_weekly_newsletter_task(refresh_data=True, send_immediately=False):
 
 
 @shared_task(name='newsletter.send_newsletter')
-def send_newsletter_task(newsletter_id):
+def send_newsletter_task(newsletter_id, distributed=None):
     """
     Celery task to send a specific newsletter
     
     Args:
         newsletter_id: ID of newsletter to send
+        distributed: Fan out across workers in chunks
+                     (default: NEWSLETTER_DISTRIBUTED_SEND)
     """
     logger.info(f"Starting newsletter send task for newsletter {newsletter_id}")
     
+    if distributed is None:
+        distributed = getattr(settings, 'NEWSLETTER_DISTRIBUTED_SEND', False)
+    
     try:
         newsletter = Newsletter.objects.get(id=newsletter_id)
+        
+        if distributed:
+            dispatch = dispatch_distributed_send(newsletter)
+            return {
+                'status': 'dispatched',
+                'newsletter_id': str(newsletter_id),
+                **dispatch,
+                'timestamp': timezone.now().isoformat()
+            }
+        
         generator = NewsletterGeneratorV2()
         
         results = generator.send_newsletter_to_subscribers(newsletter)
@@ -172,6 +201,148 @@ def send_newsletter_task(newsletter_id):
         }
 
 
+def dispatch_distributed_send(newsletter, chunk_size=None, max_parallel=None):
+    """
+    Fan a newsletter send out across Celery workers
+    
+    Active subscribers are split into id-range chunks. Chunks are dealt
+    round-robin into at most max_parallel lanes; each lane is a chain that
+    sends its chunks one after another, and a chord callback aggregates
+    the lane totals once every lane has finished.
+    
+    Args:
+        newsletter: Newsletter to send
+        chunk_size: Subscribers per chunk (default: NEWSLETTER_SEND_CHUNK_SIZE)
+        max_parallel: Chunks in flight at once (default: NEWSLETTER_SEND_MAX_PARALLEL)
+    """
+    chunk_size = chunk_size or getattr(settings, 'NEWSLETTER_SEND_CHUNK_SIZE', 1000)
+    max_parallel = max(1, max_parallel or getattr(settings, 'NEWSLETTER_SEND_MAX_PARALLEL', 4))
+    newsletter_id = str(newsletter.id)
+    
+    chunks = NewsletterGeneratorV2().get_subscriber_chunks(chunk_size)
+    
+    if not chunks:
+        logger.info(f"No active subscribers for newsletter {newsletter_id}")
+        finalize_newsletter_send_task.delay([], newsletter_id)
+        return {'chunks': 0, 'lanes': 0}
+    
+    lanes = [chunks[i::max_parallel] for i in range(min(max_parallel, len(chunks)))]
+    
+    # First link starts the running totals; later links receive the
+    # previous link's totals as their first argument
+    lane_chains = [
+        chain(
+            send_newsletter_chunk_task.s(None, newsletter_id, *lane[0]),
+            *[send_newsletter_chunk_task.s(newsletter_id, *pk_range) for pk_range in lane[1:]]
+        )
+        for lane in lanes
+    ]
+    
+    chord(group(lane_chains))(finalize_newsletter_send_task.s(newsletter_id))
+    
+    logger.info(
+        f"Dispatched newsletter {newsletter_id}: {len(chunks)} chunks "
+        f"of up to {chunk_size} across {len(lanes)} lanes"
+    )
+    
+    return {'chunks': len(chunks), 'lanes': len(lanes)}
+
+
+@shared_task(name='newsletter.send_newsletter_chunk')
+def send_newsletter_chunk_task(totals, newsletter_id, first_pk, last_pk):
+    """
+    Celery task to send a newsletter to one id range of subscribers
+    
+    Args:
+        totals: Running totals from the previous chunk in this lane (or None)
+        newsletter_id: ID of newsletter to send
+        first_pk: First subscriber pk in the chunk (inclusive)
+        last_pk: Last subscriber pk in the chunk (inclusive)
+    """
+    totals = dict(totals or {'sent': 0, 'failed': 0, 'chunks': 0, 'errors': 0})
+    logger.info(f"Sending newsletter {newsletter_id} chunk {first_pk}..{last_pk}")
+    
+    try:
+        newsletter = Newsletter.objects.get(id=newsletter_id)
+        generator = NewsletterGeneratorV2()
+        
+        results = generator.send_newsletter_to_subscribers(
+            newsletter,
+            pk_range=(first_pk, last_pk)
+        )
+        
+        totals['sent'] += results['sent']
+        totals['failed'] += results['failed']
+        totals['errors'] += len(results['errors'])
+        
+        logger.info(
+            f"Chunk {first_pk}..{last_pk}: {results['sent']} sent, "
+            f"{results['failed']} failed"
+        )
+        
+    except Exception as e:
+        # Keep the lane going; the chunk is reported as an error
+        logger.error(f"Error in send_newsletter_chunk_task: {e}", exc_info=True)
+        totals['errors'] += 1
+    
+    totals['chunks'] += 1
+    return totals
+
+
+@shared_task(name='newsletter.finalize_newsletter_send')
+def finalize_newsletter_send_task(lane_totals, newsletter_id):
+    """
+    Chord callback aggregating chunk results for a distributed send
+    
+    Args:
+        lane_totals: Totals returned by the last chunk of each lane
+        newsletter_id: ID of the newsletter that was sent
+    """
+    sent = sum(totals.get('sent', 0) for totals in lane_totals if totals)
+    failed = sum(totals.get('failed', 0) for totals in lane_totals if totals)
+    chunks = sum(totals.get('chunks', 0) for totals in lane_totals if totals)
+    
+    logger.info(
+        f"Distributed send of newsletter {newsletter_id} finished: "
+        f"{sent} sent, {failed} failed over {chunks} chunks"
+    )
+    
+    try:
+        newsletter = Newsletter.objects.get(id=newsletter_id)
+        
+        # Metrics come from the delivery rows, which also hold what earlier
+        # (retried or resumed) runs of the chunks sent
+        analytics, created = NewsletterAnalytics.objects.get_or_create(
+            newsletter=newsletter
+        )
+        analytics.calculate_metrics()
+        
+        newsletter.total_subscribers = analytics.total_sent
+        if analytics.total_delivered > 0:
+            if newsletter.status != 'sent':
+                bump('sent_newsletters')
+            newsletter.status = 'sent'
+            newsletter.sent_at = timezone.now()
+        newsletter.save()
+        
+        return {
+            'status': 'success',
+            'newsletter_id': str(newsletter_id),
+            'sent': sent,
+            'failed': failed,
+            'chunks': chunks,
+            'timestamp': timezone.now().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error in finalize_newsletter_send_task: {e}", exc_info=True)
+        return {
+            'status': 'error',
+            'error': str(e),
+            'timestamp': timezone.now().isoformat()
+        }
+
+
 @shared_task(name='newsletter.cleanup_old_data')
 def cleanup_old_data_task(days=30):
     """
@@ -188,6 +359,9 @@ def cleanup_old_data_task(days=30):
         fetcher = DataFetcher()
         results = fetcher.cleanup_old_data(days=days)
         
+        # Bulk deletes send no per-row signals: recount
+        refresh_overview()
+        
         logger.info(
             f"Cleanup completed: {results['deleted_articles']} articles, "
             f"{results['deleted_fixtures']} fixtures deleted"
@@ -233,13 +407,12 @@ def calculate_newsletter_analytics_task(newsletter_id=None):
                 sent_at__gte=cutoff
             )
         
+        # One GROUP BY per page of newsletters
         calculated = 0
-        for newsletter in newsletters:
-            analytics, created = NewsletterAnalytics.objects.get_or_create(
-                newsletter=newsletter
-            )
-            analytics.calculate_metrics()
-            calculated += 1
+        for page in iter_keyset_pages(newsletters, fields=('id',)):
+            calculated += len(NewsletterAnalytics.calculate_for_newsletters(
+                newsletter.id for newsletter in page
+            ))
         
         logger.info(f"Analytics calculated for {calculated} newsletters")
         
@@ -330,20 +503,49 @@ CELERY_BEAT_SCHEDULE = {
         'args': (None,),
     },
     
+    # Update today's subscriber stats every hour
+    'update-subscriber-stats': {
+        'task': 'newsletter.update_subscriber_stats',
+        'schedule': 3600.0,
+    },
+    
+    # Recompute recent daily subscriber stats (1:30 AM)
+    'backfill-subscriber-stats': {
+        'task': 'newsletter.update_subscriber_stats',
+        'schedule': crontab(hour=1, minute=30),
+        'args': (True,),
+    },
+    
+    # Recompute the cached dashboard overview every minute
+    'refresh-dashboard-overview': {
+        'task': 'newsletter.refresh_dashboard_overview',
+        'schedule': 60.0,
+    },
+    
     # Health check every hour
     'health-check': {
         'task': 'newsletter.health_check',
         'schedule': 3600.0,  # 1 hour
     },
+    
+    # Apply buffered email opens and clicks every 30 seconds
+    'flush-tracking-events': {
+        'task': 'newsletter.flush_tracking_events',
+        'schedule': 30.0,
+    },
 }
 
 # Add these tasks to your newsletter/tasks.py file
 
-@shared_task(name='newsletter.send_welcome_email')
-def send_welcome_email(subscriber_id):
+@shared_task(bind=True, name='newsletter.send_welcome_email', max_retries=5)
+def send_welcome_email(self, subscriber_id):
     """
     Send welcome email to new subscriber
     
+    Waits at most TRANSACTIONAL_EMAIL_MAX_WAIT seconds for the shared email
+    rate limit; if it is still exhausted the task is retried later rather
+    than holding the worker.
+    
     Args:
         subscriber_id: ID of the new subscriber
     """
@@ -389,6 +591,9 @@ Unsubscribe: {context['unsubscribe_url']}
             to=[subscriber.email]
         )
         email.attach_alternative(html_content, "text/html")
+        max_wait = getattr(settings, 'TRANSACTIONAL_EMAIL_MAX_WAIT', 10)
+        if not throttle_email(timeout=max_wait):
+            raise self.retry(countdown=max_wait)
         email.send()
         
         logger.info(f"Welcome email sent to {subscriber.email}")
@@ -399,6 +604,8 @@ Unsubscribe: {context['unsubscribe_url']}
             'timestamp': timezone.now().isoformat()
         }
         
+    except Retry:
+        raise
     except Exception as e:
         logger.error(f"Error sending welcome email: {e}", exc_info=True)
         return {
@@ -413,33 +620,48 @@ def track_email_open(delivery_id):
     """
     Track when a newsletter email is opened
     
+    Kept for messages already queued: the open is added to the write-behind
+    buffer like a pixel hit and applied by flush_open_events_task.
+    
     Args:
         delivery_id: ID of the newsletter delivery
     """
-    logger.info(f"Tracking email open for delivery {delivery_id}")
+    buffered = record_open(delivery_id)
+    
+    return {
+        'status': 'success',
+        'delivery_id': str(delivery_id),
+        'buffered': buffered,
+        'timestamp': timezone.now().isoformat()
+    }
+
+
+@shared_task(name='newsletter.update_subscriber_stats')
+def update_subscriber_stats_task(backfill=False):
+    """
+    Precompute daily subscriber statistics
     
+    Args:
+        backfill: Recompute the last SUBSCRIBER_STATS_BACKFILL_DAYS days
+                  instead of just today
+    
+    Schedule: Today every hour, backfill daily (1:30 AM)
+    """
     try:
-        from core.models import NewsletterDelivery
+        today = timezone.now().date()
+        days = getattr(settings, 'SUBSCRIBER_STATS_BACKFILL_DAYS', 90) if backfill else 0
+        rows = SubscriberAnalytics.calculate_range(today - timedelta(days=days), today)
         
-        delivery = NewsletterDelivery.objects.get(id=delivery_id)
-        
-        # Only track first open
-        if not delivery.opened_at:
-            delivery.opened_at = timezone.now()
-            delivery.opened = True
-            delivery.save(update_fields=['opened', 'opened_at'])
-            
-            logger.info(f"Email opened: delivery {delivery_id}")
+        logger.info(f"Subscriber stats updated for {len(rows)} days")
         
         return {
             'status': 'success',
-            'delivery_id': str(delivery_id),
-            'opened_at': delivery.opened_at.isoformat() if delivery.opened_at else None,
+            'days': len(rows),
             'timestamp': timezone.now().isoformat()
         }
         
     except Exception as e:
-        logger.error(f"Error tracking email open: {e}", exc_info=True)
+        logger.error(f"Error in update_subscriber_stats_task: {e}", exc_info=True)
         return {
             'status': 'error',
             'error': str(e),
@@ -447,54 +669,76 @@ def track_email_open(delivery_id):
         }
 
 
-@shared_task(name='newsletter.track_email_click')
-def track_email_click(delivery_id, link_url):
+@shared_task(name='newsletter.refresh_dashboard_overview')
+def refresh_dashboard_overview_task():
     """
-    Track when a link in a newsletter is clicked
+    Recompute the cached dashboard overview
     
-    Args:
-        delivery_id: ID of the newsletter delivery
-        link_url: URL that was clicked
+    Schedule: Every minute (the cached copy expires after DASHBOARD_OVERVIEW_TTL)
     """
-    logger.info(f"Tracking email click for delivery {delivery_id}: {link_url}")
-    
     try:
-        from core.models import NewsletterDelivery
+        document = refresh_overview()
         
-        delivery = NewsletterDelivery.objects.get(id=delivery_id)
-        
-        # Track click
-        if not delivery.clicked_at:
-            delivery.clicked_at = timezone.now()
-            delivery.clicked = True
-            delivery.save(update_fields=['clicked', 'clicked_at'])
-        
-        # Store clicked link in metadata
-        if not delivery.metadata:
-            delivery.metadata = {}
-        
-        if 'clicked_links' not in delivery.metadata:
-            delivery.metadata['clicked_links'] = []
-        
-        delivery.metadata['clicked_links'].append({
-            'url': link_url,
+        return {
+            'status': 'success',
+            'counts': document['counts'],
             'timestamp': timezone.now().isoformat()
-        })
-        delivery.save(update_fields=['metadata'])
+        }
         
-        logger.info(f"Email click tracked: delivery {delivery_id}")
+    except Exception as e:
+        logger.error(f"Error in refresh_dashboard_overview_task: {e}", exc_info=True)
+        return {
+            'status': 'error',
+            'error': str(e),
+            'timestamp': timezone.now().isoformat()
+        }
+
+
+@shared_task(name='newsletter.flush_tracking_events')
+def flush_tracking_events_task():
+    """
+    Apply buffered open and click events with bulk writes
+    
+    Schedule: Every 30 seconds
+    """
+    try:
+        opens = flush_open_buffer()
+        clicks = flush_click_buffer()
         
         return {
             'status': 'success',
-            'delivery_id': str(delivery_id),
-            'link_url': link_url,
+            'opens': opens,
+            'clicks': clicks,
             'timestamp': timezone.now().isoformat()
         }
         
     except Exception as e:
-        logger.error(f"Error tracking email click: {e}", exc_info=True)
+        logger.error(f"Error in flush_tracking_events_task: {e}", exc_info=True)
         return {
             'status': 'error',
             'error': str(e),
             'timestamp': timezone.now().isoformat()
-        }
\ No newline at end of file
+        }
+
+
+@shared_task(name='newsletter.track_email_click')
+def track_email_click(delivery_id, link_url):
+    """
+    Track when a link in a newsletter is clicked
+    
+    Kept for messages already queued: the click is added to the write-behind
+    buffer like a redirect hit and persisted by flush_tracking_events_task.
+    
+    Args:
+        delivery_id: ID of the newsletter delivery
+        link_url: URL that was clicked
+    """
+    buffered = record_click(delivery_id, link_url)
+    
+    return {
+        'status': 'success',
+        'delivery_id': str(delivery_id),
+        'link_url': link_url,
+        'buffered': buffered,
+        'timestamp': timezone.now().isoformat()
+    }
@@ -1,3 +1,1514 @@
-from django.test import TestCase
+import asyncio
+import io
+import re
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest import mock
 
-# Create your tests here.
+import requests
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from . import dashboard_stats
+from .api_news import NewsDataAPI, SportsNewsManager
+from .async_delivery import PERMANENT, SENT, TRANSIENT, UNKNOWN, AsyncDeliveryEngine
+from .data_fetcher import DataFetcher
+from .generator import SUBSCRIBER_TOKEN_PLACEHOLDER, NewsletterGeneratorV2
+from .http_cache import cache_stats, fresh_response, freshness_lifetime, install_http_cache
+from .ingestion import (
+    bulk_ingest_articles, bulk_upsert_fixtures, content_fingerprint, natural_fixture_key, normalize_url,
+)
+from .models import (
+    EmailClickTracking, MatchFixture, Newsletter, NewsletterAnalytics, NewsletterDelivery, NewsletterSubscriber,
+    NewsArticle, SportCategory, SubscriberAnalytics, SubscriptionEvent,
+)
+from .rate_limit import (
+    QuotaCounter, TokenBucket, get_email_rate_limiter, get_provider_quota, get_provider_rate_limiter,
+    retry_after_seconds,
+)
+from .scrape_scheduler import HostScheduler, polite_get, run_concurrently
+from .scrappers import Formula1Scraper, RugbyScraper, SoccerScraper, SportsScrapingManager, TennisScraper
+from .smtp_sink import SMTPSink
+from .story_clusters import NUM_PERM, minhash_signature, similarity
+from .tasks import finalize_newsletter_send_task, send_newsletter_chunk_task, send_welcome_email
+from .tracking import (
+    GAP_GRACE_SECONDS, NO_DELIVERY_ID, EventBuffer, apply_opens, flush_click_buffer, flush_open_buffer,
+    link_placeholder, personalize_links, record_click, record_open, sign_link, tracked_link, unsign_link,
+)
+from .utils import chunked, iter_keyset_pages, iter_pk_chunks
+
+BASE_TIME = datetime(2026, 10, 1, 12, 0, tzinfo=dt_timezone.utc)
+
+
+def published(n):
+    return BASE_TIME + timedelta(minutes=n)
+
+
+class FakeNewsAPI:
+    """NewsData.io /latest over items 1..total (newest first), 10 per page"""
+
+    def __init__(self, total, failing_pages=()):
+        self.total = total
+        self.failing_pages = set(failing_pages)
+        self.pages = []
+
+    def get_latest_news(self, query=None, language='en', category='sports', page=None):
+        offset = int(page or 0)
+        self.pages.append(page)
+        if page in self.failing_pages:
+            return None
+        numbers = range(self.total - offset, max(self.total - offset - 10, 0), -1)
+        results = [{
+            'article_id': f'a{n}',
+            'title': f'Story {n}',
+            'link': f'https://news.example.com/{n}',
+            'pubDate': published(n).strftime('%Y-%m-%d %H:%M:%S'),
+        } for n in numbers]
+        next_page = str(offset + 10) if offset + 10 < self.total else None
+        return {'status': 'success', 'results': results, 'nextPage': next_page}
+
+
+class IncrementalNewsTests(SimpleTestCase):
+    def setUp(self):
+        self.manager = SportsNewsManager()
+        self.manager.queries_for = lambda sport: ['rugby']
+
+    def run_query(self, api, mark=None):
+        self.manager.api = api
+        articles, marks = self.manager.get_new_sport_news('rugby', {'rugby': mark} if mark else {})
+        return sorted(int(a['title'].split()[1]) for a in articles), marks.get('rugby')
+
+    def mark_at(self, n, **extra):
+        return {'last_published_at': published(n), 'last_item_ids': [f'a{n}'], **extra}
+
+    def test_reads_only_articles_above_the_watermark(self):
+        numbers, mark = self.run_query(FakeNewsAPI(100), self.mark_at(75))
+
+        self.assertEqual(numbers, list(range(76, 101)))
+        self.assertEqual(mark['last_published_at'], published(100))
+        self.assertEqual(mark['last_item_ids'], ['a100'])
+        self.assertEqual(mark['page_token'], '')
+        self.assertIsNone(mark['backlog_until'])
+
+    def test_first_run_reads_one_page(self):
+        api = FakeNewsAPI(100)
+        numbers, mark = self.run_query(api)
+
+        self.assertEqual(numbers, list(range(91, 101)))
+        self.assertEqual(api.pages, [None])
+        self.assertEqual(mark['last_published_at'], published(100))
+
+    def test_page_cap_leaves_a_backlog_the_next_run_finishes(self):
+        numbers, mark = self.run_query(FakeNewsAPI(100), self.mark_at(60))
+
+        self.assertEqual(numbers, list(range(71, 101)))
+        self.assertEqual(mark['page_token'], '30')
+        self.assertEqual(mark['backlog_until'], published(60))
+
+        numbers, mark = self.run_query(FakeNewsAPI(100), mark)
+
+        self.assertEqual(numbers, list(range(61, 71)))
+        self.assertEqual(mark['last_published_at'], published(100))
+        self.assertEqual(mark['page_token'], '')
+        self.assertIsNone(mark['backlog_until'])
+
+    def test_failed_page_keeps_the_rest_as_backlog(self):
+        numbers, mark = self.run_query(FakeNewsAPI(100, failing_pages={'10'}), self.mark_at(70))
+
+        self.assertEqual(numbers, list(range(91, 101)))
+        self.assertEqual(mark['last_published_at'], published(100))
+        self.assertEqual(mark['page_token'], '10')
+        self.assertEqual(mark['backlog_until'], published(70))
+
+        numbers, mark = self.run_query(FakeNewsAPI(100), mark)
+
+        self.assertEqual(numbers, list(range(71, 91)))
+        self.assertEqual(mark['page_token'], '30')  # Pages ran out just before the floor
+
+        numbers, mark = self.run_query(FakeNewsAPI(100), mark)
+
+        self.assertEqual(numbers, [])
+        self.assertEqual(mark['page_token'], '')
+        self.assertIsNone(mark['backlog_until'])
+
+    def test_failed_first_page_leaves_the_watermark(self):
+        numbers, mark = self.run_query(FakeNewsAPI(100, failing_pages={None}), self.mark_at(70))
+
+        self.assertEqual(numbers, [])
+        self.assertIsNone(mark)
+
+    def test_failed_backlog_read_keeps_the_backlog(self):
+        backlog = self.mark_at(100, page_token='30', backlog_until=published(60))
+        numbers, mark = self.run_query(FakeNewsAPI(100, failing_pages={'30'}), backlog)
+
+        self.assertEqual(numbers, [])
+        self.assertEqual(mark['last_published_at'], published(100))
+        self.assertEqual(mark['page_token'], '30')
+        self.assertEqual(mark['backlog_until'], published(60))
+
+
+STORY_SUMMARY = "Novak Djokovic lost in four sets to the world number 40 on Centre Court on Tuesday."
+
+
+class MinHashTests(SimpleTestCase):
+    def test_signature_is_compact_and_stable(self):
+        signature = minhash_signature("Djokovic knocked out of Wimbledon", STORY_SUMMARY)
+
+        self.assertEqual(len(signature), NUM_PERM * 4)
+        self.assertEqual(signature, minhash_signature("Djokovic knocked out of Wimbledon", STORY_SUMMARY))
+        self.assertEqual(similarity(signature, signature), 1.0)
+
+    def test_no_signature_without_words(self):
+        self.assertIsNone(minhash_signature("", ""))
+        self.assertIsNone(minhash_signature("The and of", ""))
+
+    def test_rewrites_are_similar_and_other_stories_are_not(self):
+        original = minhash_signature("Djokovic knocked out of Wimbledon", STORY_SUMMARY)
+        rewrite = minhash_signature("Djokovic knocked out of Wimbledon in shock defeat", STORY_SUMMARY)
+        other = minhash_signature(
+            "Verstappen takes pole in Monaco", "Max Verstappen edged Charles Leclerc in qualifying on Saturday."
+        )
+
+        self.assertGreaterEqual(similarity(original, rewrite), 0.5)
+        self.assertLess(similarity(original, other), 0.2)
+        self.assertEqual(similarity(original, None), 0.0)
+
+
+@override_settings(NEAR_DUPLICATE_THRESHOLD=0.5, NEAR_DUPLICATE_WINDOW_DAYS=3)
+class StoryClusterTests(TestCase):
+    def setUp(self):
+        self.category = SportCategory.objects.create(name='tennis', display_name='Tennis')
+
+    def article(self, title, source, minutes, premium=False, summary=STORY_SUMMARY):
+        return {
+            'title': title,
+            'summary': summary,
+            'source_url': f'https://{source}/{minutes}',
+            'source_name': source,
+            'is_premium': premium,
+            'publish_date': published(minutes),
+        }
+
+    def ingest(self, *articles):
+        return bulk_ingest_articles(list(articles), self.category)
+
+    def heads(self):
+        return {
+            a.source_name: (a.duplicate_of.source_name if a.duplicate_of_id else None)
+            for a in NewsArticle.objects.select_related('duplicate_of')
+        }
+
+    def test_copies_join_the_earliest_article(self):
+        self.ingest(self.article("Djokovic knocked out of Wimbledon", 'a.com', 0))
+        stats = self.ingest(
+            self.article("Djokovic knocked out of Wimbledon in shock defeat", 'b.com', 30),
+            self.article("Verstappen takes pole in Monaco", 'c.com', 40,
+                         summary="Max Verstappen edged Charles Leclerc in qualifying on Saturday."),
+        )
+
+        self.assertEqual(stats['near_duplicates'], 1)
+        self.assertEqual(self.heads(), {'a.com': None, 'b.com': 'a.com', 'c.com': None})
+
+    def test_premium_source_takes_over_an_existing_cluster(self):
+        self.ingest(self.article("Djokovic knocked out of Wimbledon", 'a.com', 0))
+        self.ingest(self.article("Djokovic knocked out of Wimbledon!", 'b.com', 10))
+        self.ingest(self.article("Djokovic out of Wimbledon in shock defeat", 'atp.com', 60, premium=True))
+
+        self.assertEqual(self.heads(), {'a.com': 'atp.com', 'b.com': 'atp.com', 'atp.com': None})
+
+    def test_heads_chain_within_a_batch(self):
+        self.ingest(self.article("Djokovic knocked out of Wimbledon", 'a.com', 0))
+        stats = self.ingest(
+            self.article("Djokovic knocked out of Wimbledon in shock defeat", 'b.com', 10),
+            self.article("Djokovic out of Wimbledon in shock defeat", 'atp.com', 20, premium=True),
+            self.article("Djokovic stunned at Wimbledon", 'c.com', 30),
+        )
+
+        self.assertEqual(stats['near_duplicates'], 3)
+        self.assertEqual(
+            self.heads(),
+            {'a.com': 'atp.com', 'b.com': 'atp.com', 'atp.com': None, 'c.com': 'atp.com'}
+        )
+
+    def test_articles_outside_the_window_are_not_compared(self):
+        self.ingest(self.article("Djokovic knocked out of Wimbledon", 'a.com', 0))
+        stats = self.ingest(
+            self.article("Djokovic knocked out of Wimbledon in shock defeat", 'b.com', 4 * 24 * 60)
+        )
+
+        self.assertEqual(stats['near_duplicates'], 0)
+        self.assertEqual(self.heads(), {'a.com': None, 'b.com': None})
+
+
+def sink_settings(sink, **extra):
+    """Mail settings that send everything to an SMTPSink"""
+    return override_settings(
+        EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+        EMAIL_HOST=sink.host,
+        EMAIL_PORT=sink.port,
+        EMAIL_USE_TLS=False,
+        EMAIL_USE_SSL=False,
+        EMAIL_HOST_USER='',
+        EMAIL_HOST_PASSWORD='',
+        NEWSLETTER_RATE_LIMIT_ENABLED=False,
+        **extra
+    )
+
+
+class RecordingQueue(asyncio.Queue):
+    """asyncio.Queue that remembers the most messages it ever held"""
+
+    peak = 0
+
+    def put_nowait(self, item):
+        super().put_nowait(item)
+        RecordingQueue.peak = max(RecordingQueue.peak, self.qsize())
+
+
+class AsyncDeliveryEngineTests(SimpleTestCase):
+    def setUp(self):
+        self.sink = SMTPSink()
+        self.sink.start()
+        self.addCleanup(self.sink.stop)
+
+    def engine(self, **options):
+        def connection():
+            return get_connection(
+                'django.core.mail.backends.smtp.EmailBackend', host=self.sink.host, port=self.sink.port,
+                use_tls=False, use_ssl=False, username='', password='', timeout=5
+            )
+        return AsyncDeliveryEngine(connection_factory=connection, **options)
+
+    def messages(self, *addresses):
+        return [EmailMessage('Weekly roundup', 'Scores', 'news@example.com', [a]) for a in addresses]
+
+    def test_rejects_are_permanent_and_defers_are_retried(self):
+        outcomes = self.engine(concurrency=2, retries=1).deliver(
+            self.messages('fan@example.com', 'gone+reject@example.com', 'busy+defer@example.com')
+        )
+
+        self.assertEqual([o['status'] for o in outcomes], [SENT, PERMANENT, TRANSIENT])
+        self.assertEqual([o['attempts'] for o in outcomes], [1, 1, 2])
+        self.assertEqual(self.sink.stats['rejected'], 1)
+        self.assertEqual(self.sink.stats['deferred'], 2)
+        self.assertEqual(self.sink.stats['messages'], 1)
+
+    def test_timed_out_send_is_unknown_and_not_retried(self):
+        self.sink.latency = 0.5
+        outcomes = self.engine(concurrency=1, retries=2, timeout=0.2).deliver(self.messages('fan@example.com'))
+
+        self.assertEqual(outcomes[0]['status'], UNKNOWN)
+        self.assertEqual(outcomes[0]['attempts'], 1)
+
+    def test_queue_never_holds_more_than_its_bound(self):
+        self.sink.latency = 0.01
+        RecordingQueue.peak = 0
+        addresses = [f'fan{i}@example.com' for i in range(30)]
+
+        with mock.patch('core.async_delivery.asyncio.Queue', RecordingQueue):
+            outcomes = self.engine(concurrency=2, queue_size=3).deliver(self.messages(*addresses))
+
+        self.assertEqual([o['status'] for o in outcomes], [SENT] * 30)
+        self.assertEqual(RecordingQueue.peak, 3)
+        self.assertEqual(self.sink.stats['messages'], 30)
+        self.assertLessEqual(self.sink.stats['connections'], 2)
+
+
+class NewsletterSendTestCase(TestCase):
+    def setUp(self):
+        self.newsletter = Newsletter.objects.create(title='Weekly roundup', edition_date=date(2026, 10, 1))
+
+    def subscribe(self, *emails, **preferences):
+        return [
+            NewsletterSubscriber.objects.create(email=email, name='Fan', preferences=preferences)
+            for email in emails
+        ]
+
+    def statuses(self):
+        return dict(NewsletterDelivery.objects.values_list('subscriber__email', 'status'))
+
+
+class BatchedSendTests(NewsletterSendTestCase):
+    def test_each_batch_shares_one_connection(self):
+        self.subscribe(*[f'fan{i}@example.com' for i in range(5)])
+
+        with SMTPSink() as sink, sink_settings(sink):
+            results = NewsletterGeneratorV2().send_newsletter_to_subscribers(
+                self.newsletter, batch_size=2, engine='sync'
+            )
+
+        self.assertEqual(results['sent'], 5)
+        self.assertEqual([batch['size'] for batch in results['batches']], [2, 2, 1])
+        self.assertEqual(sink.stats['connections'], 3)
+        self.assertEqual(sink.stats['messages'], 5)
+
+
+@override_settings(NEWSLETTER_RATE_LIMIT_ENABLED=False, SITE_URL='https://obsidian.example.com')
+class SegmentRenderTests(NewsletterSendTestCase):
+    def setUp(self):
+        super().setUp()
+        for sport in ('rugby', 'tennis'):
+            category = SportCategory.objects.create(name=sport, display_name=sport.title())
+            self.newsletter.articles.add(NewsArticle.objects.create(
+                title=f'{sport.title()} story', summary='Report', sport_category=category,
+                source_url=f'https://news.example.com/{sport}', publish_date=BASE_TIME, is_featured=True,
+            ))
+
+    def test_each_segment_is_rendered_once_and_personalized_per_subscriber(self):
+        self.subscribe('a@example.com', 'b@example.com', sports=['rugby'])
+        self.subscribe('c@example.com', sports=['Rugby '])
+        self.subscribe('d@example.com', sports=['tennis'])
+        self.subscribe('e@example.com')
+        mail.outbox = []
+        generator = NewsletterGeneratorV2()
+
+        with mock.patch.object(generator, 'render_segment', wraps=generator.render_segment) as render:
+            results = generator.send_newsletter_to_subscribers(self.newsletter, engine='sync')
+
+        self.assertEqual(results['sent'], 5)
+        self.assertEqual(render.call_count, 3)
+        self.assertEqual(results['segments'], 3)
+
+        deliveries = {d.subscriber.email: d for d in NewsletterDelivery.objects.select_related('subscriber')}
+        for message in mail.outbox:
+            delivery = deliveries[message.to[0]]
+            self.assertIn(str(delivery.subscriber.unsubscribe_token), message.body)
+            self.assertNotIn(SUBSCRIBER_TOKEN_PLACEHOLDER, message.body)
+            self.assertNotIn('__TRACKED_LINK', message.body)
+            self.assertIn(f'/newsletter/track/click/{delivery.id}/', message.body)
+
+        rugby_only = next(m for m in mail.outbox if m.to == ['c@example.com'])
+        self.assertIn('Rugby story', rugby_only.body)
+        self.assertNotIn('Tennis story', rugby_only.body)
+
+
+@override_settings(NEWSLETTER_RATE_LIMIT_ENABLED=False)
+class DeliveryWriteTests(NewsletterSendTestCase):
+    def send(self, newsletter):
+        with CaptureQueriesContext(connection) as queries:
+            results = NewsletterGeneratorV2().send_newsletter_to_subscribers(newsletter, batch_size=50)
+        return results, len(queries.captured_queries)
+
+    def test_queries_do_not_grow_with_the_page(self):
+        self.subscribe(*[f'fan{i}@example.com' for i in range(3)])
+        small, small_queries = self.send(self.newsletter)
+
+        self.subscribe(*[f'fan{i}@example.com' for i in range(3, 12)])
+        second = Newsletter.objects.create(title='Midweek roundup', edition_date=date(2026, 10, 4))
+        large, large_queries = self.send(second)
+
+        self.assertEqual((small['sent'], large['sent']), (3, 12))
+        self.assertEqual(small_queries, large_queries)
+        self.assertEqual(NewsletterDelivery.objects.filter(newsletter=second, status='sent').count(), 12)
+
+
+@override_settings(NEWSLETTER_RATE_LIMIT_ENABLED=False)
+class ResumableSendTests(NewsletterSendTestCase):
+    def send(self):
+        return NewsletterGeneratorV2().send_newsletter_to_subscribers(self.newsletter, batch_size=2)
+
+    def test_interrupted_send_resumes_without_resending(self):
+        subscribers = self.subscribe(*[f'fan{i}@example.com' for i in range(6)])
+        mail.outbox = []
+        send_batch = NewsletterGeneratorV2._send_batch
+        calls = []
+
+        def relay_drops_on_second_batch(generator, *args, **kwargs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise ConnectionError('relay went away')
+            return send_batch(generator, *args, **kwargs)
+
+        with mock.patch.object(NewsletterGeneratorV2, '_send_batch', relay_drops_on_second_batch):
+            first = self.send()
+
+        run = self.newsletter.send_runs.get()
+        self.assertEqual((first['sent'], run.status, run.sent_count), (2, 'failed', 2))
+        self.assertEqual(sorted(self.statuses().values()), ['pending'] * 4 + ['sent'] * 2)
+
+        second = self.send()
+
+        run.refresh_from_db()
+        self.assertEqual(second['sent'], 4)
+        self.assertIsNotNone(second['resumed_from'])
+        self.assertEqual((run.status, run.sent_count, run.attempts), ('completed', 6, 2))
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), sorted(s.email for s in subscribers))
+
+        self.assertEqual(self.send()['sent'], 0)
+        self.assertEqual(len(mail.outbox), 6)
+
+    def test_rows_no_longer_pending_are_skipped(self):
+        first, second = self.subscribe('fan0@example.com', 'fan1@example.com')
+        NewsletterDelivery.objects.create(newsletter=self.newsletter, subscriber=second, status='sending')
+        mail.outbox = []
+
+        results = self.send()
+
+        self.assertEqual((results['sent'], results['skipped']), (1, 1))
+        self.assertEqual([m.to for m in mail.outbox], [[first.email]])
+
+    def test_test_mode_needs_a_test_email(self):
+        with self.assertRaises(ValueError):
+            NewsletterGeneratorV2().send_newsletter_to_subscribers(self.newsletter, test_mode=True)
+
+
+class KeysetPagingTests(NewsletterSendTestCase):
+    def test_pages_walk_the_table_in_pk_order(self):
+        subscribers = self.subscribe(*[f'fan{i}@example.com' for i in range(5)])
+
+        with CaptureQueriesContext(connection) as queries:
+            pages = list(iter_keyset_pages(NewsletterSubscriber.objects.all(), 2, fields=('id', 'email')))
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual([s.pk for page in pages for s in page], sorted(s.pk for s in subscribers))
+        self.assertEqual(len(queries.captured_queries), 3)
+        self.assertIn('status', pages[0][0].get_deferred_fields())
+
+    def test_rows_removed_between_pages_are_skipped(self):
+        self.subscribe(*[f'fan{i}@example.com' for i in range(4)])
+        ordered = sorted(NewsletterSubscriber.objects.values_list('pk', flat=True))
+        seen = []
+
+        for page in iter_keyset_pages(NewsletterSubscriber.objects.filter(status='active'), 2):
+            seen.extend(s.pk for s in page)
+            NewsletterSubscriber.objects.filter(pk=ordered[2]).update(status='inactive')
+
+        self.assertEqual(seen, [ordered[0], ordered[1], ordered[3]])
+
+    def test_pk_chunks_and_chunked(self):
+        self.subscribe(*[f'fan{i}@example.com' for i in range(3)])
+
+        chunks = list(iter_pk_chunks(NewsletterSubscriber.objects.all(), 2))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        self.assertEqual(list(chunked(range(5), 2)), [[0, 1], [2, 3], [4]])
+
+    @override_settings(NEWSLETTER_RATE_LIMIT_ENABLED=False, NEWSLETTER_DELIVERY_FLUSH_SIZE=2)
+    def test_send_streams_every_page(self):
+        subscribers = self.subscribe(*[f'fan{i}@example.com' for i in range(5)])
+        mail.outbox = []
+
+        results = NewsletterGeneratorV2().send_newsletter_to_subscribers(self.newsletter, batch_size=1)
+
+        self.assertEqual(results['sent'], 5)
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), sorted(s.email for s in subscribers))
+        run = self.newsletter.send_runs.get()
+        self.assertEqual(run.last_subscriber_id, max(s.pk for s in subscribers))
+
+
+class AsyncNewsletterSendTests(NewsletterSendTestCase):
+    def test_delivery_rows_record_each_outcome(self):
+        self.subscribe('fan@example.com', 'gone+reject@example.com', 'busy+defer@example.com')
+
+        with SMTPSink() as sink, sink_settings(sink, NEWSLETTER_ASYNC_RETRIES=0):
+            results = NewsletterGeneratorV2().send_newsletter_to_subscribers(self.newsletter, engine='async')
+
+        self.assertEqual(self.statuses(), {
+            'fan@example.com': 'sent',
+            'gone+reject@example.com': 'bounced',
+            'busy+defer@example.com': 'failed',
+        })
+        self.assertEqual((results['sent'], results['failed']), (1, 2))
+        self.assertEqual(sink.stats['messages'], 1)
+
+
+class ArticleIngestionTests(TestCase):
+    def setUp(self):
+        self.category = SportCategory.objects.create(name='rugby', display_name='Rugby')
+
+    def article(self, n, url=None):
+        return {'title': f'Story {n}', 'source_url': url or f'https://news.example.com/{n}', 'summary': f'Report {n}'}
+
+    def test_fingerprint_ignores_tracking_and_formatting(self):
+        self.assertEqual(
+            normalize_url('https://www.News.example.com/story/?utm_source=x&b=2&a=1#top'),
+            '//news.example.com/story?a=1&b=2'
+        )
+        self.assertEqual(
+            content_fingerprint('Lions win!', 'https://news.example.com/lions?fbclid=1'),
+            content_fingerprint('  lions WIN ', 'http://www.news.example.com/lions/')
+        )
+
+    def test_duplicates_are_skipped_within_and_across_batches(self):
+        stats = bulk_ingest_articles([
+            self.article(1), self.article(2), self.article(1, 'https://news.example.com/1?utm_medium=rss'),
+            {'title': '', 'source_url': 'https://news.example.com/blank'},
+        ], self.category)
+
+        self.assertEqual(
+            (stats['received'], stats['inserted'], stats['duplicates'], stats['invalid']), (4, 2, 1, 1)
+        )
+
+        stats = bulk_ingest_articles([self.article(2), self.article(3)], self.category)
+
+        self.assertEqual((stats['inserted'], stats['duplicates']), (1, 1))
+        self.assertEqual(NewsArticle.objects.count(), 3)
+
+    def test_queries_do_not_grow_with_the_batch(self):
+        def ingest(numbers):
+            # Unrelated titles, so clustering finds no candidates either
+            articles = [
+                {'title': f'{uuid.uuid4().hex} {uuid.uuid4().hex}', 'source_url': f'https://news.example.com/{n}'}
+                for n in numbers
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(bulk_ingest_articles(articles, self.category)['inserted'], len(articles))
+            return len(queries.captured_queries)
+
+        self.assertEqual(ingest(range(0, 3)), ingest(range(3, 30)))
+
+    def test_overlong_urls_do_not_fail_the_batch(self):
+        long_url = 'https://news.example.com/' + 'x' * 200
+        stats = bulk_ingest_articles([
+            {'title': 'Long links', 'source_url': 'https://news.example.com/1', 'link': long_url, 'image_url': long_url},
+            {'title': 'Long source', 'source_url': long_url},
+            {'title': 'Plain', 'source_url': 'https://news.example.com/3'},
+        ], self.category, image_url='https://cdn.example.com/default.jpg')
+
+        self.assertEqual((stats['inserted'], stats['invalid']), (2, 1))
+        article = NewsArticle.objects.get(title='Long links')
+        self.assertIsNone(article.link_url)
+        self.assertEqual(article.image_url, 'https://cdn.example.com/default.jpg')
+        self.assertFalse(NewsArticle.objects.filter(title='Long source').exists())
+
+
+class FixtureUpsertTests(TestCase):
+    def setUp(self):
+        self.category = SportCategory.objects.create(name='rugby', display_name='Rugby')
+
+    def fixture(self, home='Lions', away='Sharks', **extra):
+        return {'home_team': home, 'away_team': away, 'match_date': BASE_TIME, 'venue': 'Ellis Park', **extra}
+
+    def test_only_new_and_changed_fixtures_are_written(self):
+        stats = bulk_upsert_fixtures([
+            self.fixture(external_id='101'), self.fixture('Bulls', 'Stormers', external_id='102'),
+        ], self.category)
+        self.assertEqual((stats['created'], stats['updated'], stats['unchanged']), (2, 0, 0))
+
+        with CaptureQueriesContext(connection) as queries:
+            stats = bulk_upsert_fixtures([
+                self.fixture(external_id='101'),
+                self.fixture('Bulls', 'Stormers', external_id='102', status='finished', home_score=24, away_score=17),
+            ], self.category)
+
+        self.assertEqual((stats['created'], stats['updated'], stats['unchanged']), (0, 1, 1))
+        self.assertEqual(MatchFixture.objects.count(), 2)
+        finished = MatchFixture.objects.get(external_id='102')
+        self.assertEqual((finished.status, finished.home_score, finished.away_score), ('finished', 24, 17))
+        # One lookup and one upsert, wrapped in a savepoint
+        self.assertEqual(len(queries.captured_queries), 4)
+
+    def test_repeat_run_writes_nothing(self):
+        bulk_upsert_fixtures([self.fixture()], self.category)
+
+        with CaptureQueriesContext(connection) as queries:
+            stats = bulk_upsert_fixtures([self.fixture()], self.category)
+
+        self.assertEqual((stats['created'], stats['unchanged']), (0, 1))
+        self.assertFalse(any(
+            query['sql'].startswith(('INSERT', 'UPDATE')) for query in queries.captured_queries
+        ))
+
+    def test_natural_key_row_is_rekeyed_to_the_provider_id(self):
+        bulk_upsert_fixtures([self.fixture()], self.category)
+        stored = MatchFixture.objects.get()
+        self.assertEqual(
+            stored.external_id, natural_fixture_key('rugby', 'Lions', 'Sharks', BASE_TIME)
+        )
+
+        stats = bulk_upsert_fixtures([self.fixture(external_id='555', status='live')], self.category)
+
+        self.assertEqual((stats['created'], stats['updated']), (0, 1))
+        rekeyed = MatchFixture.objects.get()
+        self.assertEqual((rekeyed.id, rekeyed.external_id, rekeyed.status), (stored.id, '555', 'live'))
+
+    def test_invalid_fixture_is_counted_and_skipped(self):
+        stats = bulk_upsert_fixtures([{'home_team': 'Lions'}, self.fixture()], self.category)
+
+        self.assertEqual((stats['received'], stats['created'], stats['invalid']), (2, 1, 1))
+
+@override_settings(NEWSLETTER_RATE_LIMIT_ENABLED=False)
+class DistributedSendTests(NewsletterSendTestCase):
+    def test_chunks_cover_every_active_subscriber_once(self):
+        subscribers = self.subscribe(*[f'fan{i}@example.com' for i in range(5)])
+        self.subscribe('gone@example.com')[0].set_status('unsubscribed')
+        mail.outbox = []
+
+        chunks = NewsletterGeneratorV2().get_subscriber_chunks(2)
+        totals = None
+        for first_pk, last_pk in chunks:
+            totals = send_newsletter_chunk_task(totals, str(self.newsletter.id), first_pk, last_pk)
+        finalize_newsletter_send_task([totals], str(self.newsletter.id))
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(sorted(str(s.pk) for s in subscribers)[0], chunks[0][0])
+        self.assertEqual((totals['sent'], totals['chunks']), (5, 3))
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), sorted(s.email for s in subscribers))
+        self.assertEqual(set(self.newsletter.send_runs.values_list('status', flat=True)), {'completed'})
+        self.newsletter.refresh_from_db()
+        self.assertEqual(self.newsletter.status, 'sent')
+
+
+class NewsletterAnalyticsTests(NewsletterSendTestCase):
+    def per_row_counts(self, newsletter):
+        deliveries = NewsletterDelivery.objects.filter(newsletter=newsletter)
+        return {
+            'total_sent': deliveries.filter(status__in=['sent', 'failed', 'bounced']).count(),
+            'total_delivered': deliveries.filter(status='sent').count(),
+            'total_opened': deliveries.filter(opened_at__isnull=False).count(),
+            'total_failed': deliveries.filter(status='failed').count(),
+            'total_bounced': deliveries.filter(status='bounced').count(),
+            'total_clicked': deliveries.filter(click_count__gt=0).count(),
+        }
+
+    def deliver(self, newsletter, rows):
+        for i, (status, opened, clicks) in enumerate(rows):
+            subscriber, = self.subscribe(f'{newsletter.pk}-{i}@example.com')
+            NewsletterDelivery.objects.create(
+                newsletter=newsletter, subscriber=subscriber, status=status,
+                opened_at=BASE_TIME if opened else None, click_count=clicks,
+            )
+
+    def metrics(self, analytics):
+        return {field: getattr(analytics, field) for field in NewsletterAnalytics.delivery_aggregates()}
+
+    def test_one_query_matches_the_per_row_counts(self):
+        self.deliver(self.newsletter, [
+            ('sent', True, 2), ('sent', True, 0), ('sent', False, 0), ('failed', False, 0),
+            ('bounced', False, 0), ('pending', False, 0),
+        ])
+        analytics = NewsletterAnalytics.objects.create(newsletter=self.newsletter)
+
+        with self.assertNumQueries(2):
+            analytics.calculate_metrics()
+
+        self.assertEqual(self.metrics(analytics), self.per_row_counts(self.newsletter))
+        self.assertEqual((analytics.delivery_rate, analytics.bounce_rate), (60.0, 20.0))
+        self.assertAlmostEqual(analytics.open_rate, 200 / 3)
+        self.assertAlmostEqual(analytics.click_rate, 100 / 3)
+
+    def test_many_newsletters_at_once_match_one_at_a_time(self):
+        others = [
+            Newsletter.objects.create(title=f'Edition {n}', edition_date=date(2026, 10, n)) for n in (2, 3)
+        ]
+        self.deliver(self.newsletter, [('sent', True, 1), ('failed', False, 0)])
+        self.deliver(others[0], [('bounced', False, 0), ('sent', False, 0), ('sent', True, 0)])
+        NewsletterAnalytics.objects.create(newsletter=others[0], total_sent=99)
+        ids = [self.newsletter.pk] + [n.pk for n in others]
+
+        # Read counts and rows, then one insert and one update (in a savepoint here)
+        with self.assertNumQueries(6):
+            results = NewsletterAnalytics.calculate_for_newsletters(ids)
+
+        for newsletter_id in ids:
+            self.assertEqual(self.metrics(results[newsletter_id]), self.per_row_counts(newsletter_id))
+            stored = NewsletterAnalytics.objects.get(newsletter_id=newsletter_id)
+            self.assertEqual(self.metrics(stored), self.per_row_counts(newsletter_id))
+        self.assertEqual(results[others[1].pk].delivery_rate, 0.0)
+        self.assertEqual(NewsletterAnalytics.calculate_for_newsletters([]), {})
+
+
+class SubscriptionEventTests(TestCase):
+    def subscribe(self, email):
+        response = self.client.post('/api/newsletter/subscribe/', {'email': email, 'name': 'Fan'})
+        self.assertEqual(response.status_code, 201)
+        return NewsletterSubscriber.objects.get(email=email)
+
+    def events(self):
+        return sorted(SubscriptionEvent.objects.values_list('from_status', 'to_status', 'source'))
+
+    def test_subscribe_and_unsubscribe_are_logged(self):
+        subscriber = self.subscribe('fan@example.com')
+
+        response = self.client.post('/api/newsletter/unsubscribe/', {'token': str(subscriber.unsubscribe_token)})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.events(), [('', 'active', 'subscribe'), ('active', 'unsubscribed', 'unsubscribe')])
+        subscriber.refresh_from_db()
+        self.assertTrue(subscriber.set_status('active', source='dashboard'))
+        self.assertFalse(subscriber.set_status('active', source='dashboard'))
+        self.assertEqual(SubscriptionEvent.objects.count(), 3)
+
+    def test_bulk_changes_log_one_event_per_subscriber_changed(self):
+        for email in ('a@example.com', 'b@example.com', 'c@example.com'):
+            self.subscribe(email)
+        NewsletterSubscriber.objects.get(email='c@example.com').set_status('inactive')
+        SubscriptionEvent.objects.all().delete()
+
+        changed = SubscriptionEvent.change_status(NewsletterSubscriber.objects.all(), 'inactive', source='bulk_action')
+        deleted = SubscriptionEvent.change_status(
+            NewsletterSubscriber.objects.filter(email='a@example.com'), SubscriptionEvent.DELETED
+        )
+
+        self.assertEqual((changed, deleted), (2, 1))
+        self.assertEqual(self.events(), [
+            ('active', 'inactive', 'bulk_action'), ('active', 'inactive', 'bulk_action'), ('inactive', 'deleted', ''),
+        ])
+        self.assertFalse(NewsletterSubscriber.objects.filter(email='a@example.com').exists())
+        self.assertEqual(SubscriptionEvent.objects.filter(to_status='deleted', subscriber__isnull=True).count(), 1)
+
+    def test_summary_counts_growth_and_churn_per_day(self):
+        for email in ('a@example.com', 'b@example.com', 'c@example.com'):
+            self.subscribe(email)
+        NewsletterSubscriber.objects.get(email='a@example.com').set_status('unsubscribed')
+        SubscriptionEvent.objects.filter(to_status='unsubscribed').update(created_at=BASE_TIME + timedelta(days=1))
+        SubscriptionEvent.objects.exclude(to_status='unsubscribed').update(created_at=BASE_TIME)
+
+        summary = SubscriptionEvent.summarize(BASE_TIME.date(), BASE_TIME.date() + timedelta(days=7))
+
+        self.assertEqual(summary, [
+            {'period': BASE_TIME.date(), 'subscribed': 3, 'unsubscribed': 0, 'gained': 3, 'lost': 0, 'net_growth': 3},
+            {'period': BASE_TIME.date() + timedelta(days=1), 'subscribed': 0, 'unsubscribed': 1, 'gained': 0,
+             'lost': 1, 'net_growth': -1},
+        ])
+
+
+class SubscriberAnalyticsTests(TestCase):
+    def setUp(self):
+        for i, day in enumerate([1, 1, 2, 3, 3, 4]):
+            subscriber = NewsletterSubscriber.objects.create(email=f'fan{i}@example.com', name='Fan')
+            NewsletterSubscriber.objects.filter(pk=subscriber.pk).update(subscription_date=BASE_TIME.replace(day=day))
+        for email, day in (('fan0@example.com', 3), ('fan3@example.com', 4)):
+            NewsletterSubscriber.objects.get(email=email).set_status('unsubscribed', source='unsubscribe')
+            SubscriptionEvent.objects.filter(subscriber__email=email).update(created_at=BASE_TIME.replace(day=day))
+
+    def per_day(self, day):
+        subscribers = NewsletterSubscriber.objects.filter(subscription_date__date__lte=day)
+        total = subscribers.count()
+        previous = NewsletterSubscriber.objects.filter(subscription_date__date__lt=day).count()
+        return {
+            'total_subscribers': total,
+            'new_subscriptions': NewsletterSubscriber.objects.filter(subscription_date__date=day).count(),
+            'unsubscriptions': SubscriptionEvent.objects.filter(to_status='unsubscribed', created_at__date=day).count(),
+            'active_subscribers': subscribers.filter(status='active').count(),
+            'growth_rate': (total - previous) / previous * 100 if previous else 0.0,
+        }
+
+    def test_range_matches_day_by_day_counts(self):
+        start, end = date(2026, 10, 1), date(2026, 10, 5)
+
+        # Three reads of counts, the stored rows, one insert (in a savepoint here)
+        with self.assertNumQueries(7):
+            rows = SubscriberAnalytics.calculate_range(start, end)
+
+        days = [start + timedelta(days=n) for n in range(5)]
+        self.assertEqual([row.date for row in rows], days)
+        for row in rows:
+            self.assertEqual(
+                {field: getattr(row, field) for field in SubscriberAnalytics.STAT_FIELDS}, self.per_day(row.date)
+            )
+
+    def test_recalculating_updates_the_stored_rows(self):
+        SubscriberAnalytics.calculate_range(date(2026, 10, 2), date(2026, 10, 3))
+        NewsletterSubscriber.objects.filter(email='fan1@example.com').update(status='inactive')
+
+        stats = SubscriberAnalytics.calculate_daily_stats(date(2026, 10, 3))
+
+        self.assertEqual(SubscriberAnalytics.objects.count(), 2)
+        self.assertEqual(stats.active_subscribers, self.per_day(date(2026, 10, 3))['active_subscribers'])
+        self.assertEqual(SubscriberAnalytics.objects.get(date=date(2026, 10, 3)).active_subscribers, 2)
+        self.assertEqual(SubscriberAnalytics.calculate_range(date(2026, 10, 3), date(2026, 10, 2)), [])
+
+
+class FinalizeSendTests(TestCase):
+    def test_metrics_come_from_the_delivery_rows(self):
+        newsletter = Newsletter.objects.create(title='Weekly roundup', edition_date=date(2026, 10, 1))
+        for i, status in enumerate(['sent', 'sent', 'sent', 'failed', 'bounced', 'pending']):
+            subscriber = NewsletterSubscriber.objects.create(email=f'fan{i}@example.com', name='Fan')
+            NewsletterDelivery.objects.create(newsletter=newsletter, subscriber=subscriber, status=status)
+
+        # A resumed lane only reports what its last run sent
+        finalize_newsletter_send_task([{'sent': 1, 'failed': 0, 'chunks': 1}, None], str(newsletter.id))
+
+        analytics = NewsletterAnalytics.objects.get(newsletter=newsletter)
+        self.assertEqual(
+            (analytics.total_sent, analytics.total_delivered, analytics.total_failed, analytics.total_bounced),
+            (5, 3, 1, 1)
+        )
+        self.assertEqual(analytics.delivery_rate, 60.0)
+        self.assertEqual(analytics.bounce_rate, 20.0)
+        newsletter.refresh_from_db()
+        self.assertEqual((newsletter.status, newsletter.total_subscribers), ('sent', 5))
+
+
+class DashboardOverviewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def cache_overview(self, age, **counts):
+        document = {'counts': {**dashboard_stats.compute_counts(), **counts}, 'computed_at': time.time() - age}
+        cache.set(dashboard_stats.OVERVIEW_KEY, document)
+
+    def test_counters_apply_on_read_with_a_shared_cache(self):
+        self.cache_overview(age=60, total_articles=7)
+
+        with mock.patch('core.dashboard_stats.cache_is_shared', return_value=True):
+            dashboard_stats.bump('total_articles', 2)
+            overview = dashboard_stats.get_overview()
+
+        self.assertEqual(overview['quick_stats']['total_articles'], 9)
+
+    @override_settings(DASHBOARD_OVERVIEW_LOCAL_MAX_AGE=30)
+    def test_per_process_cache_skips_counters_and_recomputes_when_stale(self):
+        dashboard_stats.bump('total_articles', 2)
+        self.assertIsNone(cache.get(dashboard_stats.DELTA_KEY.format(name='total_articles')))
+
+        self.cache_overview(age=10, total_articles=7)
+        self.assertEqual(dashboard_stats.get_overview()['quick_stats']['total_articles'], 7)
+
+        self.cache_overview(age=60, total_articles=7)
+        self.assertEqual(dashboard_stats.get_overview()['quick_stats']['total_articles'], 0)
+
+
+class TrackingTestCase(NewsletterSendTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        subscriber, = self.subscribe('fan@example.com')
+        self.delivery = NewsletterDelivery.objects.create(
+            newsletter=self.newsletter, subscriber=subscriber, status='sent'
+        )
+
+    def shared_cache(self):
+        return mock.patch('core.tracking.cache_is_shared', return_value=True)
+
+
+class OpenTrackingTests(TrackingTestCase):
+    def test_first_open_is_buffered_once_and_flushed(self):
+        with self.shared_cache():
+            self.assertTrue(record_open(self.delivery.id))
+            self.assertFalse(record_open(self.delivery.id))
+
+        self.delivery.refresh_from_db()
+        self.assertIsNone(self.delivery.opened_at)
+
+        self.assertEqual(flush_open_buffer(), {'entries': 1, 'updated': 1, 'batches': 1})
+        self.assertEqual(flush_open_buffer()['entries'], 0)
+        self.delivery.refresh_from_db()
+        self.assertIsNotNone(self.delivery.opened_at)
+
+    def test_reapplied_opens_keep_the_first_time(self):
+        self.assertEqual(apply_opens([f'["{self.delivery.id}", 1790000000.0]', 'not json']), 1)
+        self.assertEqual(apply_opens([f'["{self.delivery.id}", 1790000500.0]']), 0)
+
+        self.delivery.refresh_from_db()
+        self.assertEqual(self.delivery.opened_at.timestamp(), 1790000000.0)
+
+    def test_opens_are_written_directly_without_a_shared_cache(self):
+        self.assertTrue(record_open(self.delivery.id))
+
+        self.delivery.refresh_from_db()
+        self.assertIsNotNone(self.delivery.opened_at)
+        self.assertEqual(flush_open_buffer()['entries'], 0)
+
+    def test_pixel_view_records_the_open(self):
+        response = self.client.get(f'/newsletter/track/open/{self.delivery.id}/')
+
+        self.assertEqual(response['Content-Type'], 'image/gif')
+        self.delivery.refresh_from_db()
+        self.assertIsNotNone(self.delivery.opened_at)
+
+
+class ClickTrackingTests(TrackingTestCase):
+    url = 'https://news.example.com/story'
+
+    def test_clicks_are_buffered_and_ingested_in_bulk(self):
+        with self.shared_cache():
+            record_click(self.delivery.id, self.url, ip_address='203.0.113.9', user_agent='Mail')
+            record_click(self.delivery.id, self.url, ip_address='not an ip')
+            record_click(NO_DELIVERY_ID, self.url)
+
+        self.assertEqual(EmailClickTracking.objects.count(), 0)
+        self.assertEqual(flush_click_buffer()['entries'], 3)
+
+        self.delivery.refresh_from_db()
+        self.assertEqual(self.delivery.click_count, 2)
+        self.assertIsNotNone(self.delivery.last_clicked_at)
+        self.assertEqual(set(EmailClickTracking.objects.values_list('ip_address', flat=True)), {None, '203.0.113.9'})
+
+    @override_settings(SITE_URL='https://obsidian.example.com')
+    def test_redirect_view_checks_the_token_against_the_delivery(self):
+        path = tracked_link(self.url, self.delivery.id).replace('https://obsidian.example.com', '')
+
+        response = self.client.get(path)
+        self.assertEqual((response.status_code, response['Location']), (302, self.url))
+        self.delivery.refresh_from_db()
+        self.assertEqual(self.delivery.click_count, 1)
+
+        other = '0b9e8d7c-6a5f-4e3d-8c2b-1a0f9e8d7c6b'
+        self.assertEqual(self.client.get(path.replace(str(self.delivery.id), other)).status_code, 404)
+        self.assertEqual(self.client.get(path[:-3] + 'xx/').status_code, 404)
+
+
+class EventBufferTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.buffer = EventBuffer('test')
+        self.applied = []
+
+    def apply(self, entries):
+        self.applied.append(entries)
+        return len(entries)
+
+    def test_flushes_in_order_and_in_batches(self):
+        for n in range(5):
+            self.buffer.push(str(n))
+
+        stats = self.buffer.flush(self.apply, batch_size=2)
+
+        self.assertEqual(self.applied, [['0', '1'], ['2', '3'], ['4']])
+        self.assertEqual(stats, {'entries': 5, 'updated': 5, 'batches': 3})
+        self.assertEqual(self.buffer.flush(self.apply)['entries'], 0)
+
+    def test_waits_for_a_missing_entry_before_skipping_it(self):
+        for n in range(3):
+            self.buffer.push(str(n))
+        cache.delete(self.buffer.entry_key.format(seq=2))
+
+        self.buffer.flush(self.apply)
+        self.assertEqual(self.applied, [['0']])
+
+        later = time.time() + GAP_GRACE_SECONDS + 1
+        with mock.patch('core.tracking.time.time', return_value=later):
+            self.buffer.flush(self.apply)
+        self.assertEqual(self.applied, [['0'], ['2']])
+
+    def test_only_one_flush_runs_at_a_time(self):
+        self.buffer.push('0')
+        cache.add(self.buffer.lock_key, 1)
+
+        self.assertEqual(self.buffer.flush(self.apply)['entries'], 0)
+        self.assertEqual(self.applied, [])
+
+
+@override_settings(SITE_URL='https://obsidian.example.com')
+class ClickLinkTests(SimpleTestCase):
+    delivery = '7a1c6f2e-0d7b-4f43-9a51-1c2b3d4e5f60'
+    other = '0b9e8d7c-6a5f-4e3d-8c2b-1a0f9e8d7c6b'
+    url = 'https://news.example.com/story?id=1&utm_source=mail'
+
+    def test_token_opens_only_for_its_delivery(self):
+        token = sign_link(self.url, self.delivery)
+
+        self.assertEqual(unsign_link(token, self.delivery), self.url)
+        self.assertIsNone(unsign_link(token, self.other))
+
+    def test_tampered_or_unsafe_tokens_are_rejected(self):
+        token = sign_link(self.url, self.delivery)
+
+        self.assertIsNone(unsign_link(token[:-1] + ('A' if token[-1] != 'A' else 'B'), self.delivery))
+        self.assertIsNone(unsign_link('not-a-token', self.delivery))
+        self.assertIsNone(unsign_link(sign_link('javascript:alert(1)', self.delivery), self.delivery))
+
+    def test_placeholders_are_signed_per_delivery(self):
+        html = f'<a href="{link_placeholder(self.url)}">Read</a>'.replace('&', '&amp;')
+
+        first = personalize_links(html, self.delivery)
+        second = personalize_links(html, self.other)
+
+        self.assertEqual(first, f'<a href="{tracked_link(self.url, self.delivery)}">Read</a>')
+        self.assertNotEqual(first, second)
+        delivery_id, token = re.search(r'/click/([^/]+)/([^/]+)/', second).groups()
+        self.assertEqual((delivery_id, unsign_link(token, delivery_id)), (self.other, self.url))
+
+
+class ScrapingManagerTests(SimpleTestCase):
+    def test_runs_only_the_enabled_news_scrapers(self):
+        manager = SportsScrapingManager()
+
+        self.assertEqual(
+            [(sport, method.__name__) for sport, kind, method in manager._jobs('news')],
+            [('rugby', 'scrape_rugby_news'), ('tennis', 'scrape_tennis_news')]
+        )
+        self.assertEqual(manager._jobs('fixtures'), [])
+
+
+RUGBY_PAGE = """<html><head><title>News</title></head><body>
+<nav><article class="menu"><h2>Not a post</h2></article></nav>
+<article class="post featured">
+  <h2><a href="https://www.planetrugby.com/news/lions">Lions   edge Sharks</a></h2>
+  <div class="entry-excerpt">A late try settles it.</div>
+  <img src="https://cdn.example.com/lions.jpg">
+</article>
+<article class="post"><h3>Bulls name side</h3></article>
+<article class="post"><p>No heading here</p></article>
+</body></html>"""
+
+
+class ScraperParseTests(SimpleTestCase):
+    def parse_both_ways(self, scraper_class, method, content):
+        """(partial parse, full-page parse) results, without the scrape-time publish dates"""
+        results = []
+        for partial in (True, False):
+            scraper = scraper_class()
+            scraper.PARTIAL_PARSE = partial
+            results.append([
+                {key: value for key, value in item.items() if key != 'publish_date'}
+                for item in getattr(scraper, method)(content)
+            ])
+        return results
+
+    def test_rugby_news(self):
+        partial, full = self.parse_both_ways(RugbyScraper, 'parse_rugby_news', RUGBY_PAGE.encode())
+
+        self.assertEqual(partial, full)
+        self.assertEqual([(a['title'], a['summary'], a['source_url'], a['image_url']) for a in partial], [
+            ('Lions edge Sharks', 'A late try settles it.', 'https://www.planetrugby.com/news/lions',
+             'https://cdn.example.com/lions.jpg'),
+            ('Bulls name side', 'Bulls name side', '', ''),
+        ])
+
+    def test_declared_encoding_is_used(self):
+        content = (
+            '<html><head><meta charset="iso-8859-1"></head><body>'
+            '<div class="article"><h2><a href="/news/zverev">Zverev\'s caf\u00e9 run</a></h2>'
+            '<p>D\u00e9j\u00e0 vu in Paris</p></div></body></html>'
+        ).encode('iso-8859-1')
+
+        partial, full = self.parse_both_ways(TennisScraper, 'parse_tennis_news', content)
+
+        self.assertEqual(partial, full)
+        self.assertEqual(
+            (partial[0]['title'], partial[0]['summary'], partial[0]['source_url']),
+            ("Zverev's caf\u00e9 run", 'D\u00e9j\u00e0 vu in Paris', 'https://www.tennis.com/news/zverev')
+        )
+
+    def test_container_limit_and_nested_matches(self):
+        promos = ''.join(
+            f'<div class="gs-c-promo"><div class="gs-c-promo-body"><h3>Story {n}</h3><a href="/sport/{n}">Read</a>'
+            f'</div></div>'
+            for n in range(4)
+        )
+        page = f'<html><body>{promos}</body></html>'.encode()
+
+        partial, full = self.parse_both_ways(SoccerScraper, 'parse_premier_league_news', page)
+
+        self.assertEqual(partial, full)
+        # Nested matches count towards the limit as they do in find_all
+        self.assertEqual([a['title'] for a in partial], ['Story 0', 'Story 0', 'Story 1', 'Story 1', 'Story 2'])
+
+    def test_fixture_tables(self):
+        page = b"""<html><body><ul>
+            <li class="gs-u-pb"><span class="sp-c-fixture__team--home">Arsenal</span>
+              <span class="sp-c-fixture__team--away">Chelsea</span><time datetime="2026-10-24T14:00:00Z"></time></li>
+            <li class="gs-u-pb"><span class="sp-c-fixture__team--home">Spurs</span></li>
+            </ul><div class="race-listing"><h3>Mexico City GP</h3><span class="venue">Hermanos Rodriguez</span>
+            <time datetime="2026-10-25T20:00:00+00:00"></time></div></body></html>"""
+
+        fixtures, full = self.parse_both_ways(SoccerScraper, 'parse_premier_league_fixtures', page)
+        races, full_races = self.parse_both_ways(Formula1Scraper, 'parse_f1_calendar', page)
+
+        self.assertEqual((fixtures, races), (full, full_races))
+        self.assertEqual(
+            [(f['home_team'], f['away_team'], f['match_date']) for f in fixtures],
+            [('Arsenal', 'Chelsea', datetime(2026, 10, 24, 14, 0, tzinfo=dt_timezone.utc))]
+        )
+        self.assertEqual((races[0]['home_team'], races[0]['venue']), ('Mexico City GP', 'Hermanos Rodriguez'))
+
+    def test_empty_page(self):
+        self.assertEqual(RugbyScraper().parse_rugby_news(b''), [])
+        self.assertEqual(RugbyScraper().parse_rugby_news(b'  '), [])
+
+class HostSchedulerTests(SimpleTestCase):
+    def test_requests_to_a_host_are_spaced_by_its_delay(self):
+        hosts = HostScheduler({'default': {'delay': 2.0}, 'slow.example.com': {'delay': 5.0}})
+
+        with mock.patch('core.scrape_scheduler.time.monotonic', return_value=100.0), \
+                mock.patch('core.scrape_scheduler.time.sleep') as sleep:
+            for host in ('a.example.com', 'a.example.com', 'b.example.com', 'a.example.com', 'slow.example.com',
+                         'slow.example.com'):
+                with hosts.slot(host):
+                    pass
+
+        # Other hosts never wait on a.example.com
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [2.0, 4.0, 5.0])
+
+    def test_in_flight_requests_are_capped_per_host(self):
+        hosts = HostScheduler({'default': {'concurrency': 2, 'delay': 0}})
+        in_flight, peak = {}, {}
+        lock = threading.Lock()
+
+        def request(host):
+            with hosts.slot(host):
+                with lock:
+                    in_flight[host] = in_flight.get(host, 0) + 1
+                    peak[host] = max(peak.get(host, 0), in_flight[host])
+                time.sleep(0.02)
+                with lock:
+                    in_flight[host] -= 1
+
+        hostnames = ['a.example.com'] * 6 + ['b.example.com'] * 2
+        jobs = [(n, lambda host=host: request(host)) for n, host in enumerate(hostnames)]
+        list(run_concurrently(jobs, workers=8))
+
+        self.assertEqual(peak, {'a.example.com': 2, 'b.example.com': 2})
+
+    def test_report(self):
+        hosts = HostScheduler({})
+        hosts.record('a.example.com', 0.1)
+        hosts.record('a.example.com', 0.3, error=True, retry=True)
+
+        self.assertEqual(hosts.report(), {
+            'a.example.com': {'requests': 2, 'errors': 1, 'retries': 1, 'avg_ms': 200.0, 'max_ms': 300.0},
+        })
+
+    def test_scrapers_share_the_managers_scheduler(self):
+        manager = SportsScrapingManager(workers=2)
+
+        self.assertEqual({id(scraper.hosts) for scraper in manager.scrapers.values()}, {id(manager.hosts)})
+
+
+@override_settings(HTTP_CACHE_ENABLED=False, SCRAPE_RETRIES=2, SCRAPE_TIMEOUT=(3, 10))
+class PoliteGetTests(SimpleTestCase):
+    url = 'https://news.example.com/latest'
+
+    def setUp(self):
+        self.hosts = HostScheduler({'default': {'delay': 0}})
+        self.session = mock.Mock()
+        sleep = mock.patch('core.scrape_scheduler.time.sleep')
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def response(self, status, **headers):
+        return mock.Mock(status_code=status, headers=headers)
+
+    def test_transient_failures_are_retried(self):
+        self.session.get.side_effect = [requests.exceptions.ConnectTimeout('slow'), self.response(503), self.response(200)]
+
+        self.assertEqual(polite_get(self.session, self.url, self.hosts).status_code, 200)
+
+        self.session.get.assert_called_with(self.url, timeout=(3, 10))
+        self.assertEqual(self.sleep.call_count, 2)
+        report = self.hosts.report()['news.example.com']
+        self.assertEqual((report['requests'], report['errors'], report['retries']), (3, 2, 2))
+
+    def test_429_waits_for_retry_after(self):
+        self.session.get.side_effect = [self.response(429, **{'Retry-After': '30'}), self.response(200)]
+
+        with mock.patch('core.scrape_scheduler.random.uniform', return_value=0.5):
+            polite_get(self.session, self.url, self.hosts)
+
+        self.sleep.assert_called_once_with(30.0)
+
+    def test_gives_up_after_the_last_retry(self):
+        self.session.get.side_effect = requests.exceptions.ReadTimeout('slow')
+
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            polite_get(self.session, self.url, self.hosts)
+
+        self.session.get.side_effect = None
+        self.session.get.return_value = self.response(502)
+        self.assertEqual(polite_get(self.session, self.url, self.hosts).status_code, 502)
+        self.assertEqual(self.session.get.call_count, 6)
+
+    def test_permanent_errors_are_not_retried(self):
+        self.session.get.return_value = self.response(404)
+
+        self.assertEqual(polite_get(self.session, self.url, self.hosts).status_code, 404)
+        self.assertEqual(self.session.get.call_count, 1)
+
+class TokenBucketTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_cache_fallback_allows_a_burst_per_window(self):
+        bucket = TokenBucket('test', rate=3 / 3600, capacity=3)
+
+        with mock.patch('core.rate_limit.time.time', return_value=7200.5):
+            self.assertEqual([bucket.try_acquire() for _ in range(3)], [0.0, 0.0, 0.0])
+            self.assertAlmostEqual(bucket.try_acquire(), 3599.5)
+            self.assertFalse(bucket.acquire(timeout=0))
+
+        with mock.patch('core.rate_limit.time.time', return_value=10800.5):
+            self.assertEqual(bucket.try_acquire(), 0.0)
+
+    def test_cannot_take_more_than_the_burst(self):
+        with self.assertRaises(ValueError):
+            TokenBucket('test', rate=1, capacity=2).try_acquire(3)
+
+    @override_settings(
+        NEWSLETTER_RATE_LIMIT_ENABLED=True, NEWSLETTER_MAX_EMAILS_PER_HOUR=3600, NEWSLETTER_EMAIL_BURST=20,
+        NEWSLETTER_EMAIL_DELAY=0, NEWSLETTER_RELAY_LIMITS={'smtp.slow.example.com': {'per_hour': 360, 'burst': 5}},
+    )
+    def test_email_limits_per_relay(self):
+        default = get_email_rate_limiter('smtp.example.com')
+        slow = get_email_rate_limiter('smtp.slow.example.com')
+
+        self.assertEqual((default.rate, default.capacity), (1.0, 20))
+        self.assertEqual((slow.rate, slow.capacity), (0.1, 5))
+        with self.settings(NEWSLETTER_EMAIL_DELAY=2):
+            self.assertEqual(get_email_rate_limiter('smtp.example.com').rate, 0.5)
+        with self.settings(NEWSLETTER_RATE_LIMIT_ENABLED=False):
+            self.assertIsNone(get_email_rate_limiter('smtp.example.com'))
+
+
+class ProviderQuotaTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_limit_holds_until_the_window_resets(self):
+        quota = QuotaCounter('test', limit=3, window=3600)
+
+        with mock.patch('core.rate_limit.time.time', return_value=7200.5):
+            self.assertEqual([quota.try_consume() for _ in range(4)], [True, True, True, False])
+            self.assertEqual(quota.status(), {'limit': 3, 'used': 3, 'remaining': 0, 'reset_in': 3600})
+
+        with mock.patch('core.rate_limit.time.time', return_value=10800.5):
+            self.assertEqual(quota.remaining(), 3)
+            self.assertTrue(quota.try_consume(2))
+            self.assertFalse(quota.try_consume(2))
+            self.assertEqual(quota.used(), 2)
+
+    def test_block_stops_spending(self):
+        quota = QuotaCounter('test', limit=10)
+        quota.block(60)
+
+        self.assertFalse(quota.try_consume())
+        self.assertEqual((quota.remaining(), quota.used()), (0, 0))
+
+    @override_settings(API_PROVIDER_RATE_LIMITS={'newsdata': {'per_day': 50, 'per_second': 5}})
+    def test_provider_limits_and_scopes(self):
+        self.assertEqual(get_provider_quota('newsdata').limit, 50)
+        self.assertEqual(get_provider_rate_limiter('newsdata').rate, 5)
+        self.assertEqual(get_provider_quota('api-sports', 'rugby').limit, 100)
+
+        rugby = get_provider_quota('api-sports', 'rugby')
+        rugby.try_consume(100)
+
+        self.assertEqual(get_provider_quota('api-sports', 'rugby').remaining(), 0)
+        self.assertEqual(get_provider_quota('api-sports', 'tennis').remaining(), 100)
+
+    def test_retry_after_header(self):
+        def response(value):
+            return mock.Mock(headers={'Retry-After': value} if value is not None else {})
+
+        self.assertEqual(retry_after_seconds(response('120')), 120.0)
+        self.assertIsNone(retry_after_seconds(response(None)))
+        self.assertIsNone(retry_after_seconds(response('soon')))
+        with mock.patch('core.rate_limit.time.time', return_value=datetime(2026, 10, 1, tzinfo=dt_timezone.utc).timestamp()):
+            self.assertEqual(retry_after_seconds(response('Thu, 01 Oct 2026 00:01:00 GMT')), 60.0)
+
+    def test_client_spends_quota_and_backs_off_after_a_429(self):
+        api = NewsDataAPI(api_key='test')
+        api.limiter = mock.Mock()
+        api.session = mock.Mock()
+        api.session.get.return_value = mock.Mock(status_code=429, headers={'Retry-After': '30'})
+
+        with mock.patch('core.api_news.fresh_response', return_value=None):
+            self.assertIsNone(api._make_request('latest', {}))
+            self.assertIsNone(api._make_request('latest', {}))
+
+        self.assertEqual(api.session.get.call_count, 1)
+        self.assertEqual(api.quota.used(), 1)
+        self.assertEqual(api.quota.remaining(), 0)
+
+@override_settings(HTTP_CACHE_ALIAS='default')  # Not the on-disk cache
+class HTTPCacheTests(SimpleTestCase):
+    url = 'https://api.example.com/fixtures?sport=rugby'
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.session = install_http_cache(requests.Session())
+        self.sent = []
+        self.replies = []
+        upstream = mock.patch('core.http_cache.HTTPAdapter.send', side_effect=self.upstream)
+        upstream.start()
+        self.addCleanup(upstream.stop)
+
+    def upstream(self, request, **kwargs):
+        self.sent.append(dict(request.headers))
+        status, headers, body = self.replies.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response.headers = requests.structures.CaseInsensitiveDict(headers)
+        response._content = body
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        return response
+
+    def get(self, now):
+        with mock.patch('core.http_cache.time.time', return_value=now):
+            return self.session.get(self.url)
+
+    def test_fresh_responses_are_served_without_a_request(self):
+        self.replies.append((200, {'Cache-Control': 'max-age=60'}, b'[1]'))
+
+        self.assertEqual(self.get(1000).content, b'[1]')
+        cached = self.get(1059)
+
+        self.assertEqual((cached.status_code, cached.content, cached.from_cache), (200, b'[1]', True))
+        self.assertEqual(len(self.sent), 1)
+        with mock.patch('core.http_cache.time.time', return_value=1059):
+            self.assertEqual(fresh_response('https://api.example.com/fixtures', {'sport': 'rugby'}).content, b'[1]')
+        with mock.patch('core.http_cache.time.time', return_value=1061):
+            self.assertIsNone(fresh_response('https://api.example.com/fixtures', {'sport': 'rugby'}))
+        self.assertEqual(cache_stats(), {'hits': 2, 'revalidated': 0, 'misses': 1, 'hit_ratio': 0.667})
+
+    def test_stale_responses_are_revalidated(self):
+        modified = 'Wed, 30 Sep 2026 10:00:00 GMT'
+        self.replies += [
+            (200, {'Cache-Control': 'max-age=60', 'ETag': '"v1"', 'Last-Modified': modified}, b'[1]'),
+            (304, {'Cache-Control': 'max-age=120', 'ETag': '"v1"'}, b''),
+        ]
+
+        self.get(1000)
+        revalidated = self.get(1100)
+
+        self.assertEqual(
+            (self.sent[1]['If-None-Match'], self.sent[1]['If-Modified-Since']), ('"v1"', modified)
+        )
+        self.assertEqual((revalidated.status_code, revalidated.content), (200, b'[1]'))
+        # The 304's max-age applies from the revalidation
+        self.assertEqual(self.get(1219).content, b'[1]')
+        self.assertEqual(len(self.sent), 2)
+        self.assertEqual(cache_stats()['revalidated'], 1)
+
+    def test_changed_response_replaces_the_entry(self):
+        self.replies += [
+            (200, {'ETag': '"v1"', 'Cache-Control': 'no-cache'}, b'[1]'),
+            (200, {'ETag': '"v2"', 'Cache-Control': 'no-cache'}, b'[1, 2]'),
+            (304, {}, b''),
+        ]
+
+        self.get(1000)
+        self.assertEqual(self.get(1001).content, b'[1, 2]')
+        self.assertEqual(self.get(1002).content, b'[1, 2]')
+
+        self.assertEqual([headers.get('If-None-Match') for headers in self.sent], [None, '"v1"', '"v2"'])
+
+    def test_uncacheable_responses_are_not_stored(self):
+        self.replies += [
+            (200, {'Cache-Control': 'no-store', 'ETag': '"v1"'}, b'[1]'),
+            (500, {'Cache-Control': 'max-age=60'}, b'error'),
+            (200, {}, b'[1]'),
+        ]
+
+        self.get(1000)
+        self.get(1001)
+        self.get(1002)
+
+        self.assertEqual(len(self.sent), 3)
+        self.assertNotIn('If-None-Match', self.sent[1])
+        self.assertEqual(cache_stats()['misses'], 3)
+
+    def test_freshness_lifetime(self):
+        self.assertEqual(freshness_lifetime({'Cache-Control': 'public, max-age=300'}), 300)
+        self.assertEqual(freshness_lifetime({'Cache-Control': 'no-cache, max-age=300'}), 0)
+        self.assertEqual(freshness_lifetime({
+            'Expires': 'Thu, 01 Oct 2026 12:10:00 GMT', 'Date': 'Thu, 01 Oct 2026 12:00:00 GMT',
+        }), 600)
+        self.assertEqual(freshness_lifetime({
+            'Last-Modified': 'Thu, 01 Oct 2026 11:00:00 GMT', 'Date': 'Thu, 01 Oct 2026 12:00:00 GMT',
+        }), 360)
+
+@override_settings(TRANSACTIONAL_EMAIL_MAX_WAIT=2)
+class WelcomeEmailTests(TestCase):
+    def setUp(self):
+        self.subscriber = NewsletterSubscriber.objects.create(email='fan@example.com', name='Fan')
+        mail.outbox = []
+        render = mock.patch('django.template.loader.render_to_string', return_value='<p>Welcome</p>')
+        render.start()
+        self.addCleanup(render.stop)
+
+    def test_waits_a_bounded_time_for_the_rate_limit(self):
+        with mock.patch('core.tasks.throttle_email', return_value=True) as throttle:
+            result = send_welcome_email.apply(args=[str(self.subscriber.id)]).get()
+
+        throttle.assert_called_once_with(timeout=2)
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual([m.to for m in mail.outbox], [['fan@example.com']])
+
+    def test_retries_instead_of_sending_while_throttled(self):
+        with mock.patch('core.tasks.throttle_email', return_value=False) as throttle:
+            result = send_welcome_email.apply(args=[str(self.subscriber.id)])
+
+        self.assertEqual(throttle.call_count, send_welcome_email.max_retries + 1)
+        self.assertEqual(result.get()['status'], 'error')
+        self.assertEqual(mail.outbox, [])
+
+
+class FakeQuota:
+    def __init__(self, name, remaining, reset_in=7200):
+        self.name = name
+        self._remaining = remaining
+        self._reset_in = reset_in
+
+    def remaining(self):
+        return self._remaining
+
+    def reset_in(self):
+        return self._reset_in
+
+    def status(self):
+        return {'remaining': self._remaining}
+
+
+class ConcurrentFetchTests(TestCase):
+    def test_jobs_overlap_and_errors_stay_with_their_job(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def wait_for_the_others(n):
+            barrier.wait()
+            return n
+
+        def broken():
+            raise ConnectionError('feed down')
+
+        jobs = [(n, lambda n=n: wait_for_the_others(n)) for n in range(3)] + [('broken', broken)]
+        outcomes = dict(run_concurrently(jobs, workers=4))
+
+        self.assertEqual({key: outcomes[key]['data'] for key in range(3)}, {0: 0, 1: 1, 2: 2})
+        self.assertEqual((outcomes['broken']['data'], outcomes['broken']['error']), (None, 'feed down'))
+
+    def test_one_worker_runs_jobs_in_order(self):
+        order = []
+        jobs = [(n, lambda n=n: order.append(n)) for n in range(4)]
+
+        self.assertEqual([key for key, _ in run_concurrently(jobs, workers=1)], [0, 1, 2, 3])
+        self.assertEqual(order, [0, 1, 2, 3])
+
+    @override_settings(NEWSLETTER_FETCH_INTERVAL=3600)
+    def test_jobs_beyond_this_runs_quota_share_are_deferred(self):
+        # 5 calls left, two runs before the reset: this run may spend 3
+        quota = FakeQuota('newsdata', remaining=5)
+        jobs = [{'name': name, 'quota': quota, 'calls': calls} for name, calls in (('a', 2), ('b', 1), ('c', 1))]
+
+        scheduled, deferred = DataFetcher()._plan_jobs(jobs)
+
+        self.assertEqual(([job['name'] for job in scheduled], deferred), (['a', 'b'], ['c']))
+
+    def test_fetch_all_data_saves_each_feed_and_reports_failures(self):
+        saved = {}
+        quota = FakeQuota('api-sports', remaining=100)
+
+        def job(kind, sport, fetch):
+            return {
+                'name': f'{kind}:{sport}', 'provider': 'api-sports', 'kind': kind, 'sport': sport,
+                'quota': quota, 'calls': 1, 'fetch': fetch, 'save': lambda data: saved.setdefault(sport, len(data)),
+            }
+
+        def down():
+            raise ConnectionError('feed down')
+
+        fetcher = DataFetcher()
+        jobs = [job('fixtures', 'rugby', lambda: [{'id': 1}, {'id': 2}]), job('fixtures', 'soccer', down)]
+        with mock.patch.object(fetcher, '_fetch_jobs', return_value=jobs):
+            results = fetcher.fetch_all_data(['rugby', 'soccer'], concurrency=2)
+
+        self.assertEqual(saved, {'rugby': 2})
+        self.assertEqual(results['fixtures'], {'rugby': {'fetched': 2, 'saved': 2}, 'soccer': {'fetched': 0, 'saved': 0}})
+        self.assertEqual(results['errors'], ['fixtures:soccer fetch error: feed down'])
+        self.assertEqual(results['timings']['providers']['api-sports']['requests'], 2)
@@ -0,0 +1,414 @@
+# core/tracking.py
+"""
+Write-behind buffering for email tracking events
+Open-pixel hits and link clicks are appended to shared buffers (Redis, or
+the Django cache as a fallback) and applied to the database in bulk by a
+periodic flush, so the tracking endpoints never touch the broker or the
+database. Without a shared cache the events are written directly.
+"""
+import ipaddress
+import json
+import logging
+import re
+import time
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, DateTimeField, F, IntegerField, Value, When
+
+from .dashboard_stats import bump
+from .models import EmailClickTracking, NewsletterDelivery
+from .rate_limit import cache_is_shared, get_redis_client
+
+logger = logging.getLogger(__name__)
+
+OPEN_SEEN_KEY = 'tracking:open:seen:{delivery_id}'
+
+# Stands in for a tracked link in segment renders until it is signed for
+# one delivery (see generator); the URL inside is base64url, which HTML
+# escaping leaves alone
+LINK_PLACEHOLDER = re.compile(r'__TRACKED_LINK:([A-Za-z0-9_-]+):__')
+
+# Used in test sends, where there is no delivery; clicks on it are dropped
+NO_DELIVERY_ID = '00000000-0000-0000-0000-000000000000'
+
+CLICK_LINK_SALT = 'newsletter.click'
+
+# Entries never written (writer died between claiming a slot and storing
+# it) are skipped once they have been missing this long
+GAP_GRACE_SECONDS = 60
+
+
+def _buffer_ttl() -> int:
+    return getattr(settings, 'TRACKING_BUFFER_TTL', 7 * 86400)
+
+
+class EventBuffer:
+    """
+    Append-only event buffer shared by all processes
+
+    A Redis list when the cache is Redis; otherwise a cache.incr sequence
+    of entry keys read back in order from a cursor. Entries are strings.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.queue_key = f"tracking:{name}:queue"
+        self.seq_key = f"tracking:{name}:seq"
+        self.cursor_key = f"tracking:{name}:cursor"
+        self.entry_key = f"tracking:{name}:entry:{{seq}}"
+        self.gap_key = f"tracking:{name}:gap:{{seq}}"
+        self.lock_key = f"tracking:{name}:flush_lock"
+
+    def push(self, entry: str) -> bool:
+        """Append an entry; False if the buffer is unavailable"""
+        client = get_redis_client()
+        if client is not None:
+            try:
+                client.rpush(cache.make_key(self.queue_key), entry)
+                return True
+            except Exception as e:
+                logger.warning(f"Tracking buffer '{self.name}' Redis error, using cache: {e}")
+
+        try:
+            cache.add(self.seq_key, 0, timeout=None)
+            seq = cache.incr(self.seq_key)
+            cache.set(self.entry_key.format(seq=seq), entry, timeout=_buffer_ttl())
+            return True
+        except Exception as e:
+            logger.warning(f"Could not buffer {self.name} event: {e}")
+            return False
+
+    def _take_redis(self, client, batch_size: int) -> Tuple[List[str], int]:
+        entries = client.lrange(cache.make_key(self.queue_key), 0, batch_size - 1)
+        return [e.decode() if isinstance(e, bytes) else e for e in entries], len(entries)
+
+    def _take_cache(self, batch_size: int) -> Tuple[List[str], int]:
+        """Read the next contiguous run of entries after the cursor"""
+        cursor = cache.get(self.cursor_key, 0)
+        head = cache.get(self.seq_key, 0)
+        if head <= cursor:
+            return [], cursor
+
+        last = min(head, cursor + batch_size)
+        keys = {seq: self.entry_key.format(seq=seq) for seq in range(cursor + 1, last + 1)}
+        found = cache.get_many(list(keys.values()))
+
+        entries = []
+        new_cursor = cursor
+        for seq, key in keys.items():
+            if key in found:
+                entries.append(found[key])
+            else:
+                # Possibly claimed but not yet written: wait a while before skipping
+                gap_key = self.gap_key.format(seq=seq)
+                cache.add(gap_key, time.time(), timeout=_buffer_ttl())
+                if time.time() - cache.get(gap_key, time.time()) < GAP_GRACE_SECONDS:
+                    break
+            new_cursor = seq
+
+        return entries, new_cursor
+
+    def _trim_cache(self, cursor: int):
+        previous = cache.get(self.cursor_key, 0)
+        cache.delete_many([self.entry_key.format(seq=seq) for seq in range(previous + 1, cursor + 1)])
+        cache.set(self.cursor_key, cursor, timeout=None)
+
+    def flush(self, apply: Callable[[List[str]], int], batch_size: int = None,
+              max_batches: int = None) -> Dict:
+        """
+        Hand buffered entries to `apply` in batches
+
+        One flusher runs at a time (cache lock). A batch is removed from the
+        buffer only after `apply` returns, so a crash mid-flush re-applies
+        it rather than losing it; apply functions must tolerate that.
+
+        Returns:
+            {'entries': entries read, 'updated': sum of apply() results,
+             'batches': apply() calls}
+        """
+        batch_size = batch_size or getattr(settings, 'TRACKING_FLUSH_BATCH_SIZE', 1000)
+        max_batches = max_batches or getattr(settings, 'TRACKING_FLUSH_MAX_BATCHES', 100)
+        stats = {'entries': 0, 'updated': 0, 'batches': 0}
+
+        if not cache.add(self.lock_key, 1, timeout=300):
+            logger.info(f"Tracking buffer '{self.name}' flush already running")
+            return stats
+
+        try:
+            client = get_redis_client()
+
+            for _ in range(max_batches):
+                if client is not None:
+                    entries, position = self._take_redis(client, batch_size)
+                else:
+                    entries, position = self._take_cache(batch_size)
+
+                if not entries and (client is not None or position == cache.get(self.cursor_key, 0)):
+                    break
+
+                stats['updated'] += apply(entries) if entries else 0
+                stats['entries'] += len(entries)
+                stats['batches'] += 1
+
+                if client is not None:
+                    client.ltrim(cache.make_key(self.queue_key), position, -1)
+                else:
+                    self._trim_cache(position)
+
+                if len(entries) < batch_size:
+                    break
+        finally:
+            cache.delete(self.lock_key)
+
+        if stats['entries']:
+            logger.info(
+                f"Flushed {stats['entries']} buffered {self.name} events in {stats['batches']} batches "
+                f"({stats['updated']} rows updated)"
+            )
+        return stats
+
+
+open_buffer = EventBuffer('open')
+click_buffer = EventBuffer('click')
+
+# Buffers already reported as running without a shared cache
+_unbuffered = set()
+
+
+def _buffer_or_apply(buffer: EventBuffer, apply: Callable[[List[str]], int], entry: str) -> bool:
+    """
+    Buffer an event, or apply it at once when the cache is per-process
+
+    A LocMem buffer only exists inside the web process, where the flush
+    task never looks, so buffered events would be lost.
+    """
+    if cache_is_shared():
+        return buffer.push(entry)
+
+    if buffer.name not in _unbuffered:
+        _unbuffered.add(buffer.name)
+        logger.error(
+            f"Tracking buffer '{buffer.name}' needs a shared cache (set REDIS_URL); "
+            f"writing {buffer.name} events directly"
+        )
+    try:
+        apply([entry])
+        return True
+    except Exception as e:
+        logger.error(f"Could not record {buffer.name} event: {e}")
+        return False
+
+
+def _decode(entries: List[str]) -> List[list]:
+    decoded = []
+    for entry in entries:
+        try:
+            decoded.append(json.loads(entry))
+        except (TypeError, ValueError):
+            logger.warning(f"Dropping malformed tracking entry: {entry!r}")
+    return decoded
+
+
+def _timestamp(value) -> datetime:
+    return datetime.fromtimestamp(float(value), tz=dt_timezone.utc)
+
+
+# Opens
+
+def record_open(delivery_id) -> bool:
+    """
+    Buffer an open for a delivery
+
+    Only the first hit per delivery (within TRACKING_OPEN_DEDUPE_TTL) is
+    buffered; repeats from image proxies and re-opens are dropped here.
+    Without a shared cache the open is written straight to the delivery.
+
+    Returns:
+        True if the hit was recorded, False if it was a duplicate or the
+        buffer was unavailable
+    """
+    delivery_id = str(delivery_id)
+    seen_key = OPEN_SEEN_KEY.format(delivery_id=delivery_id)
+    dedupe_ttl = getattr(settings, 'TRACKING_OPEN_DEDUPE_TTL', 86400)
+
+    try:
+        client = get_redis_client()
+        if client is not None:
+            first = client.set(cache.make_key(seen_key), 1, nx=True, ex=dedupe_ttl)
+        else:
+            first = cache.add(seen_key, 1, timeout=dedupe_ttl)
+    except Exception as e:
+        logger.warning(f"Open dedupe unavailable for delivery {delivery_id}: {e}")
+        first = True
+
+    if not first:
+        return False
+
+    if _buffer_or_apply(open_buffer, apply_opens, json.dumps([delivery_id, round(time.time(), 3)])):
+        return True
+
+    # Not recorded: let the next hit try again
+    try:
+        cache.delete(seen_key)
+    except Exception as e:
+        logger.warning(f"Could not clear open dedupe for delivery {delivery_id}: {e}")
+    return False
+
+
+def apply_opens(entries: List[str]) -> int:
+    """
+    Write buffered opens in one UPDATE
+
+    Only deliveries that have not been marked opened yet are touched, so
+    re-applying a batch is harmless. Returns the rows updated.
+    """
+    opens = {}
+    for delivery_id, timestamp in _decode(entries):
+        opened_at = _timestamp(timestamp)
+        if delivery_id not in opens or opened_at < opens[delivery_id]:
+            opens[delivery_id] = opened_at
+
+    if not opens:
+        return 0
+
+    updated = NewsletterDelivery.objects.filter(
+        id__in=list(opens),
+        opened_at__isnull=True
+    ).update(
+        opened_at=Case(
+            *[When(id=delivery_id, then=Value(opened_at)) for delivery_id, opened_at in opens.items()],
+            output_field=DateTimeField()
+        )
+    )
+    bump('recent_opened', updated)
+    return updated
+
+
+def flush_open_buffer(batch_size: int = None, max_batches: int = None) -> Dict:
+    """Apply buffered opens to the database in bulk"""
+    return open_buffer.flush(apply_opens, batch_size, max_batches)
+
+
+# Clicks
+
+def sign_link(url: str, delivery_id) -> str:
+    """
+    URL-safe signed token for a link sent in one delivery
+
+    The delivery id is signed with the URL, so the redirect can't be
+    abused and a token can't be replayed to credit clicks to another
+    delivery.
+    """
+    return signing.Signer(salt=CLICK_LINK_SALT).sign_object([str(delivery_id), url], compress=True)
+
+
+def unsign_link(token: str, delivery_id) -> Optional[str]:
+    """The link behind a token, or None if it was tampered with or signed for another delivery"""
+    try:
+        payload = signing.Signer(salt=CLICK_LINK_SALT).unsign_object(token)
+    except signing.BadSignature:
+        return None
+
+    if not isinstance(payload, list) or len(payload) != 2 or payload[0] != str(delivery_id):
+        return None
+
+    url = payload[1]
+    if not isinstance(url, str) or not url.startswith(('http://', 'https://')):
+        return None
+    return url
+
+
+def tracked_link(url: str, delivery_id) -> str:
+    """Click-tracking redirect URL for a link in one delivery"""
+    if not url:
+        return url
+    return f"{settings.SITE_URL}/newsletter/track/click/{delivery_id}/{sign_link(url, delivery_id)}/"
+
+
+def link_placeholder(url: str) -> str:
+    """Stand-in for a tracked link in content shared by many deliveries"""
+    if not url:
+        return url
+    return f"__TRACKED_LINK:{signing.b64_encode(url.encode()).decode()}:__"
+
+
+def personalize_links(content: str, delivery_id) -> str:
+    """Replace the link placeholders in rendered content with links signed for one delivery"""
+    return LINK_PLACEHOLDER.sub(
+        lambda match: tracked_link(signing.b64_decode(match.group(1).encode()).decode(), delivery_id),
+        content
+    )
+
+
+def _clean_ip(ip_address: str) -> Optional[str]:
+    try:
+        return str(ipaddress.ip_address(ip_address)) if ip_address else None
+    except ValueError:
+        return None
+
+
+def record_click(delivery_id, url: str, ip_address: str = None, user_agent: str = '') -> bool:
+    """Buffer a click (written directly without a shared cache); every click is kept"""
+    return _buffer_or_apply(click_buffer, apply_clicks, json.dumps([
+        str(delivery_id), round(time.time(), 3), url, _clean_ip(ip_address), (user_agent or '')[:500]
+    ]))
+
+
+def apply_clicks(entries: List[str]) -> int:
+    """
+    Persist a batch of clicks
+
+    One bulk insert into EmailClickTracking and one UPDATE adding each
+    delivery's click count with F() and setting last_clicked_at, in a
+    single transaction. Clicks on unknown deliveries are dropped. (A batch
+    re-applied after a crash between commit and trim counts twice; the
+    window is a single buffer call.) Returns the deliveries updated.
+    """
+    clicks = _decode(entries)
+    delivery_ids = {click[0] for click in clicks}
+    known = {
+        str(pk) for pk in NewsletterDelivery.objects.filter(
+            id__in=[d for d in delivery_ids if d != NO_DELIVERY_ID]
+        ).values_list('id', flat=True)
+    }
+    clicks = [click for click in clicks if click[0] in known]
+    if not clicks:
+        return 0
+
+    max_url = EmailClickTracking._meta.get_field('url').max_length
+    counts = Counter(click[0] for click in clicks)
+    last_clicked = {}
+    rows = []
+    for delivery_id, timestamp, url, ip_address, user_agent in clicks:
+        clicked_at = _timestamp(timestamp)
+        last_clicked[delivery_id] = max(clicked_at, last_clicked.get(delivery_id, clicked_at))
+        rows.append(EmailClickTracking(
+            delivery_id=delivery_id,
+            url=url[:max_url],
+            clicked_at=clicked_at,
+            ip_address=ip_address,
+            user_agent=user_agent
+        ))
+
+    with transaction.atomic():
+        EmailClickTracking.objects.bulk_create(rows, batch_size=500)
+        return NewsletterDelivery.objects.filter(id__in=list(counts)).update(
+            click_count=F('click_count') + Case(
+                *[When(id=delivery_id, then=Value(count)) for delivery_id, count in counts.items()],
+                output_field=IntegerField()
+            ),
+            last_clicked_at=Case(
+                *[When(id=delivery_id, then=Value(at)) for delivery_id, at in last_clicked.items()],
+                output_field=DateTimeField()
+            )
+        )
+
+
+def flush_click_buffer(batch_size: int = None, max_batches: int = None) -> Dict:
+    """Apply buffered clicks to the database in bulk"""
+    return click_buffer.flush(apply_clicks, batch_size, max_batches)
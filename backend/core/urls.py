@@ -33,4 +33,5 @@ urlpatterns = [
     path('newsletter/unsubscribe/<uuid:token>/', views.unsubscribe_newsletter, name='web_unsubscribe'),
     path('newsletter/preferences/<uuid:token>/', views.newsletter_preferences, name='web_preferences'),
     path('newsletter/track/open/<uuid:delivery_id>/', views.track_email_open_view, name='track_email_open'),
+    path('newsletter/track/click/<uuid:delivery_id>/<str:link>/', views.track_email_click_view, name='track_email_click'),
 ]
@@ -0,0 +1,89 @@
+# core/utils.py
+"""
+Query helpers
+Keyset pagination for walking large tables in constant memory
+"""
+from typing import Iterable, Iterator, List, Sequence
+from django.db.models import QuerySet
+
+
+DEFAULT_KEYSET_PAGE_SIZE = 1000
+
+
+def iter_keyset_pages(queryset: QuerySet, page_size: int = DEFAULT_KEYSET_PAGE_SIZE,
+                      fields: Sequence[str] = None) -> Iterator[List]:
+    """
+    Walk a queryset in pages ordered by primary key
+
+    Each page is a fresh `pk > last_pk` query, so rows are never cached
+    on the queryset and memory stays flat however large the table is.
+    Rows deleted or re-filtered out between pages are simply skipped.
+
+    Args:
+        queryset: Rows to walk; any existing ordering is replaced
+        page_size: Rows per query
+        fields: Optional columns to load (passed to .only(); pk is implied)
+
+    Yields:
+        Lists of at most page_size model instances
+    """
+    page_size = max(1, page_size)
+    queryset = queryset.order_by('pk')
+    if fields:
+        queryset = queryset.only(*fields)
+
+    last_pk = None
+    while True:
+        page_qs = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        page = list(page_qs[:page_size])
+        if not page:
+            return
+
+        yield page
+
+        if len(page) < page_size:
+            return
+        last_pk = page[-1].pk
+
+
+def iter_keyset(queryset: QuerySet, page_size: int = DEFAULT_KEYSET_PAGE_SIZE,
+                fields: Sequence[str] = None) -> Iterator:
+    """Same as iter_keyset_pages, one instance at a time"""
+    for page in iter_keyset_pages(queryset, page_size, fields):
+        yield from page
+
+
+def iter_pk_chunks(queryset: QuerySet, chunk_size: int = DEFAULT_KEYSET_PAGE_SIZE) -> Iterator[List]:
+    """
+    Walk only the primary keys of a queryset, chunk_size at a time
+
+    Useful for bulk update()/delete() in bounded statements.
+    """
+    chunk_size = max(1, chunk_size)
+    queryset = queryset.order_by('pk')
+
+    last_pk = None
+    while True:
+        page_qs = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        pks = list(page_qs.values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            return
+
+        yield pks
+
+        if len(pks) < chunk_size:
+            return
+        last_pk = pks[-1]
+
+
+def chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Split any iterable into lists of at most size items"""
+    size = max(1, size)
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -4,12 +4,13 @@ from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from django.shortcuts import get_object_or_404
-from django.http import HttpResponse, Http404
+from django.http import HttpResponse, HttpResponseRedirect, Http404
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.cache import cache_page
+from django.views.decorators.http import require_GET
 import logging
 
 from .models import (
@@ -19,6 +20,7 @@ from .models import (
     MatchFixture,
     Newsletter,
     NewsletterDelivery,
+    SubscriptionEvent,
 )
 from .serializers import (
     NewsletterSubscriptionSerializer,
@@ -30,7 +32,8 @@ from .serializers import (
     PreferencesUpdateSerializer,
     NewsletterSubscriberSerializer,
 )
-from core.tasks import track_email_open
+from .snapshot import get_content_snapshot, hydrate_snapshot
+from .tracking import record_click, record_open, unsign_link
 from .models import ContactMessage, EventBooking, CallbackRequest
 from .serializers import (
     ContactMessageSerializer,
@@ -161,6 +164,12 @@ def subscribe_newsletter(request):
     if serializer.is_valid():
         try:
             subscriber = serializer.save()
+            SubscriptionEvent.objects.create(
+                subscriber=subscriber,
+                from_status=SubscriptionEvent.SUBSCRIBED,
+                to_status=subscriber.status,
+                source="subscribe",
+            )
 
             # Log subscription
             logger.info(f"New newsletter subscription: {subscriber.email}")
@@ -196,8 +205,7 @@ def unsubscribe_newsletter(request):
         try:
             token = serializer.validated_data["token"]
             subscriber = NewsletterSubscriber.objects.get(unsubscribe_token=token)
-            subscriber.status = "unsubscribed"
-            subscriber.save()
+            subscriber.set_status("unsubscribed", source="unsubscribe")
 
             logger.info(f"Newsletter unsubscription: {subscriber.email}")
 
@@ -276,12 +284,15 @@ def view_newsletter_online(request, newsletter_id):
     try:
         newsletter = get_object_or_404(Newsletter, id=newsletter_id)
 
+        # Render from the frozen snapshot, not the content tables
+        content = hydrate_snapshot(get_content_snapshot(newsletter))
+
         # Render newsletter as HTML
         context = {
             "newsletter": newsletter,
-            "featured_article": newsletter.featured_article,
-            "articles": newsletter.articles.all()[:8],
-            "fixtures": newsletter.fixtures.all()[:6],
+            "featured_article": content["featured_article"],
+            "articles": content["articles"][:8],
+            "fixtures": content["fixtures"][:6],
             "newsletter_date": newsletter.edition_date.strftime(
                 "%A, %B %d, %Y"
             ).upper(),
@@ -296,23 +307,56 @@ def view_newsletter_online(request, newsletter_id):
         raise Http404("Newsletter not found")
 
 
-@api_view(["GET"])
-@permission_classes([AllowAny])
+# 1x1 transparent GIF
+TRACKING_PIXEL = b"\x47\x49\x46\x38\x39\x61\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\x00\x00\x00\x21\xf9\x04\x01\x00\x00\x00\x00\x2c\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02\x04\x01\x00\x3b"
+
+
+@require_GET
 def track_email_open_view(request, delivery_id):
-    """Track email open via pixel"""
+    """
+    Track email open via pixel
+
+    Plain Django view (no DRF negotiation): the hit is deduplicated and
+    appended to the open buffer, which flush_open_events applies in bulk.
+    """
     try:
-        # Trigger async task to track open
-        track_email_open.delay(delivery_id)
+        record_open(delivery_id)
+    except Exception as e:
+        logger.error(f"Error tracking email open: {e}")
+
+    # Always return the pixel, even if tracking fails
+    response = HttpResponse(TRACKING_PIXEL, content_type="image/gif")
+    response["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
+    return response
+
+
+@require_GET
+def track_email_click_view(request, delivery_id, link):
+    """
+    Redirect a tracked newsletter link and record the click
 
-        # Return 1x1 transparent pixel
-        pixel_data = b"\x47\x49\x46\x38\x39\x61\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\x00\x00\x00\x21\xf9\x04\x01\x00\x00\x00\x00\x2c\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02\x04\x01\x00\x3b"
-        return HttpResponse(pixel_data, content_type="image/gif")
+    The link is signed together with its delivery when the email is built,
+    so only URLs we put in that recipient's newsletter can be redirected to. The click is buffered (flush_tracking_events
+    persists it) and the 302 goes out without waiting on the database;
+    without a shared cache it is written before redirecting.
+    """
+    url = unsign_link(link, delivery_id)
+    if url is None:
+        raise Http404("Link not found")
 
+    try:
+        record_click(
+            delivery_id,
+            url,
+            ip_address=request.META.get("REMOTE_ADDR"),
+            user_agent=request.META.get("HTTP_USER_AGENT", ""),
+        )
     except Exception as e:
-        logger.error(f"Error tracking email open: {e}")
-        # Still return pixel even if tracking fails
-        pixel_data = b"\x47\x49\x46\x38\x39\x61\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\x00\x00\x00\x21\xf9\x04\x01\x00\x00\x00\x00\x2c\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02\x04\x01\x00\x3b"
-        return HttpResponse(pixel_data, content_type="image/gif")
+        logger.error(f"Error tracking email click: {e}")
+
+    response = HttpResponseRedirect(url)
+    response["Cache-Control"] = "no-store"
+    return response
 
 
 @api_view(["GET"])
@@ -323,7 +367,7 @@ def sports_news_feed(request):
     sport = request.GET.get("sport", None)
     limit = min(int(request.GET.get("limit", 10)), 50)  # Max 50 articles
 
-    queryset = NewsArticle.objects.all()
+    queryset = NewsArticle.objects.filter(duplicate_of__isnull=True)
 
     if sport:
         try: